@@ -0,0 +1,129 @@
+"""Agregados de country_metrics por mês, trimestre e ano (metricas_agregadas).
+
+Para o mundo e para cada região (regioes_paises, ver app/regioes.py) guarda
+n, soma, soma dos quadrados, mínimo e máximo do índice. Essas grandezas se
+somam: o trimestre e o ano saem das linhas mensais, sem reler
+country_metrics, e média e desvio padrão são calculados na leitura
+(`estatisticas`). O gráfico de evolução lê algumas centenas de linhas em vez
+da tabela inteira.
+
+Só os meses marcados em periodos_pendentes (destino 'agregados') são
+refeitos, com os trimestres e anos que os contêm:
+
+    python -m app.agregados              # processa as pendências
+    python -m app.agregados --recalcular # refaz tudo (ex.: depois de editar regioes_paises à mão)
+"""
+import argparse
+
+import numpy as np
+
+from app.banco import DB_PATH, conectar, migrar
+from app.regioes import GLOBAL, SEM_REGIAO
+
+DESTINO = "agregados"
+ESCALAS = ("mes", "trimestre", "ano")
+
+# Primeiro mês do trimestre / do ano que contém `month`.
+_INICIO = {
+    "trimestre": "((month - 1) / 3) * 3 + 1",
+    "ano": "1",
+}
+
+_PENDENTES = f"SELECT year, month FROM periodos_pendentes WHERE destino = '{DESTINO}'"
+
+_SQL_MENSAL = f"""
+    INSERT INTO metricas_agregadas
+        (escala, regiao, year, month, n, soma, soma_quadrados, minimo, maximo)
+    SELECT 'mes', regiao, m.year, m.month, COUNT(*), SUM(v), SUM(v * v), MIN(v), MAX(v)
+    FROM (
+        SELECT '{GLOBAL}' AS regiao, year, month, indicator_value AS v FROM country_metrics
+        UNION ALL
+        SELECT IFNULL(r.region, '{SEM_REGIAO}'), c.year, c.month, c.indicator_value
+        FROM country_metrics c
+        LEFT JOIN regioes_paises r ON r.country_code = c.country_code
+    ) m
+    WHERE (m.year, m.month) IN ({_PENDENTES})
+    GROUP BY regiao, m.year, m.month
+"""
+
+
+def _sql_rollup(escala):
+    """(DELETE, INSERT) que refazem `escala` a partir das linhas mensais dos meses pendentes."""
+    inicio = _INICIO[escala]
+    apagar = f"""
+        DELETE FROM metricas_agregadas
+        WHERE escala = '{escala}'
+          AND (year, month) IN (SELECT DISTINCT year, {inicio} FROM ({_PENDENTES}))
+    """
+    inserir = f"""
+        INSERT INTO metricas_agregadas
+            (escala, regiao, year, month, n, soma, soma_quadrados, minimo, maximo)
+        SELECT '{escala}', regiao, year, {inicio} AS inicio,
+               SUM(n), SUM(soma), SUM(soma_quadrados), MIN(minimo), MAX(maximo)
+        FROM metricas_agregadas
+        WHERE escala = 'mes'
+          AND (year, {inicio}) IN (SELECT DISTINCT year, {inicio} FROM ({_PENDENTES}))
+        GROUP BY regiao, year, inicio
+    """
+    return apagar, inserir
+
+
+def atualizar_agregados(conn):
+    """Refaz os meses pendentes e os trimestres/anos que os contêm; devolve quantos meses."""
+    with conn:
+        pendentes = conn.execute(
+            "SELECT COUNT(*) FROM periodos_pendentes WHERE destino = ?", (DESTINO,)
+        ).fetchone()[0]
+        if not pendentes:
+            return 0
+        conn.execute(f"DELETE FROM metricas_agregadas WHERE escala = 'mes' AND (year, month) IN ({_PENDENTES})")
+        conn.execute(_SQL_MENSAL)
+        for escala in _INICIO:
+            for comando in _sql_rollup(escala):
+                conn.execute(comando)
+        conn.execute("DELETE FROM periodos_pendentes WHERE destino = ?", (DESTINO,))
+        conn.execute("UPDATE destinos_derivados SET versao = versao + 1 WHERE nome = ?", (DESTINO,))
+    return pendentes
+
+
+def recalcular(conn):
+    """Marca todos os meses como pendentes e refaz a tabela inteira."""
+    with conn:
+        conn.execute("DELETE FROM metricas_agregadas")
+        conn.execute(
+            "INSERT OR IGNORE INTO periodos_pendentes (destino, year, month) "
+            "SELECT DISTINCT ?, year, month FROM country_metrics",
+            (DESTINO,),
+        )
+    return atualizar_agregados(conn)
+
+
+def estatisticas(df):
+    """Acrescenta media e desvio (amostral; NaN com n = 1) às colunas n/soma/soma_quadrados."""
+    n = df["n"].to_numpy(dtype="float64")
+    soma = df["soma"].to_numpy(dtype="float64")
+    media = soma / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variancia = (df["soma_quadrados"].to_numpy(dtype="float64") - soma * media) / (n - 1)
+    df["media"] = media
+    df["desvio"] = np.sqrt(np.clip(variancia, 0.0, None))
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agregados mensais, trimestrais e anuais do Índice de Paz.")
+    parser.add_argument("--recalcular", action="store_true", help="refaz todos os períodos")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    migrar(args.db)
+    conn = conectar(args.db)
+    try:
+        meses = recalcular(conn) if args.recalcular else atualizar_agregados(conn)
+    finally:
+        conn.close()
+    print(f"✅ {meses} mês(es) reagregado(s).")
+
+
+if __name__ == "__main__":
+    main()
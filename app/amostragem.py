@@ -0,0 +1,37 @@
+"""Redução de séries longas para gráficos (Largest-Triangle-Three-Buckets).
+
+Um gráfico não mostra mais pontos do que tem pixels de largura. O LTTB
+divide a série em baldes e guarda, de cada um, o ponto que forma o maior
+triângulo com o ponto escolhido no balde anterior e a média do seguinte:
+picos, vales e mudanças de tendência sobrevivem, ao contrário de pegar um
+ponto a cada k. O primeiro e o último ponto são sempre mantidos.
+"""
+import numpy as np
+
+
+def lttb(x, y, limite):
+    """Índices (em ordem) dos até `limite` pontos de (x, y) escolhidos pelo LTTB.
+
+    `x` precisa estar em ordem crescente e sem NaN em `y`; com `limite` maior
+    que a série (ou menor que 3) devolve todos os índices.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(x)
+    if limite >= n or limite < 3:
+        return np.arange(n)
+
+    # Os n - 2 pontos internos em limite - 2 baldes de tamanho >= 1; em
+    # inteiros, porque o arredondamento do linspace desloca algumas bordas.
+    bordas = 1 + np.arange(limite - 1, dtype=np.int64) * (n - 2) // (limite - 2)
+    escolhidos = np.empty(limite, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    a = 0
+    for i in range(limite - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        seguinte = slice(fim, bordas[i + 2]) if i + 2 < len(bordas) else slice(n - 1, n)
+        mx, my = x[seguinte].mean(), y[seguinte].mean()
+        area = np.abs((x[a] - mx) * (y[inicio:fim] - y[a]) - (x[a] - x[inicio:fim]) * (my - y[a]))
+        a = inicio + int(np.argmax(area))
+        escolhidos[i + 1] = a
+    return escolhidos
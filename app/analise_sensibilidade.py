@@ -0,0 +1,147 @@
+import io
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+if __name__ == "__main__":
+    # `streamlit run app/analise_sensibilidade.py` só põe app/ no sys.path; o pacote app fica na raiz.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import paginas  # noqa: E402
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _sensibilidade_historica(versao, pesos, n, amostragem, concentracao, passo, seed, _df):
+    from app.metodologia import PILARES
+    from app.sensibilidade import analisar_pilares
+
+    return analisar_pilares(
+        _df, dict(pesos), PILARES, n=n, metodo=amostragem, concentracao=concentracao, passo=passo, seed=seed,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _sensibilidade_componentes(conteudo, nome, mes, normalizacao, n, amostragem, concentracao, passo, seed):
+    from app.metodologia import PESOS_PADRAO
+    from app.sensibilidade import analisar_componentes
+
+    cubo, paises, _ = _cubo_componentes(conteudo, nome)
+    return analisar_componentes(
+        cubo, paises, mes, PESOS_PADRAO, normalizacao, n=n, metodo=amostragem,
+        concentracao=concentracao, passo=passo, seed=seed,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _cubo_componentes(conteudo, nome):
+    import pandas as pd
+    from app.metodologia import montar_cubo
+
+    if nome.lower().endswith((".parquet", ".pq")):
+        df = pd.read_parquet(io.BytesIO(conteudo))
+    else:
+        df = pd.read_csv(io.BytesIO(conteudo), dtype={"country_code": "string"})
+    return montar_cubo(df)
+
+
+def render(compartilhados=None):
+    """Faixa de posições de cada região ou país quando os pesos do índice variam."""
+    import plotly.express as px
+    from app.dados import conexao, versao_tabela
+    from app.historico import pesos_vigentes
+    from app.metodologia import METODOS
+    from app.sensibilidade import AMOSTRAGENS
+
+    st.title("⚖️ Análise de Sensibilidade aos Pesos")
+    st.markdown(
+        "Quanto a posição de cada país ou região muda quando os pesos do índice variam? "
+        "Milhares de vetores de pesos são avaliados numa única multiplicação de matrizes."
+    )
+
+    # -------------------------------
+    # PARÂMETROS
+    # -------------------------------
+    st.sidebar.header("⚙️ Cenários de Pesos")
+
+    fonte = st.sidebar.radio("Dados", ["Pilares históricos (regiões)", "Componentes (arquivo)"])
+    amostragem = st.sidebar.selectbox(
+        "Amostragem", AMOSTRAGENS, format_func={"monte_carlo": "Monte Carlo", "grade": "Grade regular"}.get
+    )
+    if amostragem == "monte_carlo":
+        n = st.sidebar.slider("Cenários", 100, 20000, 2000, step=100)
+        concentracao = st.sidebar.slider("Concentração (maior = mais perto dos pesos oficiais)", 5.0, 500.0, 50.0)
+        passo = 0.05
+    else:
+        passo = st.sidebar.select_slider("Passo da grade", [0.25, 0.2, 0.1, 0.05], value=0.1)
+        n, concentracao = 0, 0.0
+    seed = int(st.sidebar.number_input("Semente", value=0, step=1))
+
+    # -------------------------------
+    # CÁLCULO (CACHE POR PARÂMETROS)
+    # -------------------------------
+    if fonte.startswith("Pilares"):
+        compartilhados = compartilhados or paginas.dados("analise_sensibilidade")
+        # Pesos vigentes em pesos_historicos, os mesmos do índice gravado.
+        with conexao() as conn:
+            pesos_base = tuple(sorted(pesos_vigentes(conn).items()))
+        resumo, pesos = _sensibilidade_historica(
+            versao_tabela("historical_peace_regional"), pesos_base, n, amostragem, concentracao, passo, seed,
+            compartilhados["historico_regional"],
+        )
+        anos = sorted(resumo["year"].unique())
+        ano_sel = st.sidebar.selectbox("Ano", anos, index=len(anos) - 1)
+        resumo = resumo[resumo["year"] == ano_sel]
+        rotulo = "region"
+    else:
+        arquivo = st.sidebar.file_uploader(
+            "CSV/Parquet com country_code, year, month e os componentes", type=["csv", "parquet"]
+        )
+        if arquivo is None:
+            st.info("Envie o arquivo de componentes para analisar os pesos do Indicador de Paz.")
+            return
+        conteudo = arquivo.getvalue()
+        _, _, periodos = _cubo_componentes(conteudo, arquivo.name)
+        rotulos_mes = [f"{ano}-{mes:02d}" for ano, mes in periodos]
+        mes_sel = st.sidebar.selectbox("Mês", range(len(periodos)), index=len(periodos) - 1,
+                                       format_func=rotulos_mes.__getitem__)
+        normalizacao = st.sidebar.selectbox("Normalização", METODOS)
+        resumo, pesos = _sensibilidade_componentes(
+            conteudo, arquivo.name, mes_sel, normalizacao, n, amostragem, concentracao, passo, seed
+        )
+        rotulo = "country_code"
+
+    # -------------------------------
+    # RESULTADOS
+    # -------------------------------
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cenários avaliados", f"{len(pesos):,}")
+    col2.metric("Entidades", len(resumo))
+    col3.metric("Mesma posição em média", f"{resumo['prob_mesma_posicao'].mean():.0%}")
+
+    st.subheader("📊 Faixa de Posições (p05–p95)")
+
+    fig = px.scatter(
+        resumo,
+        x="posicao_media",
+        y=rotulo,
+        error_x=resumo["p95"] - resumo["posicao_media"],
+        error_x_minus=resumo["posicao_media"] - resumo["p05"],
+        color="prob_mesma_posicao",
+        color_continuous_scale="RdYlGn",
+        range_color=(0, 1),
+        labels={"posicao_media": "Posição média", rotulo: "", "prob_mesma_posicao": "Estabilidade"},
+    )
+    fig.update_yaxes(categoryorder="array", categoryarray=resumo[rotulo].tolist()[::-1])
+    fig.update_layout(height=max(300, 22 * len(resumo)))
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("📋 Estabilidade do Ranking")
+    st.dataframe(resumo, use_container_width=True, hide_index=True)
+
+    st.success("✅ Análise de sensibilidade concluída!")
+
+
+if __name__ == "__main__":
+    st.set_page_config(page_title="Sensibilidade aos Pesos", layout="wide")
+    render()
@@ -0,0 +1,491 @@
+"""Caminho do banco paz.db e migrações do seu esquema.
+
+As migrações são aplicadas em ordem e registradas em PRAGMA user_version,
+então rodar `migrar()` várias vezes é seguro. Para aplicar manualmente:
+
+    python -m app.banco
+"""
+import hashlib
+import sqlite3
+from pathlib import Path
+
+from app.regioes import REGIOES
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "data" / "database" / "paz.db"
+
+
+# Chaves dos contadores de Sóis, usadas pelos triggers e pelo recálculo
+# de app/contadores.py. Sóis sem país ou sem data ficam em '' e 0.
+PAIS_SOL = "IFNULL({t}.country_code, '')"
+ANO_SOL = "IFNULL(CAST(strftime('%Y', {t}.created_at) AS INTEGER), 0)"
+MES_SOL = "IFNULL(CAST(strftime('%m', {t}.created_at) AS INTEGER), 0)"
+
+
+def _contar_sol(t, delta):
+    pais, ano, mes = PAIS_SOL.format(t=t), ANO_SOL.format(t=t), MES_SOL.format(t=t)
+    sql = f"""
+            INSERT INTO suns_por_pais (country_code, total) VALUES ({pais}, {delta})
+                ON CONFLICT (country_code) DO UPDATE SET total = total + ({delta});
+            INSERT INTO suns_por_mes (year, month, total) VALUES ({ano}, {mes}, {delta})
+                ON CONFLICT (year, month) DO UPDATE SET total = total + ({delta});"""
+    if delta < 0:
+        sql += f"""
+            DELETE FROM suns_por_pais WHERE country_code = {pais} AND total <= 0;
+            DELETE FROM suns_por_mes WHERE year = {ano} AND month = {mes} AND total <= 0;"""
+    return sql
+
+
+# Grade de agrupamento dos Sóis: no nível n o mundo vira 2^n × 2^n células
+# iguais em graus. Cada célula guarda, por mês, o total e a soma das
+# coordenadas (o centróide é soma / total).
+NIVEIS_GRADE = range(1, 11)
+CELULA_X = "MAX(MIN(CAST(({t}.longitude + 180.0) * {g}.celulas / 360.0 AS INTEGER), {g}.celulas - 1), 0)"
+CELULA_Y = "MAX(MIN(CAST((90.0 - {t}.latitude) * {g}.celulas / 180.0 AS INTEGER), {g}.celulas - 1), 0)"
+
+
+def _agrupar_sol(t, delta):
+    ano, mes = ANO_SOL.format(t=t), MES_SOL.format(t=t)
+    x, y = CELULA_X.format(t=t, g="g"), CELULA_Y.format(t=t, g="g")
+    sql = f"""
+            INSERT INTO suns_grade (nivel, year, month, cell_x, cell_y, total, soma_lat, soma_lon)
+                SELECT g.nivel, {ano}, {mes}, {x}, {y}, {delta}, {delta} * {t}.latitude, {delta} * {t}.longitude
+                FROM niveis_grade g
+                WHERE {t}.latitude IS NOT NULL AND {t}.longitude IS NOT NULL
+                ON CONFLICT (nivel, year, month, cell_x, cell_y) DO UPDATE SET
+                    total = total + excluded.total,
+                    soma_lat = soma_lat + excluded.soma_lat,
+                    soma_lon = soma_lon + excluded.soma_lon;"""
+    if delta < 0:
+        sql += f"""
+            DELETE FROM suns_grade
+                WHERE (nivel, year, month, cell_x, cell_y) IN (
+                    SELECT g.nivel, {ano}, {mes}, {x}, {y} FROM niveis_grade g
+                ) AND total <= 0;"""
+    return sql
+
+
+_VERSAO_SOIS = """
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'peacekeepers';"""
+
+
+def _versionar(tabela):
+    """Linha em versoes_tabelas e triggers que a incrementam a cada escrita em `tabela`."""
+    sql = f"""
+        INSERT OR IGNORE INTO versoes_tabelas (tabela) VALUES ('{tabela}');"""
+    for evento in ("INSERT", "UPDATE", "DELETE"):
+        sql += f"""
+
+        CREATE TRIGGER IF NOT EXISTS trg_{tabela}_versao_{evento.lower()}
+        AFTER {evento} ON {tabela}
+        BEGIN
+            UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = '{tabela}';
+        END;"""
+    return sql
+
+
+# Pilares de historical_peace_regional (0–100, 100 = mais paz). O índice
+# histórico é a média dos pilares presentes, ponderada por pesos_historicos.
+PILARES_HISTORICOS = (
+    "pilar_paz_tensao",
+    "pilar_protecao_vida",
+    "pilar_estabilidade_convivencia",
+    "pilar_compromisso_desarmamento",
+    "pilar_cuidado_vulneraveis",
+)
+
+
+def indice_historico_sql(pilares=PILARES_HISTORICOS):
+    """Expressão SQL do índice histórico para a linha corrente de historical_peace_regional."""
+    peso = "(SELECT peso FROM pesos_historicos WHERE pilar = '{p}')"
+    soma = " + ".join(f"IFNULL({p} * {peso.format(p=p)}, 0)" for p in pilares)
+    presentes = " + ".join(f"IIF({p} IS NULL, 0, {peso.format(p=p)})" for p in pilares)
+    return f"ROUND(({soma}) / NULLIF({presentes}, 0), 2)"
+
+
+_INDICE_HISTORICO = indice_historico_sql()
+
+
+# Cada item é (nome, sql). Nunca edite uma migração já publicada:
+# acrescente uma nova ao final da lista.
+MIGRACOES = [
+    ("indices_periodo_pais", """
+        CREATE INDEX IF NOT EXISTS idx_metrics_periodo
+            ON country_metrics (year, month, country_code);
+        CREATE INDEX IF NOT EXISTS idx_metrics_pais
+            ON country_metrics (country_code, year, month);
+    """),
+    # Triggers marcam em periodos_pendentes, para cada destino registrado em
+    # destinos_derivados, os meses de country_metrics que mudaram.
+    # app/derivados.py consome essas marcas e incrementa destinos_derivados.versao.
+    ("ranking_mensal", """
+        CREATE TABLE IF NOT EXISTS destinos_derivados (
+            nome TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS periodos_pendentes (
+            destino TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            PRIMARY KEY (destino, year, month)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_metrics_pendente_insert
+        AFTER INSERT ON country_metrics
+        BEGIN
+            INSERT INTO periodos_pendentes (destino, year, month)
+            SELECT d.nome, NEW.year, NEW.month FROM destinos_derivados d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM periodos_pendentes p
+                WHERE p.destino = d.nome AND p.year = NEW.year AND p.month = NEW.month
+            );
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_metrics_pendente_update
+        AFTER UPDATE OF country_code, year, month, indicator_value ON country_metrics
+        BEGIN
+            INSERT INTO periodos_pendentes (destino, year, month)
+            SELECT d.nome, NEW.year, NEW.month FROM destinos_derivados d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM periodos_pendentes p
+                WHERE p.destino = d.nome AND p.year = NEW.year AND p.month = NEW.month
+            );
+            INSERT INTO periodos_pendentes (destino, year, month)
+            SELECT d.nome, OLD.year, OLD.month FROM destinos_derivados d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM periodos_pendentes p
+                WHERE p.destino = d.nome AND p.year = OLD.year AND p.month = OLD.month
+            );
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_metrics_pendente_delete
+        AFTER DELETE ON country_metrics
+        BEGIN
+            INSERT INTO periodos_pendentes (destino, year, month)
+            SELECT d.nome, OLD.year, OLD.month FROM destinos_derivados d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM periodos_pendentes p
+                WHERE p.destino = d.nome AND p.year = OLD.year AND p.month = OLD.month
+            );
+        END;
+
+        CREATE TABLE IF NOT EXISTS country_rank_monthly (
+            country_code TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            value REAL NOT NULL,
+            level TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            percentile REAL NOT NULL,
+            PRIMARY KEY (year, month, country_code)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_rank_posicao
+            ON country_rank_monthly (year, month, position);
+
+        INSERT OR IGNORE INTO destinos_derivados (nome) VALUES ('ranking');
+        INSERT OR IGNORE INTO periodos_pendentes (destino, year, month)
+            SELECT DISTINCT 'ranking', year, month FROM country_metrics;
+    """),
+    # Totais de Sóis por país e por mês mantidos pelos próprios triggers,
+    # e um contador de versão de peacekeepers que não depende do tamanho
+    # da tabela. `python -m app.contadores` confere tudo contra as linhas.
+    ("contadores_suns", f"""
+        CREATE TABLE IF NOT EXISTS versoes_tabelas (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT OR IGNORE INTO versoes_tabelas (tabela) VALUES ('peacekeepers');
+
+        CREATE TABLE IF NOT EXISTS suns_por_pais (
+            country_code TEXT PRIMARY KEY,
+            total INTEGER NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS suns_por_mes (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (year, month)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_suns_contadores_insert
+        AFTER INSERT ON peacekeepers
+        BEGIN{_contar_sol("NEW", 1)}{_VERSAO_SOIS}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_suns_contadores_delete
+        AFTER DELETE ON peacekeepers
+        BEGIN{_contar_sol("OLD", -1)}{_VERSAO_SOIS}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_suns_contadores_update
+        AFTER UPDATE OF country_code, created_at ON peacekeepers
+        BEGIN{_contar_sol("OLD", -1)}{_contar_sol("NEW", 1)}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_suns_versao_update
+        AFTER UPDATE ON peacekeepers
+        BEGIN{_VERSAO_SOIS}
+        END;
+
+        INSERT INTO suns_por_pais (country_code, total)
+            SELECT {PAIS_SOL.format(t="p")}, COUNT(*) FROM peacekeepers p GROUP BY 1;
+        INSERT INTO suns_por_mes (year, month, total)
+            SELECT {ANO_SOL.format(t="p")}, {MES_SOL.format(t="p")}, COUNT(*)
+            FROM peacekeepers p GROUP BY 1, 2;
+    """),
+    # Um valor por país e mês: recarregar um mês substitui em vez de duplicar.
+    # Das linhas já repetidas fica a mais recente (maior id).
+    ("metricas_unicas", """
+        DELETE FROM country_metrics
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM country_metrics GROUP BY country_code, year, month
+        );
+        DROP INDEX IF EXISTS idx_metrics_pais;
+        CREATE UNIQUE INDEX idx_metrics_pais
+            ON country_metrics (country_code, year, month);
+    """),
+    # O índice histórico deixa de ser digitado: os triggers o recalculam a
+    # partir dos pilares, e app/historico.py troca os pesos e recalcula a
+    # tabela inteira num único UPDATE.
+    ("indice_historico", f"""
+        CREATE TABLE IF NOT EXISTS pesos_historicos (
+            pilar TEXT PRIMARY KEY,
+            peso REAL NOT NULL CHECK (peso >= 0)
+        );
+        INSERT OR IGNORE INTO pesos_historicos (pilar, peso) VALUES
+            ('pilar_paz_tensao', 0.30),
+            ('pilar_protecao_vida', 0.25),
+            ('pilar_estabilidade_convivencia', 0.20),
+            ('pilar_compromisso_desarmamento', 0.15),
+            ('pilar_cuidado_vulneraveis', 0.10);
+
+        CREATE TRIGGER IF NOT EXISTS trg_historico_indice_insert
+        AFTER INSERT ON historical_peace_regional
+        BEGIN
+            UPDATE historical_peace_regional SET indice_paz_viva_historica = {_INDICE_HISTORICO}
+            WHERE id = NEW.id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_historico_indice_update
+        AFTER UPDATE OF {", ".join(PILARES_HISTORICOS)}, indice_paz_viva_historica
+        ON historical_peace_regional
+        BEGIN
+            UPDATE historical_peace_regional SET indice_paz_viva_historica = {_INDICE_HISTORICO}
+            WHERE id = NEW.id AND indice_paz_viva_historica IS NOT {_INDICE_HISTORICO};
+        END;
+
+        UPDATE historical_peace_regional SET indice_paz_viva_historica = {_INDICE_HISTORICO};
+    """),
+    # Agrupamento dos Sóis por célula de grade e mês, para cada nível de
+    # zoom, mantido pelos mesmos eventos que os contadores de Sóis.
+    ("grade_suns", f"""
+        CREATE TABLE IF NOT EXISTS niveis_grade (
+            nivel INTEGER PRIMARY KEY,
+            celulas INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO niveis_grade (nivel, celulas) VALUES
+            {", ".join(f"({n}, {2 ** n})" for n in NIVEIS_GRADE)};
+
+        CREATE TABLE IF NOT EXISTS suns_grade (
+            nivel INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            cell_x INTEGER NOT NULL,
+            cell_y INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            soma_lat REAL NOT NULL,
+            soma_lon REAL NOT NULL,
+            PRIMARY KEY (nivel, year, month, cell_x, cell_y)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_suns_grade_insert
+        AFTER INSERT ON peacekeepers
+        BEGIN{_agrupar_sol("NEW", 1)}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_suns_grade_delete
+        AFTER DELETE ON peacekeepers
+        BEGIN{_agrupar_sol("OLD", -1)}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_suns_grade_update
+        AFTER UPDATE OF latitude, longitude, created_at ON peacekeepers
+        BEGIN{_agrupar_sol("OLD", -1)}{_agrupar_sol("NEW", 1)}
+        END;
+
+        INSERT INTO suns_grade (nivel, year, month, cell_x, cell_y, total, soma_lat, soma_lon)
+            SELECT g.nivel, {ANO_SOL.format(t="p")}, {MES_SOL.format(t="p")},
+                   {CELULA_X.format(t="p", g="g")}, {CELULA_Y.format(t="p", g="g")},
+                   COUNT(*), SUM(p.latitude), SUM(p.longitude)
+            FROM peacekeepers p CROSS JOIN niveis_grade g
+            WHERE p.latitude IS NOT NULL AND p.longitude IS NOT NULL
+            GROUP BY 1, 2, 3, 4, 5;
+    """),
+    # Chave espacial dos Sóis. O geohash é calculado em Python
+    # (app/espacial.py) ao registrar; se latitude/longitude mudarem por fora,
+    # o trigger zera a chave para que preencher_geohash a recalcule.
+    ("geohash_suns", """
+        ALTER TABLE peacekeepers ADD COLUMN geohash TEXT;
+        CREATE INDEX IF NOT EXISTS idx_peacekeepers_geohash ON peacekeepers (geohash);
+
+        CREATE TRIGGER IF NOT EXISTS trg_peacekeepers_geohash_update
+        AFTER UPDATE OF latitude, longitude ON peacekeepers
+        WHEN NEW.geohash IS NOT NULL AND NEW.geohash IS OLD.geohash
+        BEGIN
+            UPDATE peacekeepers SET geohash = NULL WHERE id = NEW.id;
+        END;
+    """),
+    # Agregados de country_metrics por mês, trimestre e ano, no mundo e por
+    # região (app/agregados.py). Guardam n, soma, soma dos quadrados, mínimo e
+    # máximo, que se combinam sem voltar às linhas: média e desvio saem deles.
+    # É mais um destino de periodos_pendentes; mudar a região de um país
+    # marca os meses em que ele tem dados.
+    ("agregados_metricas", f"""
+        CREATE TABLE IF NOT EXISTS regioes_paises (
+            country_code TEXT PRIMARY KEY,
+            region TEXT NOT NULL
+        ) WITHOUT ROWID;
+        INSERT OR IGNORE INTO regioes_paises (country_code, region) VALUES
+            {", ".join(f"('{codigo}', '{regiao}')" for regiao, codigos in REGIOES.items() for codigo in codigos)};
+
+        CREATE TABLE IF NOT EXISTS metricas_agregadas (
+            escala TEXT NOT NULL CHECK (escala IN ('mes', 'trimestre', 'ano')),
+            regiao TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            n INTEGER NOT NULL,
+            soma REAL NOT NULL,
+            soma_quadrados REAL NOT NULL,
+            minimo REAL NOT NULL,
+            maximo REAL NOT NULL,
+            PRIMARY KEY (escala, regiao, year, month)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_regioes_pendente_insert
+        AFTER INSERT ON regioes_paises
+        BEGIN
+            INSERT OR IGNORE INTO periodos_pendentes (destino, year, month)
+            SELECT DISTINCT 'agregados', year, month FROM country_metrics WHERE country_code = NEW.country_code;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_regioes_pendente_update
+        AFTER UPDATE ON regioes_paises
+        BEGIN
+            INSERT OR IGNORE INTO periodos_pendentes (destino, year, month)
+            SELECT DISTINCT 'agregados', year, month FROM country_metrics
+            WHERE country_code IN (OLD.country_code, NEW.country_code);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_regioes_pendente_delete
+        AFTER DELETE ON regioes_paises
+        BEGIN
+            INSERT OR IGNORE INTO periodos_pendentes (destino, year, month)
+            SELECT DISTINCT 'agregados', year, month FROM country_metrics WHERE country_code = OLD.country_code;
+        END;
+
+        INSERT OR IGNORE INTO destinos_derivados (nome) VALUES ('agregados');
+        INSERT OR IGNORE INTO periodos_pendentes (destino, year, month)
+            SELECT DISTINCT 'agregados', year, month FROM country_metrics;
+    """),
+    # Matriz densa país × mês em .npy (app/matriz.py), fora do banco: aqui só
+    # entra o destino, para os triggers de country_metrics marcarem os meses.
+    ("matriz_metricas", """
+        INSERT OR IGNORE INTO destinos_derivados (nome) VALUES ('matriz');
+        INSERT OR IGNORE INTO periodos_pendentes (destino, year, month)
+            SELECT DISTINCT 'matriz', year, month FROM country_metrics;
+    """),
+    # Histórico de um país (índice, nível e posição) sem varrer o ranking
+    # de todos os meses: ranking.SQL_PAIS.
+    ("indice_ranking_pais", """
+        CREATE INDEX IF NOT EXISTS idx_rank_pais
+            ON country_rank_monthly (country_code, year, month);
+    """),
+    # Variações de cada país de um mês para o seguinte, derivadas do ranking
+    # (app/ranking.py). ordem_variacao é a posição pela variação do índice no
+    # mês, então os maiores movimentos saem direto do índice.
+    ("variacoes_ranking", """
+        CREATE TABLE IF NOT EXISTS variacoes_ranking (
+            country_code TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            value REAL NOT NULL,
+            level TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            valor_anterior REAL,
+            nivel_anterior TEXT,
+            posicao_anterior INTEGER,
+            variacao REAL,
+            subida INTEGER,
+            ordem_variacao INTEGER,
+            PRIMARY KEY (year, month, country_code)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_variacoes_ordem
+            ON variacoes_ranking (year, month, ordem_variacao);
+
+        INSERT OR IGNORE INTO destinos_derivados (nome) VALUES ('variacoes');
+        INSERT OR IGNORE INTO periodos_pendentes (destino, year, month)
+            SELECT DISTINCT 'variacoes', year, month FROM country_metrics;
+    """),
+    # Versão das tabelas lidas pelo app mantida por triggers, como a de
+    # peacekeepers: COUNT/MAX(rowid) não enxergam UPDATEs nem upserts no
+    # mesmo segundo.
+    ("versoes_tabelas_app", f"""{_versionar("country_metrics")}
+{_versionar("country_metadata")}
+{_versionar("historical_peace_regional")}
+    """),
+]
+
+
+# Consulta barata que muda sempre que a tabela muda (versoes_tabelas e
+# destinos_derivados, mantidos pelos triggers e por app/derivados.py). Usada
+# como versão dos caches do app e dos arquivos de app/colunar.py.
+IMPRESSOES = {
+    "country_metadata": "SELECT versao FROM versoes_tabelas WHERE tabela = 'country_metadata'",
+    "country_metrics": "SELECT versao FROM versoes_tabelas WHERE tabela = 'country_metrics'",
+    "peacekeepers": "SELECT versao FROM versoes_tabelas WHERE tabela = 'peacekeepers'",
+    "country_rank_monthly": "SELECT versao FROM destinos_derivados WHERE nome = 'ranking'",
+    "historical_peace_regional": "SELECT versao FROM versoes_tabelas WHERE tabela = 'historical_peace_regional'",
+    "metricas_agregadas": "SELECT versao FROM destinos_derivados WHERE nome = 'agregados'",
+    "matriz_metricas": "SELECT versao FROM destinos_derivados WHERE nome = 'matriz'",
+    "variacoes_ranking": "SELECT versao FROM destinos_derivados WHERE nome = 'variacoes'",
+}
+
+
+def identidade(db_path=DB_PATH):
+    """Nome das pastas de cache do banco: hash do caminho resolvido do arquivo."""
+    return hashlib.sha1(str(Path(db_path).resolve()).encode()).hexdigest()[:12]
+
+
+def identidade_conexao(conn):
+    """identidade() do arquivo principal da conexão."""
+    caminho = next(arquivo for _, nome, arquivo in conn.execute("PRAGMA database_list") if nome == "main")
+    # Banco em memória não tem arquivo: nome fixo, nunca o de um arquivo real.
+    return identidade(caminho) if caminho else "memoria"
+
+
+def conectar(db_path=DB_PATH):
+    """Conexão de escrita (scripts, ingestão e manutenção)."""
+    return sqlite3.connect(db_path)
+
+
+def migrar(db_path=DB_PATH):
+    """Aplica as migrações pendentes e devolve a versão final do esquema."""
+    conn = conectar(db_path)
+    try:
+        versao = conn.execute("PRAGMA user_version").fetchone()[0]
+        for numero, (nome, sql) in enumerate(MIGRACOES, start=1):
+            if numero <= versao:
+                continue
+            conn.executescript(f"BEGIN;\n{sql}\nPRAGMA user_version = {numero};\nCOMMIT;")
+            versao = numero
+        return versao
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    print(f"✅ Esquema de {DB_PATH.name} na versão {migrar()}.")
@@ -0,0 +1,112 @@
+"""Camadas Folium vetorizadas para mapas com muitos pontos.
+
+Cores e raios são calculados com NumPy para todos os pontos de uma vez, e
+cada camada vai para o HTML como um único bloco de dados (GeoJSON ou o array
+do FastMarkerCluster), desenhado no navegador por um só callback — em vez
+de um CircleMarker e um Popup por linha, cada um com o seu próprio JS.
+"""
+import html
+
+import folium
+import numpy as np
+from folium.plugins import FastMarkerCluster
+
+# Desenha um círculo por linha [lat, lon, cor, raio, rótulo, valor, código].
+_CIRCULO_JS = """
+function (row) {
+    var circulo = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: row[3], color: row[2], fillColor: row[2], fill: true, fillOpacity: 0.8, weight: 2
+    });
+    var texto = "<b>" + row[4] + "</b>";
+    if (row[5] !== null) { texto += "<br/>Valor: " + row[5].toFixed(3); }
+    if (row[6]) { texto += "<br/>Código: " + row[6]; }
+    circulo.bindPopup(texto, {maxWidth: 350});
+    return circulo;
+}
+"""
+
+# Cor e raio vêm de feature.properties: nenhuma função de estilo Python por ponto.
+_ESTILO_JS = folium.JsCode("""
+function (feature, layer) {
+    var p = feature.properties;
+    layer.setStyle({color: p.cor, fillColor: p.cor, radius: p.raio});
+}
+""")
+
+
+def cores_degraus(valores, colormap):
+    """Cor hexadecimal de cada valor num branca StepColormap, sem laço Python.
+
+    Mesma regra de StepColormap.__call__: abaixo do primeiro limite usa a
+    primeira cor, a partir do último usa a última.
+    """
+    paleta = np.array([colormap(c) for c in colormap.index[:-1]])
+    idx = np.searchsorted(np.asarray(colormap.index, dtype="float64"), np.asarray(valores, dtype="float64"),
+                          side="right") - 1
+    return paleta[np.clip(idx, 0, len(paleta) - 1)]
+
+
+def raios(valores, raio_minimo, vmin=None, vmax=None):
+    """Raio inteiro entre raio_minimo e 4 × raio_minimo, proporcional ao valor."""
+    v = np.asarray(valores, dtype="float64")
+    vmin = np.nanmin(v) if vmin is None else vmin
+    vmax = np.nanmax(v) if vmax is None else vmax
+    if vmax == vmin:
+        return np.full(v.shape, raio_minimo, dtype="int64")
+    normalizado = (v - vmin) / (vmax - vmin)
+    return raio_minimo + (normalizado * raio_minimo * 3).astype("int64")
+
+
+def _texto(valores):
+    """Textos escapados para HTML: os popups (JS e GeoJsonPopup) os inserem como marcação."""
+    return [html.escape(v) if isinstance(v, str) else v for v in np.asarray(valores, dtype=object).tolist()]
+
+
+def _linhas(lat, lon, cores, raios_px, rotulos, valores, codigos):
+    # Rótulos e códigos vêm de cadastros (cidade, país): nunca vão crus para o HTML.
+    valores = np.round(np.asarray(valores, dtype="float64"), 3)
+    return list(zip(
+        np.asarray(lat, dtype="float64").tolist(),
+        np.asarray(lon, dtype="float64").tolist(),
+        np.asarray(cores).tolist(),
+        np.asarray(raios_px).tolist(),
+        _texto(rotulos),
+        [None if np.isnan(v) else v for v in valores.tolist()],
+        _texto(codigos),
+    ))
+
+
+def camada_circulos(lat, lon, cores, raios_px, rotulos, valores=None, codigos=None, agrupar=True, nome=None):
+    """Uma camada com um círculo por ponto.
+
+    agrupar=True devolve um FastMarkerCluster (os círculos são criados no
+    navegador a partir de um array); agrupar=False devolve um único GeoJson.
+    """
+    n = len(lat)
+    valores = np.full(n, np.nan) if valores is None else valores
+    codigos = [""] * n if codigos is None else codigos
+    linhas = _linhas(lat, lon, cores, raios_px, rotulos, valores, codigos)
+    if agrupar:
+        return FastMarkerCluster(linhas, callback=_CIRCULO_JS, name=nome, control=nome is not None)
+
+    dados = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lo, la]},
+                "properties": {"cor": cor, "raio": raio, "nome": rotulo, "valor": valor, "codigo": codigo},
+            }
+            for la, lo, cor, raio, rotulo, valor, codigo in linhas
+        ],
+    }
+    camada = folium.GeoJson(
+        dados,
+        name=nome,
+        control=nome is not None,
+        marker=folium.CircleMarker(fill=True, fill_opacity=0.8, weight=2),
+        popup=folium.GeoJsonPopup(fields=["nome", "valor", "codigo"], aliases=["", "Valor:", "Código:"],
+                                  labels=True, max_width=350),
+        on_each_feature=_ESTILO_JS,
+    )
+    return camada
@@ -0,0 +1,163 @@
+"""Cache colunar (Parquet) das tabelas grandes de paz.db.
+
+peacekeepers e country_metrics são exportadas em lotes, sem montar a tabela
+inteira em objetos Python, para arquivos Parquet com tipos definidos:
+country_code como dicionário (vira Categorical no pandas), created_at como
+timestamp, year/month como inteiros pequenos. As linhas saem ordenadas pela
+chave de tempo, então as estatísticas de cada row group permitem que os
+filtros de `ler()` pulem grupos inteiros (predicate pushdown); o arquivo é
+aberto com memory map.
+
+Os arquivos ficam em CACHE_DIR/<banco>/<tabela>.parquet, com <banco> derivado
+do caminho do arquivo SQLite (`identidade` de app/banco.py, como a matriz de
+app/matriz.py): bancos diferentes nunca leem o cache um do outro. Cada
+arquivo guarda nos metadados a versão da tabela (IMPRESSOES) de onde saiu;
+se a versão mudar, `ler()` exporta de novo antes de ler.
+
+    python -m app.colunar            # (re)exporta as duas tabelas
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.banco import BASE_DIR, DB_PATH, IMPRESSOES, conectar, identidade_conexao, migrar
+
+CACHE_DIR = BASE_DIR / "data" / "cache"
+LOTE = 100_000
+CHAVE_VERSAO = b"paz.versao"
+
+_CODIGO = pa.dictionary(pa.int32(), pa.string())
+
+TABELAS = {
+    "peacekeepers": {
+        "sql": "SELECT id, country_code, city, latitude, longitude, created_at FROM peacekeepers"
+               " ORDER BY created_at, id",
+        "schema": pa.schema([
+            ("id", pa.int64()),
+            ("country_code", _CODIGO),
+            ("city", pa.string()),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("created_at", pa.timestamp("s")),
+        ]),
+    },
+    "country_metrics": {
+        "sql": "SELECT country_code, year, month, indicator_value FROM country_metrics"
+               " ORDER BY year, month, country_code",
+        "schema": pa.schema([
+            ("country_code", _CODIGO),
+            ("year", pa.int16()),
+            ("month", pa.int8()),
+            ("indicator_value", pa.float64()),
+        ]),
+    },
+}
+
+
+def caminho(tabela, banco, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / banco / f"{tabela}.parquet"
+
+
+def _coluna(valores, tipo):
+    if pa.types.is_timestamp(tipo):
+        texto = pa.array(valores, type=pa.string())
+        datas = pc.strptime(texto, format="%Y-%m-%d %H:%M:%S", unit="s", error_is_null=True)
+        if datas.null_count == texto.null_count:
+            return datas
+        # Fora do formato do banco: mesmo parser leniente do pd.to_datetime que o
+        # app usava (espaço ou "T", só a data, frações, fuso); texto que não é
+        # data levanta erro em vez de virar nulo calado.
+        datas = pd.to_datetime(pd.Series(valores, dtype=object), format="ISO8601")
+        if datas.dt.tz is not None:
+            datas = datas.dt.tz_convert(None)
+        return pa.array(datas.dt.floor("s"), type=tipo)
+    if pa.types.is_dictionary(tipo):
+        return pa.array(valores, type=pa.string()).dictionary_encode()
+    return pa.array(valores, type=tipo)
+
+
+def _lotes(tabela, conn, schema, lote=LOTE):
+    """RecordBatches de `tabela`, lidos do SQLite `lote` linhas por vez."""
+    cursor = conn.execute(TABELAS[tabela]["sql"])
+    while True:
+        bloco = cursor.fetchmany(lote)
+        if not bloco:
+            return
+        colunas = [_coluna(valores, campo.type) for valores, campo in zip(zip(*bloco), schema)]
+        yield pa.RecordBatch.from_arrays(colunas, schema=schema)
+
+
+def exportar(tabela, conn, versao=None, cache_dir=CACHE_DIR, lote=LOTE):
+    """Exporta `tabela` em lotes para Parquet; devolve (caminho, linhas)."""
+    schema = TABELAS[tabela]["schema"].with_metadata({CHAVE_VERSAO: json.dumps(versao).encode()})
+    destino = caminho(tabela, identidade_conexao(conn), cache_dir)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    # Escreve num temporário e troca no fim: leitores nunca veem arquivo pela metade.
+    fd, temporario = tempfile.mkstemp(dir=destino.parent, suffix=".parquet.tmp")
+    os.close(fd)
+    linhas = 0
+    try:
+        with pq.ParquetWriter(temporario, schema, compression="zstd") as escritor:
+            for batch in _lotes(tabela, conn, schema, lote):
+                escritor.write_batch(batch, row_group_size=lote)
+                linhas += batch.num_rows
+        os.replace(temporario, destino)
+    except BaseException:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+    return destino, linhas
+
+
+def versao_gravada(tabela, banco, cache_dir=CACHE_DIR):
+    """Versão da tabela registrada no arquivo do banco, ou None se não houver cache."""
+    try:
+        metadados = pq.read_schema(caminho(tabela, banco, cache_dir)).metadata or {}
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    bruto = metadados.get(CHAVE_VERSAO)
+    return json.loads(bruto) if bruto else None
+
+
+def ler(tabela, conn, versao, colunas=None, filtros=None, cache_dir=CACHE_DIR):
+    """DataFrame de `tabela` a partir do cache, exportando antes se estiver velho.
+
+    `filtros` segue pyarrow.parquet (ex.: [("year", "=", 2025)]) e é aplicado
+    na leitura, pulando row groups que não podem conter linhas.
+    """
+    versao = json.loads(json.dumps(versao))  # tuplas viram listas, como no arquivo
+    banco = identidade_conexao(conn)
+    try:
+        if versao_gravada(tabela, banco, cache_dir) != versao:
+            exportar(tabela, conn, versao, cache_dir)
+    except OSError:
+        # Diretório sem permissão de escrita: mesma conversão, só em memória.
+        schema = TABELAS[tabela]["schema"]
+        dataset = ds.dataset(pa.Table.from_batches(_lotes(tabela, conn, schema), schema=schema))
+        filtro = pq.filters_to_expression(filtros) if filtros else None
+        return dataset.to_table(columns=colunas, filter=filtro).to_pandas(self_destruct=True)
+    tabela_arrow = pq.read_table(caminho(tabela, banco, cache_dir), columns=colunas, filters=filtros,
+                                 memory_map=True)
+    return tabela_arrow.to_pandas(self_destruct=True)
+
+
+def main():
+    migrar(DB_PATH)
+    conn = conectar(DB_PATH)
+    try:
+        for tabela in TABELAS:
+            versao = list(conn.execute(IMPRESSOES[tabela]).fetchall()[0])
+            destino, linhas = exportar(tabela, conn, versao)
+            print(f"✅ {tabela}: {linhas} linhas em {destino} ({destino.stat().st_size / 1e6:.1f} MB)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
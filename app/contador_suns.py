@@ -1,65 +1,57 @@
-import streamlit as st
-import sqlite3
-import pandas as pd
+import sys
 from pathlib import Path
 
-st.set_page_config(page_title="Contador Global de Sóis", layout="wide")
-
-st.title("☀️ Contador Global de Sóis da Paz Viva")
-st.markdown("Número de pacificadores do Movimento da Paz no planeta.")
-
-DB_PATH = Path("data/database/paz.db")
-
-# -------------------------------
-# CONEXÃO COM O BANCO
-# -------------------------------
-conn = sqlite3.connect(DB_PATH)
+import streamlit as st
 
-df = pd.read_sql_query(
-    "SELECT country_code, created_at FROM peacekeepers",
-    conn
-)
+if __name__ == "__main__":
+    # `streamlit run app/contador_suns.py` só põe app/ no sys.path; o pacote app fica na raiz.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-df_countries = pd.read_sql_query(
-    "SELECT country_code, country_name FROM country_metadata",
-    conn
-)
+from app import paginas  # noqa: E402
 
-conn.close()
 
-df["created_at"] = pd.to_datetime(df["created_at"])
+def render(compartilhados=None):
+    """Totais de Sóis da Paz: global, por país e por mês."""
+    from app.dados import rotulo_periodo
 
-# -------------------------------
-# CONTADOR GLOBAL
-# -------------------------------
-total_suns = len(df)
+    st.title("☀️ Contador Global de Sóis da Paz Viva")
+    st.markdown("Número de pacificadores do Movimento da Paz no planeta.")
 
-st.metric("☀️ Total Global de Sóis da Paz", total_suns)
+    # -------------------------------
+    # DADOS (CONTADORES MANTIDOS NO BANCO)
+    # -------------------------------
+    compartilhados = compartilhados or paginas.dados("contador_suns")
+    df_country = compartilhados["suns_por_pais"]
+    df_month = compartilhados["suns_por_mes"]
 
-st.divider()
+    # -------------------------------
+    # CONTADOR GLOBAL
+    # -------------------------------
+    total_suns = int(df_month["total"].sum())
 
-# -------------------------------
-# CONTADOR POR PAÍS
-# -------------------------------
-df_country = df.groupby("country_code").size().reset_index(name="total")
+    st.metric("☀️ Total Global de Sóis da Paz", total_suns)
 
-df_country = df_country.merge(df_countries, on="country_code", how="left")
+    st.divider()
 
-df_country = df_country.sort_values(by="total", ascending=False)
+    # -------------------------------
+    # CONTADOR POR PAÍS
+    # -------------------------------
+    st.subheader("🌍 Sóis da Paz por País")
+    st.dataframe(df_country[["country_name", "total"]], use_container_width=True)
 
-st.subheader("🌍 Sóis da Paz por País")
-st.dataframe(df_country[["country_name", "total"]], use_container_width=True)
+    st.divider()
 
-st.divider()
+    # -------------------------------
+    # CONTADOR POR MÊS
+    # -------------------------------
+    df_month["ano_mes"] = rotulo_periodo(df_month["periodo"])
 
-# -------------------------------
-# CONTADOR POR MÊS
-# -------------------------------
-df["ano_mes"] = df["created_at"].dt.to_period("M").astype(str)
+    st.subheader("📅 Evolução Mensal dos Sóis da Paz")
+    st.dataframe(df_month[["ano_mes", "total"]], use_container_width=True)
 
-df_month = df.groupby("ano_mes").size().reset_index(name="total")
+    st.success("✅ Contador Global de Sóis carregado com sucesso!")
 
-st.subheader("📅 Evolução Mensal dos Sóis da Paz")
-st.dataframe(df_month, use_container_width=True)
 
-st.success("✅ Contador Global de Sóis carregado com sucesso!")
+if __name__ == "__main__":
+    st.set_page_config(page_title="Contador Global de Sóis", layout="wide")
+    render()
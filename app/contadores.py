@@ -0,0 +1,104 @@
+"""Contadores de Sóis (suns_por_pais, suns_por_mes e a grade suns_grade).
+
+Os totais são mantidos pelos triggers de peacekeepers (migração
+"contadores_suns" em app/banco.py), então o Contador de Sóis lê algumas
+centenas de linhas, qualquer que seja o número de registros.
+
+`INSERT OR REPLACE` em peacekeepers não dispara o trigger de DELETE da linha
+substituída; se algum script fizer isso, os totais podem divergir. Este
+módulo confere os contadores contra as linhas brutas e, se pedido, corrige:
+
+    python -m app.contadores             # só confere
+    python -m app.contadores --corrigir  # reconstrói a partir de peacekeepers
+"""
+import argparse
+
+from app.banco import ANO_SOL, CELULA_X, CELULA_Y, DB_PATH, MES_SOL, PAIS_SOL, conectar, migrar
+
+# tabela: (chaves, demais colunas, recálculo a partir de peacekeepers)
+_RECALCULO = {
+    "suns_por_pais": (
+        ("country_code",),
+        ("total",),
+        f"SELECT {PAIS_SOL.format(t='p')} AS country_code, COUNT(*) AS total "
+        "FROM peacekeepers p GROUP BY 1",
+    ),
+    "suns_por_mes": (
+        ("year", "month"),
+        ("total",),
+        f"SELECT {ANO_SOL.format(t='p')} AS year, {MES_SOL.format(t='p')} AS month, COUNT(*) AS total "
+        "FROM peacekeepers p GROUP BY 1, 2",
+    ),
+    "suns_grade": (
+        ("nivel", "year", "month", "cell_x", "cell_y"),
+        ("total", "soma_lat", "soma_lon"),
+        f"SELECT g.nivel AS nivel, {ANO_SOL.format(t='p')} AS year, {MES_SOL.format(t='p')} AS month, "
+        f"{CELULA_X.format(t='p', g='g')} AS cell_x, {CELULA_Y.format(t='p', g='g')} AS cell_y, "
+        "COUNT(*) AS total, SUM(p.latitude) AS soma_lat, SUM(p.longitude) AS soma_lon "
+        "FROM peacekeepers p CROSS JOIN niveis_grade g "
+        "WHERE p.latitude IS NOT NULL AND p.longitude IS NOT NULL GROUP BY 1, 2, 3, 4, 5",
+    ),
+}
+
+
+def verificar(conn):
+    """Diferenças entre contadores e linhas brutas: [(tabela, chave, esperado, gravado)]."""
+    divergencias = []
+    for tabela, (chaves, _, recalculo) in _RECALCULO.items():
+        colunas = ", ".join(chaves)
+        juncao = " AND ".join(f"g.{c} = e.{c}" for c in chaves)
+        # FULL OUTER JOIN emulado: chaves só no recálculo e chaves só na tabela.
+        linhas = conn.execute(
+            f"""
+            WITH esperado AS ({recalculo})
+            SELECT {", ".join(f"e.{c}" for c in chaves)}, e.total, g.total
+            FROM esperado e LEFT JOIN {tabela} g ON {juncao}
+            WHERE g.total IS NOT e.total
+            UNION ALL
+            SELECT {", ".join(f"g.{c}" for c in chaves)}, NULL, g.total
+            FROM {tabela} g
+            WHERE NOT EXISTS (SELECT 1 FROM esperado e WHERE {juncao})
+            ORDER BY {colunas}
+            """
+        ).fetchall()
+        for linha in linhas:
+            *chave, esperado, gravado = linha
+            divergencias.append((tabela, tuple(chave), esperado or 0, gravado or 0))
+    return divergencias
+
+
+def reconstruir(conn):
+    """Recalcula todos os contadores a partir de peacekeepers, numa transação."""
+    with conn:
+        for tabela, (chaves, valores, recalculo) in _RECALCULO.items():
+            conn.execute(f"DELETE FROM {tabela}")
+            conn.execute(f"INSERT INTO {tabela} ({', '.join(chaves + valores)}) {recalculo}")
+        conn.execute("UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = 'peacekeepers'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Confere os contadores de Sóis contra peacekeepers.")
+    parser.add_argument("--corrigir", action="store_true", help="reconstrói os contadores se houver divergência")
+    args = parser.parse_args(argv)
+
+    migrar(DB_PATH)
+    conn = conectar(DB_PATH)
+    try:
+        divergencias = verificar(conn)
+        if not divergencias:
+            print("✅ Contadores de Sóis consistentes com peacekeepers.")
+            return 0
+        print(f"⚠️ {len(divergencias)} divergência(s):")
+        for tabela, chave, esperado, gravado in divergencias:
+            print(f"- {tabela} {chave}: esperado {esperado}, gravado {gravado}")
+        if args.corrigir:
+            reconstruir(conn)
+            print("✅ Contadores reconstruídos a partir de peacekeepers.")
+            return 0
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,505 @@
+"""Camada compartilhada de acesso ao banco paz.db.
+
+Todas as páginas leem o banco por aqui. As conexões são somente leitura e
+reaproveitadas entre reruns e sessões; cada tabela tem seu próprio cache,
+invalidado apenas quando o conteúdo daquela tabela muda.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app import colunar, derivados, matriz, ranking
+from app.agregados import ESCALAS, estatisticas
+from app.banco import DB_PATH, IMPRESSOES, conectar, identidade, migrar
+from app.escala import NIVEL_PAZ
+from app.espacial import sois_na_caixa
+from app.grade import MAX_PONTOS, celulas_da_caixa
+from app.metodologia import PILARES
+
+TAMANHO_POOL = 4
+COLUNAS_PACIFICADORES = ["country_code", "city", "latitude", "longitude", "created_at"]
+
+# Há trabalho para app/derivados.py: meses a reprocessar ou Sóis sem geohash.
+SQL_PENDENCIAS = """
+    SELECT 1 WHERE EXISTS (SELECT 1 FROM periodos_pendentes)
+        OR EXISTS (SELECT 1 FROM peacekeepers
+                   WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL)
+"""
+
+
+# ======================================
+# POOL DE CONEXÕES
+# ======================================
+class PoolConexoes:
+    """Conexões somente leitura compartilhadas pelas páginas do processo."""
+
+    def __init__(self, db_path=DB_PATH, tamanho=TAMANHO_POOL):
+        self._db_path = db_path
+        self._uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        self._livres = queue.Queue(maxsize=tamanho)
+        self._trava = threading.Lock()
+        self._monitor = self._abrir()
+        self._data_version = None
+        self._versoes = {}
+        self._trava_derivados = threading.Lock()
+        self._derivados_em = None
+
+    def _abrir(self):
+        return sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+
+    @contextmanager
+    def conexao(self):
+        try:
+            conn = self._livres.get_nowait()
+        except queue.Empty:
+            conn = self._abrir()
+        try:
+            yield conn
+        finally:
+            try:
+                self._livres.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def versao(self, tabela):
+        """Token que identifica o conteúdo atual de `tabela`."""
+        with self._trava:
+            atual = self._monitor.execute("PRAGMA data_version").fetchall()[0][0]
+            if atual != self._data_version:
+                self._data_version = atual
+                self._versoes.clear()
+            if tabela not in self._versoes:
+                self._versoes[tabela] = tuple(self._monitor.execute(IMPRESSOES[tabela]).fetchall()[0])
+            return self._versoes[tabela]
+
+    def garantir_derivados(self):
+        """Processa pendências de app/derivados.py se o banco mudou desde a última vez."""
+        with self._trava_derivados:
+            with self._trava:
+                atual = self._monitor.execute("PRAGMA data_version").fetchall()[0][0]
+                if atual == self._derivados_em:
+                    return
+                pendente = self._monitor.execute(SQL_PENDENCIAS).fetchall()
+            if pendente:
+                conn = conectar(self._db_path)
+                try:
+                    derivados.atualizar(conn)
+                finally:
+                    conn.close()
+            self._derivados_em = atual
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    migrar(DB_PATH)
+    return PoolConexoes(DB_PATH)
+
+
+def conexao():
+    """Empresta uma conexão somente leitura do pool (usar com `with`)."""
+    return get_pool().conexao()
+
+
+def versao_tabela(tabela):
+    return get_pool().versao(tabela)
+
+
+def _consultar(sql, params=(), **kwargs):
+    with conexao() as conn:
+        return pd.read_sql_query(sql, conn, params=params, **kwargs)
+
+
+# ======================================
+# FORMATO COMPACTO DOS DATAFRAMES
+# ======================================
+# Todas as leituras devolvem country_code com o mesmo dicionário categórico
+# (merges comparam códigos inteiros, não strings), year/month em int16/int8
+# mais a chave de período int32 e valores em float32.
+TIPOS_COMPACTOS = {
+    "year": "int16",
+    "month": "int8",
+    "indicator_value": "float32",
+    "percentil": "float32",
+    "Posição": "int16",
+    "latitude": "float32",
+    "longitude": "float32",
+    "total": "int32",
+    "n": "int32",
+    "media": "float32",
+    "desvio": "float32",
+    "minimo": "float32",
+    "maximo": "float32",
+    "valor_anterior": "float32",
+    "variacao": "float32",
+    "posicao_anterior": "Int16",
+    "subida": "Int16",
+    "ordem_variacao": "Int16",
+}
+
+
+def chave_periodo(ano, mes):
+    """Período como um inteiro: year * 12 + month - 1 (ano = chave // 12, mês = chave % 12 + 1)."""
+    return ano * 12 + mes - 1
+
+
+def rotulo_periodo(chave):
+    """'AAAA-MM' para uma chave de período (ou array/Series de chaves)."""
+    chave = np.asarray(chave)
+    if not chave.size:
+        return chave.astype(str)
+    return np.char.add(np.char.add((chave // 12).astype(str), "-"), np.char.zfill((chave % 12 + 1).astype(str), 2))
+
+
+def compactar(df, paises):
+    """Aplica o formato compacto; `paises` é o CategoricalDtype compartilhado."""
+    if "country_code" in df.columns:
+        df["country_code"] = df["country_code"].astype("string").astype(paises)
+    for coluna, tipo in TIPOS_COMPACTOS.items():
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype(tipo)
+    if "year" in df.columns and "month" in df.columns:
+        df["periodo"] = chave_periodo(df["year"].astype("int32"), df["month"].astype("int32"))
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_dicionario_paises(versao_paises, versao_metricas, versao_sois):
+    codigos = _consultar(
+        """
+        SELECT country_code FROM country_metadata
+        UNION SELECT country_code FROM country_metrics
+        UNION SELECT country_code FROM suns_por_pais WHERE country_code <> ''
+        """
+    )["country_code"].dropna()
+    return pd.CategoricalDtype(sorted(codigos.astype(str).unique()))
+
+
+def _versao_dicionario():
+    return tuple(versao_tabela(t) for t in ("country_metadata", "country_metrics", "peacekeepers"))
+
+
+def dicionario_paises() -> pd.CategoricalDtype:
+    """Dicionário de country_code compartilhado por todos os DataFrames da camada."""
+    return _ler_dicionario_paises(*_versao_dicionario())
+
+
+# ======================================
+# LEITURAS CACHEADAS POR TABELA
+# ======================================
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_paises(versao, dicionario):
+    return compactar(_consultar(
+        "SELECT country_code, country_name, latitude, longitude FROM country_metadata",
+        dtype={"country_name": "string"},
+    ), _ler_dicionario_paises(*dicionario))
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_metricas(versao, dicionario):
+    with conexao() as conn:
+        return compactar(colunar.ler("country_metrics", conn, versao), _ler_dicionario_paises(*dicionario))
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_periodos(versao):
+    return compactar(_consultar("SELECT DISTINCT year, month FROM country_metrics ORDER BY year, month"), None)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_periodo(versao, dicionario, ano, mes):
+    return compactar(_consultar(
+        "SELECT country_code, year, month, indicator_value FROM country_metrics"
+        " WHERE year = ? AND month = ?",
+        (int(ano), int(mes)),
+    ), _ler_dicionario_paises(*dicionario))
+
+
+def _consultar_ranking(sql, params, dicionario):
+    df = _consultar(sql, params, dtype={"country_name": "string"})
+    df["nivel_paz"] = df["nivel_paz"].astype(NIVEL_PAZ)
+    return compactar(df, _ler_dicionario_paises(*dicionario))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_ranking(versao, dicionario, ano, mes):
+    return _consultar_ranking(ranking.SQL_MES, (int(ano), int(mes)), dicionario)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_extremos(versao, dicionario, ano, mes, k, do_fim):
+    df = _consultar_ranking(ranking.SQL_BASE if do_fim else ranking.SQL_TOPO, (int(ano), int(mes), int(k)), dicionario)
+    return df.iloc[::-1].reset_index(drop=True) if do_fim else df
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _ler_pagina_ranking(versao, dicionario, ano, mes, limite, depois):
+    # Uma linha a mais só para saber se há página seguinte.
+    df = _consultar_ranking(ranking.SQL_PAGINA, (int(ano), int(mes), *depois, int(limite) + 1), dicionario)
+    mais = len(df) > limite
+    df = df.iloc[:limite]
+    df.attrs["mais"] = mais
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_niveis(versao, ano, mes):
+    df = _consultar(ranking.SQL_NIVEIS_MES, (int(ano), int(mes)))
+    df["nivel_paz"] = df["nivel_paz"].astype(NIVEL_PAZ)
+    return df.sort_values("quantidade", ascending=False, ignore_index=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_variacoes(versao, dicionario, ano, mes):
+    df = _consultar(
+        ranking.SQL_VARIACOES_MES,
+        (int(ano), int(mes)),
+        dtype={"country_name": "string"},
+    )
+    df["nivel_paz"] = df["nivel_paz"].astype(NIVEL_PAZ)
+    df["nivel_anterior"] = df["nivel_anterior"].astype(NIVEL_PAZ)
+    return compactar(df, _ler_dicionario_paises(*dicionario))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_historico_pais(versao, codigo):
+    df = _consultar(ranking.SQL_PAIS, (codigo,))
+    df["nivel_paz"] = df["nivel_paz"].astype(NIVEL_PAZ)
+    return compactar(df, None)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _ler_pacificadores(versao, dicionario, ano, mes):
+    filtros = None
+    if ano is not None:
+        # Faixa de created_at: o Parquet está ordenado por data, então só os
+        # row groups do período são lidos.
+        inicio = pd.Timestamp(int(ano), int(mes or 1), 1)
+        fim = inicio + (pd.DateOffset(months=1) if mes else pd.DateOffset(years=1))
+        filtros = [("created_at", ">=", inicio), ("created_at", "<", fim)]
+    with conexao() as conn:
+        df = colunar.ler("peacekeepers", conn, versao, colunas=COLUNAS_PACIFICADORES, filtros=filtros)
+    return compactar(df, _ler_dicionario_paises(*dicionario))
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_suns_por_pais(versao, dicionario):
+    return compactar(_consultar(
+        """
+        SELECT s.country_code, c.country_name, s.total
+        FROM suns_por_pais s
+        LEFT JOIN country_metadata c ON c.country_code = s.country_code
+        ORDER BY s.total DESC, s.country_code
+        """,
+        dtype={"country_name": "string"},
+    ), _ler_dicionario_paises(*dicionario))
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_suns_por_mes(versao):
+    return compactar(_consultar("SELECT year, month, total FROM suns_por_mes ORDER BY year, month"), None)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_historico_regional(versao):
+    return _consultar(
+        f"""
+        SELECT year, region, {", ".join(PILARES)}, indice_paz_viva_historica
+        FROM historical_peace_regional
+        ORDER BY year, region
+        """
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _ler_agregados(versao):
+    df = estatisticas(_consultar(
+        """
+        SELECT escala, regiao, year, month, n, soma, soma_quadrados, minimo, maximo
+        FROM metricas_agregadas
+        ORDER BY escala, regiao, year, month
+        """
+    ))
+    df["escala"] = df["escala"].astype(pd.CategoricalDtype(ESCALAS))
+    df["regiao"] = df["regiao"].astype("category")
+    return compactar(df.drop(columns=["soma", "soma_quadrados"]), None)
+
+
+# cache_resource: a matriz é compartilhada sem cópia (memory map somente leitura).
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _abrir_matriz(versao):
+    aberta = matriz.abrir(identidade(DB_PATH), versao[0])
+    if aberta is None:
+        # Cache sem permissão de escrita: a mesma matriz, só em memória.
+        with conexao() as conn:
+            aberta = matriz.de_banco(conn, versao[0])
+        aberta.valores.flags.writeable = False
+    return aberta
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_agrupamentos(versao, nivel, ano, mes, caixa, limite):
+    filtros, params = [], []
+    if ano is not None:
+        filtros.append("year = ?")
+        params.append(int(ano))
+    if mes is not None:
+        filtros.append("month = ?")
+        params.append(int(mes))
+    # Do nível pedido para baixo, até caber no limite de pontos.
+    for n in range(int(nivel), 0, -1):
+        faixa, celulas = [], []
+        if caixa is not None:
+            faixa = ["cell_x BETWEEN ? AND ?", "cell_y BETWEEN ? AND ?"]
+            celulas = list(celulas_da_caixa(n, *caixa))
+        df = _consultar(
+            f"""
+            SELECT cell_x, cell_y, SUM(total) AS total,
+                   SUM(soma_lat) / SUM(total) AS latitude, SUM(soma_lon) / SUM(total) AS longitude
+            FROM suns_grade
+            WHERE {" AND ".join(["nivel = ?"] + filtros + faixa)}
+            GROUP BY cell_x, cell_y
+            LIMIT ?
+            """,
+            [n] + params + celulas + [limite + 1],
+            dtype={"cell_x": "int64", "cell_y": "int64", "total": "int64",
+                   "latitude": "float64", "longitude": "float64"},
+        )
+        if len(df) <= limite:
+            break
+    df = df.iloc[:limite]
+    df.attrs["nivel"] = n
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ler_sois_na_caixa(versao, dicionario, caixa, ano, mes):
+    with conexao() as conn:
+        df = sois_na_caixa(conn, *caixa)
+    df["created_at"] = pd.to_datetime(df["created_at"])
+    if ano is not None:
+        df = df[df["created_at"].dt.year == ano]
+    if mes is not None:
+        df = df[df["created_at"].dt.month == mes]
+    return compactar(df.reset_index(drop=True), _ler_dicionario_paises(*dicionario))
+
+
+def carregar_paises() -> pd.DataFrame:
+    """country_code, country_name, latitude, longitude de country_metadata (formato compacto)."""
+    return _ler_paises(versao_tabela("country_metadata"), _versao_dicionario())
+
+
+def carregar_metricas() -> pd.DataFrame:
+    """country_code, year, month, periodo, indicator_value de country_metrics (cache Parquet)."""
+    return _ler_metricas(versao_tabela("country_metrics"), _versao_dicionario())
+
+
+def carregar_periodos() -> pd.DataFrame:
+    """Pares (year, month), com a chave periodo, que têm dados em country_metrics, em ordem."""
+    return _ler_periodos(versao_tabela("country_metrics"))
+
+
+def carregar_periodo(ano, mes) -> pd.DataFrame:
+    """Só as linhas de country_metrics do período, via idx_metrics_periodo."""
+    return _ler_periodo(versao_tabela("country_metrics"), _versao_dicionario(), ano, mes)
+
+
+def carregar_ranking(ano, mes) -> pd.DataFrame:
+    """Ranking materializado do período (country_rank_monthly), já ordenado."""
+    get_pool().garantir_derivados()
+    return _ler_ranking(versao_tabela("country_rank_monthly"), _versao_dicionario(), ano, mes)
+
+
+def carregar_topo_ranking(ano, mes, k) -> pd.DataFrame:
+    """Só os k primeiros do ranking do período, na ordem da posição."""
+    get_pool().garantir_derivados()
+    return _ler_extremos(versao_tabela("country_rank_monthly"), _versao_dicionario(), ano, mes, k, False)
+
+
+def carregar_base_ranking(ano, mes, k) -> pd.DataFrame:
+    """Só os k últimos do ranking do período, na ordem da posição."""
+    get_pool().garantir_derivados()
+    return _ler_extremos(versao_tabela("country_rank_monthly"), _versao_dicionario(), ano, mes, k, True)
+
+
+def carregar_pagina_ranking(ano, mes, limite, depois=None) -> pd.DataFrame:
+    """Até `limite` linhas do ranking depois de `depois` = (posição, country_code) da última já vista.
+
+    Sem `depois`, a primeira página. df.attrs["mais"] diz se há página seguinte.
+    """
+    get_pool().garantir_derivados()
+    depois = (0, "") if depois is None else (int(depois[0]), str(depois[1]))
+    return _ler_pagina_ranking(versao_tabela("country_rank_monthly"), _versao_dicionario(), ano, mes, limite, depois)
+
+
+def carregar_niveis_ranking(ano, mes) -> pd.DataFrame:
+    """nivel_paz, quantidade de países e soma dos índices no período, do nível mais comum ao menos."""
+    get_pool().garantir_derivados()
+    return _ler_niveis(versao_tabela("country_rank_monthly"), ano, mes)
+
+
+def carregar_variacoes(ano, mes) -> pd.DataFrame:
+    """Variação de cada país em relação ao mês anterior (variacoes_ranking), da maior alta à maior queda."""
+    get_pool().garantir_derivados()
+    return _ler_variacoes(versao_tabela("variacoes_ranking"), _versao_dicionario(), ano, mes)
+
+
+def carregar_historico_pais(codigo) -> pd.DataFrame:
+    """Meses do país no ranking materializado: índice, nível, posição e percentil, em ordem."""
+    get_pool().garantir_derivados()
+    return _ler_historico_pais(versao_tabela("country_rank_monthly"), str(codigo))
+
+
+def carregar_pacificadores(ano=None, mes=None) -> pd.DataFrame:
+    """Sóis registrados em peacekeepers (cache Parquet), opcionalmente só de um ano/mês."""
+    return _ler_pacificadores(versao_tabela("peacekeepers"), _versao_dicionario(), ano, mes)
+
+
+def carregar_suns_por_pais() -> pd.DataFrame:
+    """Total de Sóis por país (contador mantido por trigger), do maior ao menor."""
+    return _ler_suns_por_pais(versao_tabela("peacekeepers"), _versao_dicionario())
+
+
+def carregar_suns_por_mes() -> pd.DataFrame:
+    """Total de Sóis registrados em cada (year, month), em ordem."""
+    return _ler_suns_por_mes(versao_tabela("peacekeepers"))
+
+
+def carregar_historico_regional() -> pd.DataFrame:
+    """year, region, os cinco pilares e o índice de historical_peace_regional."""
+    return _ler_historico_regional(versao_tabela("historical_peace_regional"))
+
+
+def carregar_agregados() -> pd.DataFrame:
+    """escala (mes/trimestre/ano), regiao, year, month (início), periodo, n, media, desvio, minimo, maximo."""
+    get_pool().garantir_derivados()
+    return _ler_agregados(versao_tabela("metricas_agregadas"))
+
+
+def carregar_matriz() -> matriz.Matriz:
+    """Matriz país × mês de country_metrics (app/matriz.py); fatias são views do .npy."""
+    get_pool().garantir_derivados()
+    return _abrir_matriz(versao_tabela("matriz_metricas"))
+
+
+def carregar_agrupamentos(nivel, ano=None, mes=None, caixa=None, limite=MAX_PONTOS) -> pd.DataFrame:
+    """Sóis agrupados por célula da grade (centróide e total), no máximo `limite` linhas.
+
+    `caixa` = (sul, oeste, norte, leste) restringe à área visível. Se o nível
+    pedido passar do limite, usa o mais fino que caiba; o nível usado fica em
+    df.attrs["nivel"].
+    """
+    return _ler_agrupamentos(versao_tabela("peacekeepers"), nivel, ano, mes,
+                             None if caixa is None else tuple(float(c) for c in caixa), limite)
+
+
+def carregar_sois_na_caixa(caixa, ano=None, mes=None) -> pd.DataFrame:
+    """Sóis individuais dentro de `caixa` = (sul, oeste, norte, leste), via índice geohash."""
+    get_pool().garantir_derivados()
+    return _ler_sois_na_caixa(versao_tabela("peacekeepers"), _versao_dicionario(),
+                              tuple(float(c) for c in caixa), ano, mes)
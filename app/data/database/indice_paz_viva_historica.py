@@ -1,6 +1,23 @@
-indice_paz_viva_historica =
-    0.30 * pilar_paz_tensao +
-    0.25 * pilar_protecao_vida +
-    0.20 * pilar_estabilidade_convivencia +
-    0.15 * pilar_compromisso_desarmamento +
-    0.10 * pilar_cuidado_vulneraveis
+# Índice de Paz Viva histórico:
+#
+# indice_paz_viva_historica =
+#     0.30 * pilar_paz_tensao +
+#     0.25 * pilar_protecao_vida +
+#     0.20 * pilar_estabilidade_convivencia +
+#     0.15 * pilar_compromisso_desarmamento +
+#     0.10 * pilar_cuidado_vulneraveis
+#
+# Os pesos ficam na tabela pesos_historicos e o índice é mantido por trigger
+# (app/banco.py, migração "indice_historico"). Este script recalcula a tabela
+# inteira e confere o resultado; rode a partir da raiz do repositório:
+#
+#     python app/data/database/indice_paz_viva_historica.py
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from app.historico import main  # noqa: E402
+
+if __name__ == "__main__":
+    raise SystemExit(main(["--recalcular", "--verificar", *sys.argv[1:]]))
@@ -0,0 +1,35 @@
+"""Estruturas derivadas das tabelas de origem, mantidas incrementalmente.
+
+Os triggers criados em app/banco.py anotam o que mudou; `atualizar()` chama
+cada atualizador, que processa só as suas pendências. A camada de leitura
+(app/dados.py) chama `atualizar()` quando uma tabela de origem muda, e quem
+grava em lote pode chamá-lo ao final. Também dá para rodar à mão:
+
+    python -m app.derivados
+"""
+from app import agregados, espacial, matriz, ranking
+from app.banco import DB_PATH, conectar, migrar
+
+# Em ordem: as variações leem o ranking já atualizado.
+ATUALIZADORES = {
+    "ranking": ranking.atualizar_ranking,
+    "variacoes": ranking.atualizar_variacoes,
+    "geohash": espacial.preencher_geohash,
+    "agregados": agregados.atualizar_agregados,
+    "matriz": matriz.atualizar_matriz,
+}
+
+
+def atualizar(conn):
+    """Roda todos os atualizadores; devolve {nome: itens processados}."""
+    return {nome: atualizador(conn) for nome, atualizador in ATUALIZADORES.items()}
+
+
+if __name__ == "__main__":
+    migrar(DB_PATH)
+    conn = conectar(DB_PATH)
+    try:
+        for nome, feitos in atualizar(conn).items():
+            print(f"✅ {nome}: {feitos} atualizado(s).")
+    finally:
+        conn.close()
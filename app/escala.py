@@ -0,0 +1,58 @@
+"""Escala Oficial da Paz Viva, em um único lugar para todas as páginas.
+
+    100     Excelente
+    91–99   Bom
+    71–90   Médio
+    51–70   Baixo
+    0–50    Crítico
+
+Cada nível começa no seu limite inferior, então valores fracionários ficam
+no nível do inteiro abaixo deles: 90.5 é "Médio" e 99.5 é "Bom".
+"""
+import numpy as np
+import pandas as pd
+
+SEM_DADOS = "Sem dados"
+NIVEIS = ["Crítico", "Baixo", "Médio", "Bom", "Excelente"]
+
+# Limite inferior de Baixo, Médio, Bom e Excelente.
+LIMITES = np.array([51, 71, 91, 100], dtype="float64")
+
+CORES = {
+    "Crítico": "red",
+    "Baixo": "orange",
+    "Médio": "yellow",
+    "Bom": "lightgreen",
+    "Excelente": "green",
+    SEM_DADOS: "lightgray",
+}
+
+NIVEL_PAZ = pd.CategoricalDtype(NIVEIS + [SEM_DADOS])
+
+
+def classificar_paz(valores):
+    """Classifica índices de paz pela escala oficial, sem laço em Python.
+
+    Aceita escalar, array ou Series. Escalar devolve o rótulo (str); Series
+    devolve Series categórica com o mesmo índice; array devolve Categorical.
+    """
+    arr = np.asarray(valores, dtype="float64")
+    codigos = np.searchsorted(LIMITES, arr, side="right")
+    codigos = np.where(np.isnan(arr), len(NIVEIS), codigos)
+
+    if arr.ndim == 0:
+        return NIVEL_PAZ.categories[int(codigos)]
+
+    niveis = pd.Categorical.from_codes(codigos.ravel(), dtype=NIVEL_PAZ)
+    if isinstance(valores, pd.Series):
+        return pd.Series(niveis, index=valores.index, name="nivel_paz")
+    return niveis
+
+
+def nivel_sql(coluna):
+    """Expressão SQL (CASE) equivalente a classificar_paz para `coluna`."""
+    casos = " ".join(
+        f"WHEN {coluna} >= {limite:g} THEN '{nivel}'"
+        for limite, nivel in reversed(list(zip(LIMITES, NIVEIS[1:])))
+    )
+    return f"CASE WHEN {coluna} IS NULL THEN '{SEM_DADOS}' {casos} ELSE '{NIVEIS[0]}' END"
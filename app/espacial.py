@@ -0,0 +1,179 @@
+"""Índice espacial dos Sóis: geohash em peacekeepers.geohash.
+
+O geohash é calculado em NumPy (sem dependências) com PRECISAO caracteres e
+indexado (migração "geohash_suns" em app/banco.py). Como prefixos iguais
+significam vizinhança, uma caixa vira poucas faixas do índice
+(geohash >= prefixo AND geohash < prefixo || '~') em vez de uma varredura da
+tabela; o raio é resolvido pela caixa que o contém mais a distância exata.
+
+Linhas gravadas sem geohash (scripts antigos, ou latitude/longitude
+alteradas, que o trigger zera) continuam aparecendo nas consultas e são
+preenchidas por `preencher_geohash`, também chamado por app/derivados.py:
+
+    python -m app.espacial                       # preenche geohashes faltando
+    python -m app.espacial --caixa -35 -75 5 -30 # Sóis numa caixa (sul oeste norte leste)
+    python -m app.espacial --raio -23.55 -46.63 50
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from app.banco import DB_PATH, conectar, migrar
+
+ALFABETO = np.array(list("0123456789bcdefghjkmnpqrstuvwxyz"))
+PRECISAO = 9            # ~4,8 m × 4,8 m
+MAX_PREFIXOS = 32       # faixas do índice por consulta de caixa
+RAIO_TERRA_KM = 6371.0088
+COLUNAS = ("id", "country_code", "city", "latitude", "longitude", "created_at")
+
+
+# ======================================
+# GEOHASH VETORIZADO
+# ======================================
+def _bits(precisao):
+    total = 5 * precisao
+    return (total + 1) // 2, total // 2  # bits de longitude, de latitude
+
+
+def _quantizar(valores, minimo, amplitude, bits):
+    v = np.asarray(valores, dtype="float64")
+    return np.clip(np.floor((v - minimo) / amplitude * (1 << bits)), 0, (1 << bits) - 1).astype("uint64")
+
+
+def _codificar_celulas(ix, iy, precisao):
+    """Geohash das células (ix de longitude, iy de latitude) já quantizadas."""
+    bits_lon, bits_lat = _bits(precisao)
+    ix, iy = np.asarray(ix, dtype="uint64"), np.asarray(iy, dtype="uint64")
+    codigo = np.zeros(np.broadcast(ix, iy).shape, dtype="uint64")
+    # Intercala a partir do bit mais significativo, começando pela longitude.
+    for k in range(5 * precisao):
+        if k % 2 == 0:
+            bit = (ix >> np.uint64(bits_lon - 1 - k // 2)) & np.uint64(1)
+        else:
+            bit = (iy >> np.uint64(bits_lat - 1 - k // 2)) & np.uint64(1)
+        codigo = (codigo << np.uint64(1)) | bit
+    deslocamentos = np.arange(precisao - 1, -1, -1, dtype="uint64") * np.uint64(5)
+    indices = (codigo[..., None] >> deslocamentos) & np.uint64(31)
+    caracteres = ALFABETO[indices.astype("int64")]
+    return np.array(["".join(linha) for linha in caracteres.reshape(-1, precisao)]).reshape(codigo.shape)
+
+
+def geohash(latitudes, longitudes, precisao=PRECISAO):
+    """Geohash de cada par (lat, lon); NaN vira None."""
+    lat = np.asarray(latitudes, dtype="float64")
+    lon = np.asarray(longitudes, dtype="float64")
+    validos = ~(np.isnan(lat) | np.isnan(lon))
+    bits_lon, bits_lat = _bits(precisao)
+    codigos = np.full(lat.shape, None, dtype=object)
+    if validos.any():
+        codigos[validos] = _codificar_celulas(
+            _quantizar(lon[validos], -180.0, 360.0, bits_lon),
+            _quantizar(lat[validos], -90.0, 180.0, bits_lat),
+            precisao,
+        )
+    return codigos
+
+
+def prefixos_da_caixa(sul, oeste, norte, leste, max_prefixos=MAX_PREFIXOS):
+    """Menor conjunto de prefixos (da precisão mais fina que caiba) que cobre a caixa."""
+    if oeste > leste:  # cruza o antimeridiano
+        return sorted(set(prefixos_da_caixa(sul, oeste, norte, 180.0, max_prefixos))
+                      | set(prefixos_da_caixa(sul, -180.0, norte, leste, max_prefixos)))
+    for precisao in range(PRECISAO, 0, -1):
+        bits_lon, bits_lat = _bits(precisao)
+        x0, x1 = _quantizar([oeste, leste], -180.0, 360.0, bits_lon)
+        y0, y1 = _quantizar([sul, norte], -90.0, 180.0, bits_lat)
+        if (int(x1) - int(x0) + 1) * (int(y1) - int(y0) + 1) <= max_prefixos or precisao == 1:
+            ix, iy = np.meshgrid(np.arange(x0, x1 + 1, dtype="uint64"), np.arange(y0, y1 + 1, dtype="uint64"))
+            return sorted(set(_codificar_celulas(ix.ravel(), iy.ravel(), precisao).tolist()))
+
+
+# ======================================
+# CONSULTAS
+# ======================================
+def sois_na_caixa(conn, sul, oeste, norte, leste, colunas=COLUNAS):
+    """Sóis dentro da caixa (graus), usando idx_peacekeepers_geohash."""
+    prefixos = prefixos_da_caixa(sul, oeste, norte, leste)
+    faixas = " OR ".join(["(geohash >= ? AND geohash < ?)"] * len(prefixos))
+    if oeste > leste:
+        filtro_lon = "(longitude >= ? OR longitude <= ?)"
+    else:
+        filtro_lon = "longitude BETWEEN ? AND ?"
+    sql = f"""
+        SELECT {", ".join(colunas)} FROM peacekeepers
+        WHERE ({faixas} OR geohash IS NULL)
+          AND latitude BETWEEN ? AND ? AND {filtro_lon}
+    """
+    params = [v for p in prefixos for v in (p, p + "~")] + [sul, norte, oeste, leste]
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def distancia_km(lat1, lon1, lat2, lon2):
+    """Distância de grande círculo (haversine), vetorizada."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype="float64")) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def sois_no_raio(conn, latitude, longitude, raio_km, colunas=COLUNAS):
+    """Sóis a até `raio_km` do ponto, do mais perto ao mais longe (coluna distancia_km)."""
+    colunas = tuple(dict.fromkeys(tuple(colunas) + ("latitude", "longitude")))
+    dlat = np.degrees(raio_km / RAIO_TERRA_KM)
+    sul, norte = max(latitude - dlat, -90.0), min(latitude + dlat, 90.0)
+    cos_lat = np.cos(np.radians(max(abs(sul), abs(norte))))
+    if cos_lat <= 0 or dlat / cos_lat >= 180:
+        oeste, leste = -180.0, 180.0
+    else:
+        dlon = dlat / cos_lat
+        oeste = (longitude - dlon + 180.0) % 360.0 - 180.0
+        leste = (longitude + dlon + 180.0) % 360.0 - 180.0
+    df = sois_na_caixa(conn, sul, oeste, norte, leste, colunas)
+    df["distancia_km"] = distancia_km(latitude, longitude, df["latitude"], df["longitude"])
+    return df[df["distancia_km"] <= raio_km].sort_values("distancia_km").reset_index(drop=True)
+
+
+# ======================================
+# MANUTENÇÃO
+# ======================================
+def preencher_geohash(conn, lote=50_000):
+    """Calcula o geohash das linhas com coordenadas e sem geohash; devolve quantas."""
+    feitas = 0
+    while True:
+        linhas = conn.execute(
+            "SELECT id, latitude, longitude FROM peacekeepers"
+            " WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL LIMIT ?",
+            (lote,),
+        ).fetchall()
+        if not linhas:
+            return feitas
+        ids, lat, lon = np.array(linhas, dtype="float64").T
+        with conn:
+            conn.executemany(
+                "UPDATE peacekeepers SET geohash = ? WHERE id = ?",
+                zip(geohash(lat, lon).tolist(), ids.astype("int64").tolist()),
+            )
+        feitas += len(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Índice espacial (geohash) dos Sóis da Paz.")
+    parser.add_argument("--caixa", nargs=4, type=float, metavar=("SUL", "OESTE", "NORTE", "LESTE"))
+    parser.add_argument("--raio", nargs=3, type=float, metavar=("LAT", "LON", "KM"))
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    migrar(args.db)
+    conn = conectar(args.db)
+    try:
+        print(f"✅ {preencher_geohash(conn)} geohash(es) calculado(s).")
+        if args.caixa:
+            print(sois_na_caixa(conn, *args.caixa).to_string(index=False))
+        if args.raio:
+            print(sois_no_raio(conn, *args.raio).to_string(index=False))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,70 @@
-import streamlit as st
-import sqlite3
-import pandas as pd
+import sys
 from pathlib import Path
-import plotly.express as px
 
-st.set_page_config(page_title="Evolução Global da Paz Viva", layout="wide")
+import streamlit as st
+
+if __name__ == "__main__":
+    # `streamlit run app/evolucao_paz.py` só põe app/ no sys.path; o pacote app fica na raiz.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import paginas  # noqa: E402
+
+ESCALAS = {"Mês": "mes", "Trimestre": "trimestre", "Ano": "ano"}
+
 
-st.title("📈 Evolução Global da Paz Viva")
-st.markdown("Média mundial do Índice de Paz ao longo do tempo.")
+def render(compartilhados=None):
+    """Média mundial e regional do Índice de Paz por mês, trimestre ou ano."""
+    import plotly.express as px
+    from app.dados import rotulo_periodo
+    from app.regioes import GLOBAL
 
-DB_PATH = Path("data/database/paz.db")
+    st.title("📈 Evolução Global da Paz Viva")
+    st.markdown("Média mundial do Índice de Paz ao longo do tempo.")
 
-# -------------------------------
-# CONEXÃO COM O BANCO
-# -------------------------------
-conn = sqlite3.connect(DB_PATH)
+    # -------------------------------
+    # DADOS (AGREGADOS MANTIDOS NO BANCO, ver app/agregados.py)
+    # -------------------------------
+    compartilhados = compartilhados or paginas.dados("evolucao_paz")
+    df = compartilhados["agregados"]
 
-df = pd.read_sql_query(
-    "SELECT year, month, indicator_value FROM country_metrics",
-    conn
-)
+    # -------------------------------
+    # FILTROS
+    # -------------------------------
+    st.sidebar.header("📅 Agregação")
 
-conn.close()
+    escala = ESCALAS[st.sidebar.radio("Média por", list(ESCALAS))]
+    regioes = [r for r in df["regiao"].cat.categories if r != GLOBAL]
+    escolhidas = st.sidebar.multiselect("🌎 Regiões", regioes)
 
-# -------------------------------
-# AGRUPAR POR MÊS GLOBAL
-# -------------------------------
-df["ano_mes"] = df["year"].astype(str) + "-" + df["month"].astype(str).str.zfill(2)
+    df_global = df[(df["escala"] == escala) & df["regiao"].isin([GLOBAL] + escolhidas)].copy()
+    df_global["regiao"] = df_global["regiao"].cat.remove_unused_categories()
+    df_global["ano_mes"] = rotulo_periodo(df_global["periodo"])
+    df_global.rename(columns={"media": "media_global"}, inplace=True)
 
-df_global = df.groupby("ano_mes")["indicator_value"].mean().reset_index()
+    # -------------------------------
+    # GRÁFICO
+    # -------------------------------
+    fig = px.line(
+        df_global,
+        x="ano_mes",
+        y="media_global",
+        color="regiao",
+        hover_data={"n": True, "desvio": ":.1f", "minimo": ":.1f", "maximo": ":.1f"},
+        title="🌍 Média Global do Índice de Paz Viva",
+        markers=True
+    )
 
-df_global.rename(columns={"indicator_value": "media_global"}, inplace=True)
+    fig.update_layout(
+        xaxis_title="Período",
+        yaxis_title="Índice Médio Global",
+        yaxis_range=[0, 100]
+    )
 
-# -------------------------------
-# GRÁFICO
-# -------------------------------
-fig = px.line(
-    df_global,
-    x="ano_mes",
-    y="media_global",
-    title="🌍 Média Global do Índice de Paz Viva",
-    markers=True
-)
+    st.plotly_chart(fig, use_container_width=True)
 
-fig.update_layout(
-    xaxis_title="Período",
-    yaxis_title="Índice Médio Global",
-    yaxis_range=[0, 100]
-)
+    st.success("✅ Gráfico de Evolução Global da Paz carregado com sucesso!")
 
-st.plotly_chart(fig, use_container_width=True)
 
-st.success("✅ Gráfico de Evolução Global da Paz carregado com sucesso!")
+if __name__ == "__main__":
+    st.set_page_config(page_title="Evolução Global da Paz Viva", layout="wide")
+    render()
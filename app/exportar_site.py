@@ -0,0 +1,305 @@
+"""Exportação estática do ranking, do relatório mensal e do mapa.
+
+O conteúdo público só muda quando entra um mês novo, então cada
+(year, month) de country_metrics vira um diretório de arquivos prontos que
+qualquer servidor de arquivos ou CDN entrega sem o Streamlit:
+
+    site/
+      index.html              lista de períodos (o mais recente primeiro)
+      periodos.json
+      plotly.min.js           uma cópia, usada por todos os mapas
+      2025-01/
+        ranking.html  ranking.json
+        relatorio.html
+        mapa.html     mapa.json
+        relatorio.pdf         (com --pdf)
+
+manifesto.json guarda uma impressão do conteúdo de cada período; períodos
+que não mudaram desde a última exportação não são regravados, e os que
+saíram do banco têm o diretório apagado. Cada arquivo é escrito num
+temporário e trocado no fim, então o servidor nunca entrega uma página pela
+metade. Os PDFs saem do pool de processos de app/relatorio_pdf.py, um
+kaleido por processo.
+
+    python -m app.exportar_site                  # exporta para ./site
+    python -m app.exportar_site --saida /var/www/paz --pdf
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from app import derivados
+from app.banco import DB_PATH, conectar, migrar
+from app.mapas import NIVEL_MUNDO, montar_mapa_global
+from app.relatorio_pdf import distribuicao, gerar_lote, ler_periodo
+
+SAIDA = Path("site")
+MANIFESTO = "manifesto.json"
+PDF = "{ano}-{mes:02d}/relatorio.pdf"
+# Mudou o formato das páginas? Suba a versão para regravar todos os períodos.
+VERSAO_FORMATO = 1
+
+_CSS = """
+body { font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 2rem auto; max-width: 1100px;
+       padding: 0 1rem; color: #222; }
+nav a { margin-right: 1rem; }
+table { border-collapse: collapse; width: 100%; margin: 0.5rem 0 1.5rem; font-size: 0.9rem; }
+th { background: #1f4e79; color: white; text-align: left; }
+th, td { padding: 0.3rem 0.6rem; border-bottom: 1px solid #ddd; }
+tr:nth-child(even) td { background: #f6f6f6; }
+.kpis { display: flex; gap: 1rem; flex-wrap: wrap; }
+.kpi { flex: 1; min-width: 180px; border: 1px solid #ddd; border-radius: 8px; padding: 0.8rem; }
+.kpi b { display: block; font-size: 1.6rem; }
+"""
+
+
+# ======================================
+# LEITURA
+# ======================================
+def periodos(conn):
+    """Todos os (ano, mês) de country_metrics, em ordem."""
+    return conn.execute("SELECT DISTINCT year, month FROM country_metrics ORDER BY year, month").fetchall()
+
+
+def ler_mapa(conn, ano, mes):
+    """(países com o índice do período, células de Sóis no nível do mapa mundial)."""
+    df_mapa = pd.read_sql_query(
+        """
+        SELECT c.country_code, c.country_name, c.latitude, c.longitude, m.indicator_value
+        FROM country_metadata c
+        LEFT JOIN country_metrics m
+          ON m.country_code = c.country_code AND m.year = ? AND m.month = ?
+        """,
+        conn, params=(ano, mes),
+    )
+    sois = pd.read_sql_query(
+        """
+        SELECT SUM(total) AS total,
+               SUM(soma_lat) / SUM(total) AS latitude, SUM(soma_lon) / SUM(total) AS longitude
+        FROM suns_grade
+        WHERE nivel = ? AND year = ? AND month = ?
+        GROUP BY cell_x, cell_y
+        """,
+        conn, params=(NIVEL_MUNDO, ano, mes),
+    )
+    return df_mapa, sois
+
+
+# ======================================
+# HTML
+# ======================================
+def _pagina(titulo, corpo, navegacao=True):
+    """Página completa; `navegacao` adiciona os links entre as vistas do período."""
+    nav = ('<nav><a href="../index.html">🏠 Períodos</a><a href="ranking.html">🏆 Ranking</a>'
+           '<a href="relatorio.html">📄 Relatório</a><a href="mapa.html">🌎 Mapa</a></nav>') if navegacao else ""
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(titulo)}</title>
+<style>{_CSS}</style>
+</head>
+<body>
+{nav}
+<h1>{html.escape(titulo)}</h1>
+{corpo}
+</body>
+</html>
+"""
+
+
+def _tabela(df):
+    return df.to_html(index=False, border=0, na_rep="-", float_format=lambda v: f"{v:.1f}")
+
+
+def _colunas_paises(df):
+    return df[["Posição", "country_name", "indicator_value", "nivel_paz"]].rename(columns={
+        "country_name": "País", "indicator_value": "Índice de Paz", "nivel_paz": "Nível",
+    })
+
+
+def html_ranking(ano, mes, df_mes):
+    corpo = (
+        "<h2>🌟 Top 10 Países com Maior Índice de Paz Viva</h2>" + _tabela(_colunas_paises(df_mes.head(10)))
+        + "<h2>🚨 Países em Nível Crítico</h2>"
+        + _tabela(_colunas_paises(df_mes[df_mes["nivel_paz"] == "Crítico"]))
+        + "<h2>📊 Ranking Completo</h2>" + _tabela(_colunas_paises(df_mes))
+        + '<p><a href="ranking.json">ranking.json</a></p>'
+    )
+    return _pagina(f"Ranking Global da Paz Viva — {mes:02d}/{ano}", corpo)
+
+
+def html_relatorio(ano, mes, df_mes, total_suns_mes, total_suns_acumulado, pdf=False):
+    media = df_mes["indicator_value"].mean()
+    kpis = [
+        ("Índice Médio Global", f"{media:.1f}" if pd.notna(media) else "-"),
+        ("Países com dados no período", df_mes["country_code"].nunique()),
+        ("Sóis da Paz neste mês", total_suns_mes),
+        ("Sóis acumulados até o mês", total_suns_acumulado),
+    ]
+    corpo = '<div class="kpis">' + "".join(
+        f'<div class="kpi">{html.escape(nome)}<b>{valor}</b></div>' for nome, valor in kpis
+    ) + "</div>"
+    if df_mes.empty:
+        corpo += "<p>Sem dados de índice de paz para este período.</p>"
+    else:
+        corpo += (
+            "<h2>🌟 Top 5 Países com maior Índice</h2>" + _tabela(_colunas_paises(df_mes.head(5)))
+            + "<h2>⚠️ 5 Países em situação mais crítica</h2>" + _tabela(_colunas_paises(df_mes.tail(5)))
+            + "<h2>📊 Distribuição dos Países por Nível de Paz</h2>"
+            + _tabela(distribuicao(df_mes).rename(columns={"nivel_paz": "Nível", "quantidade": "Países"}))
+            + "<h2>📋 Tabela Oficial do Índice por País</h2>" + _tabela(_colunas_paises(df_mes))
+        )
+    if pdf:
+        corpo += '<p><a href="relatorio.pdf">📥 Baixar o relatório em PDF</a></p>'
+    return _pagina(f"Relatório Mensal da Paz Viva — {mes:02d}/{ano}", corpo)
+
+
+def html_indice(lista):
+    itens = "".join(
+        f'<li><a href="{ano}-{mes:02d}/relatorio.html">{mes:02d}/{ano}</a> — '
+        f'<a href="{ano}-{mes:02d}/ranking.html">ranking</a> · <a href="{ano}-{mes:02d}/mapa.html">mapa</a></li>'
+        for ano, mes in reversed(lista)
+    )
+    corpo = f"<p>Índice Oficial da Paz Viva, mês a mês.</p><ul>{itens}</ul>"
+    return _pagina("☮️ Movimento da Paz — Índice da Paz Viva", corpo, navegacao=False)
+
+
+# ======================================
+# GRAVAÇÃO
+# ======================================
+def _gravar(destino, conteudo):
+    """Grava de forma atômica (temporário + os.replace)."""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    dados = conteudo.encode("utf-8") if isinstance(conteudo, str) else conteudo
+    fd, temporario = tempfile.mkstemp(dir=destino.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as arquivo:
+            arquivo.write(dados)
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, destino)
+    except BaseException:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+
+
+def _impressao(*partes):
+    h = hashlib.sha1(str(VERSAO_FORMATO).encode())
+    for parte in partes:
+        h.update(parte.encode("utf-8"))
+    return h.hexdigest()
+
+
+def exportar_periodo(conn, ano, mes, saida, pdf=False, anterior=None):
+    """Exporta as páginas de um período; devolve (impressão, regravado?).
+
+    O PDF (com `pdf`) fica para `exportar`, que gera os de todos os períodos
+    regravados de uma vez no pool de processos.
+    """
+    df_mes, total_suns_mes, total_suns_acumulado = ler_periodo(conn, ano, mes)
+    df_mapa, sois = ler_mapa(conn, ano, mes)
+    ranking_json = df_mes.to_json(orient="records", force_ascii=False)
+    impressao = _impressao(ranking_json, str((total_suns_mes, total_suns_acumulado, pdf)),
+                           df_mapa.to_json(), sois.to_json())
+    pasta = Path(saida) / f"{ano}-{mes:02d}"
+    if impressao == anterior and (pasta / "mapa.html").exists() and (not pdf or (pasta / "relatorio.pdf").exists()):
+        return impressao, False
+
+    fig = montar_mapa_global(df_mapa, sois)
+    _gravar(pasta / "ranking.json", ranking_json)
+    _gravar(pasta / "ranking.html", html_ranking(ano, mes, df_mes))
+    _gravar(pasta / "relatorio.html", html_relatorio(ano, mes, df_mes, total_suns_mes, total_suns_acumulado, pdf))
+    _gravar(pasta / "mapa.json", fig.to_json())
+    _gravar(pasta / "mapa.html", fig.to_html(include_plotlyjs="../plotly.min.js", full_html=True))
+    if not pdf:
+        # Exportação anterior com --pdf: o relatório.html novo não aponta mais para ele.
+        (pasta / "relatorio.pdf").unlink(missing_ok=True)
+    return impressao, True
+
+
+def exportar(saida=SAIDA, db_path=DB_PATH, pdf=False, forcar=False, processos=None):
+    """Exporta todos os períodos; devolve (períodos, regravados, {(ano, mês): erro} dos PDFs, PDFs sem gráficos)."""
+    saida = Path(saida)
+    migrar(db_path)
+    conn = conectar(db_path)
+    try:
+        derivados.atualizar(conn)
+    finally:
+        conn.close()
+
+    try:
+        manifesto = json.loads((saida / MANIFESTO).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifesto = {}
+
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        lista = periodos(conn)
+        novo, regravados = {}, []
+        for ano, mes in lista:
+            chave = f"{ano}-{mes:02d}"
+            novo[chave], regravado = exportar_periodo(
+                conn, ano, mes, saida, pdf, None if forcar else manifesto.get(chave)
+            )
+            if regravado:
+                regravados.append((ano, mes))
+    finally:
+        conn.close()
+
+    falhas, sem_graficos = {}, []
+    if pdf:
+        _, falhas, sem_graficos = gerar_lote(regravados, saida, db_path, processos, modelo=PDF)
+        for ano, mes in falhas:
+            # Fora do manifesto: a próxima exportação tenta o período de novo.
+            novo.pop(f"{ano}-{mes:02d}")
+
+    if forcar or not (saida / "plotly.min.js").exists():
+        _gravar(saida / "plotly.min.js", get_plotlyjs())
+    _gravar(saida / "periodos.json", json.dumps([{"year": a, "month": m} for a, m in lista]))
+    _gravar(saida / "index.html", html_indice(lista))
+    _gravar(saida / MANIFESTO, json.dumps(novo, indent=1, sort_keys=True))
+    # Períodos que saíram do banco: só depois do índice novo, que já não aponta para eles.
+    for chave in manifesto.keys() - novo.keys() - {f"{a}-{m:02d}" for a, m in falhas}:
+        if re.fullmatch(r"\d{4}-\d{2}", chave):
+            shutil.rmtree(saida / chave, ignore_errors=True)
+    return len(lista), len(regravados), falhas, sem_graficos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta ranking, relatório e mapa como site estático.")
+    parser.add_argument("--saida", default=str(SAIDA), help="diretório do site (padrão: site)")
+    parser.add_argument("--pdf", action="store_true", help="inclui o relatório em PDF de cada período")
+    parser.add_argument("--forcar", action="store_true", help="regrava todos os períodos")
+    parser.add_argument("--processos", type=int, help="processos para os PDFs (padrão: núcleos da máquina)")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    total, regravados, falhas, sem_graficos = exportar(args.saida, args.db, args.pdf, args.forcar, args.processos)
+    print(f"✅ {total} período(s) em {args.saida}: {regravados} regravado(s), "
+          f"{total - regravados} sem mudanças ({time.perf_counter() - inicio:.1f} s).")
+    if sem_graficos:
+        print(f"⚠️ kaleido não iniciou (falta o kaleido ou o Chrome/Chromium): {len(sem_graficos)} PDF(s) "
+              "sem os gráficos; instale-os e exporte de novo com --forcar.")
+    if not falhas:
+        return 0
+    print(f"⚠️ {len(falhas)} PDF(s) com erro (período refeito na próxima exportação):")
+    for (ano, mes), erro in sorted(falhas.items()):
+        print(f"- {mes:02d}/{ano}: {type(erro).__name__}: {erro}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,31 @@
+"""Figuras Plotly cacheadas, compartilhadas entre reruns e sessões.
+
+A figura de cada combinação (período, camadas) é montada uma vez e guardada
+já serializada em JSON; trocar de mês e voltar só desserializa. As chaves
+incluem as versões das tabelas lidas (app/dados.py), então qualquer mudança
+no banco gera figuras novas, e o LRU do cache (max_entries) limita a memória.
+"""
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from app.dados import carregar_agrupamentos, carregar_paises, carregar_periodo, versao_tabela
+from app.mapas import NIVEL_MUNDO, montar_mapa_global
+
+MAX_FIGURAS = 48
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_FIGURAS)
+def _mapa_global_json(versoes, ano, mes, mostrar_sois, altura):
+    df_mapa = carregar_paises().merge(carregar_periodo(ano, mes), on="country_code", how="left")
+    # Sóis agrupados por célula (app/grade.py): o mapa mundial nunca recebe
+    # mais que MAX_PONTOS estrelas.
+    sois = carregar_agrupamentos(NIVEL_MUNDO, ano, mes) if mostrar_sois else None
+    return montar_mapa_global(df_mapa, sois, altura).to_json()
+
+
+def figura_mapa_global(ano, mes, mostrar_sois=True, altura=750) -> go.Figure:
+    """Mapa do Índice de Paz no período, com os Sóis do mês opcionalmente."""
+    versoes = tuple(versao_tabela(t) for t in ("country_metadata", "country_metrics", "peacekeepers"))
+    return pio.from_json(_mapa_global_json(versoes, int(ano), int(mes), bool(mostrar_sois), altura),
+                         skip_invalid=True)
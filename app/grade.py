@@ -0,0 +1,48 @@
+"""Agrupamento espacial dos Sóis para mapas em escala mundial.
+
+A tabela suns_grade (migração "grade_suns" em app/banco.py) guarda, para
+cada nível da grade, mês e célula, o total de Sóis e a soma das coordenadas.
+Um mapa pede o nível que corresponde ao seu zoom e recebe no máximo uma
+célula por região visível — com o centróide e o total de cada uma —, em vez
+de um ponto por Sol registrado.
+"""
+import numpy as np
+
+from app.banco import NIVEIS_GRADE
+
+# Limite de pontos enviados ao navegador por camada.
+MAX_PONTOS = 3000
+
+# Cada tile do Leaflet no zoom z cobre 360 / 2^z graus; dois níveis acima do
+# zoom dão 4 × 4 células por tile, agrupamentos de ~64 px de lado.
+NIVEIS_ACIMA_DO_ZOOM = 2
+
+
+def nivel_para_zoom(zoom):
+    """Nível da grade adequado ao zoom do mapa (Leaflet/Plotly)."""
+    nivel = int(round(zoom)) + NIVEIS_ACIMA_DO_ZOOM
+    return min(max(nivel, NIVEIS_GRADE[0]), NIVEIS_GRADE[-1])
+
+
+def celulas_da_caixa(nivel, sul, oeste, norte, leste):
+    """Faixas (x_min, x_max, y_min, y_max) de células que cobrem a caixa.
+
+    Caixas que cruzam o antimeridiano (oeste > leste) viram o mundo inteiro
+    em longitude.
+    """
+    n = 2 ** nivel
+    if oeste > leste or leste - oeste >= 360:
+        x_min, x_max = 0, n - 1
+    else:
+        x_min, x_max = np.clip(np.floor((np.array([oeste, leste]) + 180.0) * n / 360.0), 0, n - 1).astype(int)
+    y_min, y_max = np.clip(np.floor((90.0 - np.array([norte, sul])) * n / 180.0), 0, n - 1).astype(int)
+    return int(x_min), int(x_max), int(y_min), int(y_max)
+
+
+def raios_agrupamento(totais, raio_minimo=5, raio_maximo=30):
+    """Raio em pixels crescendo com log(total), entre raio_minimo e raio_maximo."""
+    escala = np.log1p(np.asarray(totais, dtype="float64"))
+    topo = escala.max() if escala.size else 0.0
+    if topo == 0:
+        return np.full(escala.shape, raio_minimo, dtype="int64")
+    return (raio_minimo + (raio_maximo - raio_minimo) * escala / topo).astype("int64")
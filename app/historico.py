@@ -0,0 +1,110 @@
+"""Índice de Paz Viva histórico (historical_peace_regional).
+
+O índice é a média dos cinco pilares presentes, ponderada pelos pesos da
+tabela pesos_historicos. Os triggers da migração "indice_historico"
+(app/banco.py) recalculam cada linha inserida ou alterada; quando os pesos
+mudam, a tabela inteira é recalculada num único UPDATE:
+
+    python -m app.historico                                 # mostra os pesos vigentes
+    python -m app.historico --peso pilar_paz_tensao=0.35    # troca pesos e recalcula
+    python -m app.historico --padrao                        # volta aos pesos oficiais
+    python -m app.historico --recalcular                    # recalcula com os pesos vigentes
+    python -m app.historico --verificar                     # confere o índice gravado
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from app.banco import DB_PATH, conectar, indice_historico_sql, migrar
+from app.metodologia import PESOS_PILARES, PILARES, vetor_pesos
+
+SQL_RECALCULAR = f"UPDATE historical_peace_regional SET indice_paz_viva_historica = {indice_historico_sql(PILARES)}"
+
+
+def pesos_vigentes(conn):
+    """{pilar: peso} gravados em pesos_historicos."""
+    return dict(conn.execute("SELECT pilar, peso FROM pesos_historicos").fetchall())
+
+
+def calcular(pilares, pesos=None):
+    """Índice para uma matriz (linhas, pilar), com a mesma regra dos triggers."""
+    w = vetor_pesos(PESOS_PILARES if pesos is None else pesos, PILARES)
+    x = np.asarray(pilares, dtype="float64")
+    presente = ~np.isnan(x)
+    soma = np.where(presente, x, 0.0) @ w
+    peso_presente = presente @ w
+    indice = np.divide(soma, peso_presente, out=np.full(soma.shape, np.nan), where=peso_presente > 0)
+    return np.round(indice, 2)
+
+
+def recalcular(conn):
+    """Recalcula o índice de todas as linhas num único UPDATE; devolve o nº de linhas."""
+    with conn:
+        return conn.execute(SQL_RECALCULAR).rowcount
+
+
+def definir_pesos(conn, pesos):
+    """Grava novos pesos (normalizados para somar 1) e recalcula a tabela, numa transação."""
+    w = vetor_pesos(pesos, PILARES)
+    with conn:
+        conn.execute("DELETE FROM pesos_historicos")
+        conn.executemany("INSERT INTO pesos_historicos (pilar, peso) VALUES (?, ?)", zip(PILARES, w.tolist()))
+        return conn.execute(SQL_RECALCULAR).rowcount
+
+
+def verificar(conn, tolerancia=0.005):
+    """Linhas cujo índice gravado difere do recalculado em NumPy."""
+    df = pd.read_sql_query(
+        f"SELECT id, year, region, {', '.join(PILARES)}, indice_paz_viva_historica FROM historical_peace_regional",
+        conn,
+    )
+    esperado = calcular(df[list(PILARES)].to_numpy(dtype="float64"), pesos_vigentes(conn))
+    gravado = df["indice_paz_viva_historica"].to_numpy(dtype="float64")
+    iguais = np.isclose(gravado, esperado, rtol=0, atol=tolerancia) | (np.isnan(gravado) & np.isnan(esperado))
+    return df.loc[~iguais, ["id", "year", "region", "indice_paz_viva_historica"]].assign(esperado=esperado[~iguais])
+
+
+def _peso(texto):
+    nome, _, valor = texto.partition("=")
+    if nome not in PILARES or not valor:
+        raise argparse.ArgumentTypeError(f"use pilar=peso, com pilar em: {', '.join(PILARES)}")
+    return nome, float(valor)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pesos e recálculo do Índice de Paz Viva histórico.")
+    parser.add_argument("--peso", type=_peso, action="append", default=[],
+                        help="substitui um peso vigente, ex.: --peso pilar_paz_tensao=0.35")
+    parser.add_argument("--padrao", action="store_true", help="volta aos pesos oficiais da metodologia")
+    parser.add_argument("--recalcular", action="store_true", help="recalcula o índice com os pesos vigentes")
+    parser.add_argument("--verificar", action="store_true", help="confere o índice gravado contra os pilares")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    migrar(args.db)
+    conn = conectar(args.db)
+    try:
+        if args.padrao or args.peso:
+            base = PESOS_PILARES if args.padrao else pesos_vigentes(conn)
+            linhas = definir_pesos(conn, {**base, **dict(args.peso)})
+            print(f"✅ Índice recalculado em {linhas} linhas.")
+        elif args.recalcular:
+            print(f"✅ Índice recalculado em {recalcular(conn)} linhas.")
+        for pilar, peso in pesos_vigentes(conn).items():
+            print(f"   {pilar}: {peso:.4f}")
+        if args.verificar:
+            divergentes = verificar(conn)
+            if divergentes.empty:
+                print("✅ Índice histórico consistente com os pilares.")
+                return 0
+            print(f"⚠️ {len(divergentes)} linha(s) divergente(s):")
+            print(divergentes.to_string(index=False))
+            return 1
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
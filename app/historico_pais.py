@@ -0,0 +1,152 @@
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+if __name__ == "__main__":
+    # `streamlit run app/historico_pais.py` só põe app/ no sys.path; o pacote app fica na raiz.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import paginas  # noqa: E402
+
+# Largura aproximada do gráfico em pixels no layout "wide": acima disso a
+# série é reduzida com LTTB (app/amostragem.py), já que pontos a mais não
+# aparecem na tela.
+LARGURA_GRAFICO = 1200
+
+
+# Série reduzida guardada por versão do ranking, país e coluna; o DataFrame
+# (parâmetro com _) já corresponde a essa versão e fica fora da chave.
+@st.cache_data(show_spinner=False, max_entries=32, ttl=paginas.ttl("historico_pais"))
+def _serie_reduzida(versao, codigo, coluna, limite, _df):
+    from app.amostragem import lttb
+
+    serie = _df[["periodo", coluna]].dropna()
+    return serie.iloc[lttb(serie["periodo"], serie[coluna], limite)]
+
+
+def render(compartilhados=None):
+    """Histórico mensal de um país: índice, mudanças de nível e posição no ranking."""
+    import pandas as pd
+    import plotly.graph_objects as go
+    from app.dados import carregar_historico_pais, carregar_matriz, rotulo_periodo, versao_tabela
+    from app.escala import CORES, LIMITES, NIVEIS
+
+    st.title("🗺️ Histórico da Paz Viva por País")
+    st.markdown("Evolução mensal do Índice de Paz Viva, do nível e da posição de um país no ranking.")
+
+    # -------------------------------
+    # DADOS (CACHE COMPARTILHADO)
+    # -------------------------------
+    compartilhados = compartilhados or paginas.dados("historico_pais")
+    df_paises = compartilhados["paises"].sort_values("country_name")
+
+    # -------------------------------
+    # SELEÇÃO DO PAÍS
+    # -------------------------------
+    st.sidebar.header("🌍 País")
+
+    codigos = df_paises["country_code"].astype(str)
+    nomes = dict(zip(codigos, df_paises["country_name"].fillna(codigos)))
+    codigo = st.sidebar.selectbox("País", list(nomes), format_func=nomes.get)
+
+    df = carregar_historico_pais(codigo)
+    if df.empty:
+        st.info("Sem dados do Índice de Paz Viva para este país.")
+        return
+
+    versao = versao_tabela("country_rank_monthly")
+
+    # -------------------------------
+    # RESUMO
+    # -------------------------------
+    atual = df.iloc[-1]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Índice Atual", f"{atual['indicator_value']:.1f}")
+    col2.metric("Nível Atual", atual["nivel_paz"])
+    col3.metric("Melhor Posição", int(df["Posição"].min()))
+    col4.metric("Meses com Dados", len(df))
+
+    # -------------------------------
+    # ÍNDICE AO LONGO DO TEMPO
+    # -------------------------------
+    # Linha do país na matriz país × mês (app/matriz.py): view do .npy, sem consulta.
+    matriz = carregar_matriz()
+    linha = pd.DataFrame({"periodo": matriz.periodos, "indicator_value": matriz.pais(codigo)})
+    indice = _serie_reduzida(matriz.versao, codigo, "indicator_value", LARGURA_GRAFICO, linha)
+
+    fig = go.Figure(go.Scatter(
+        x=rotulo_periodo(indice["periodo"]),
+        y=indice["indicator_value"],
+        mode="lines+markers" if len(indice) <= 120 else "lines",
+        name="Índice",
+        hovertemplate="%{x}<br>Índice: %{y:.1f}<extra></extra>",
+    ))
+    # Limites da escala oficial: cruzar uma linha é mudar de nível.
+    for limite, nivel in zip(LIMITES, NIVEIS[1:]):
+        fig.add_hline(y=limite, line_dash="dot", line_color=CORES[nivel], annotation_text=nivel,
+                      annotation_position="right")
+    fig.update_layout(
+        title=f"📈 Índice de Paz Viva — {nomes[codigo]}",
+        xaxis_title="Período",
+        yaxis_title="Índice",
+        yaxis_range=[0, 100],
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # -------------------------------
+    # POSIÇÃO NO RANKING
+    # -------------------------------
+    posicao = _serie_reduzida(versao, codigo, "Posição", LARGURA_GRAFICO, df)
+
+    fig_posicao = go.Figure(go.Scatter(
+        x=rotulo_periodo(posicao["periodo"]),
+        y=posicao["Posição"],
+        mode="lines+markers" if len(posicao) <= 120 else "lines",
+        line=dict(color="gold"),
+        name="Posição",
+        hovertemplate="%{x}<br>Posição: %{y}<extra></extra>",
+    ))
+    fig_posicao.update_layout(
+        title="🏆 Posição no Ranking Global",
+        xaxis_title="Período",
+        yaxis_title="Posição",
+        yaxis_autorange="reversed",
+    )
+    st.plotly_chart(fig_posicao, use_container_width=True)
+
+    if len(indice) < len(df):
+        st.caption(f"Gráficos com {len(indice)} de {len(df)} meses (redução LTTB); a tabela abaixo traz todos.")
+
+    # -------------------------------
+    # MUDANÇAS DE NÍVEL
+    # -------------------------------
+    st.subheader("🔀 Mudanças de Nível")
+
+    mudou = df["nivel_paz"].ne(df["nivel_paz"].shift())
+    mudou.iloc[0] = False
+    df_mudancas = df.loc[mudou, ["periodo", "indicator_value", "nivel_paz"]].assign(
+        Período=lambda d: rotulo_periodo(d["periodo"]),
+        De=df["nivel_paz"].shift()[mudou],
+    ).rename(columns={"indicator_value": "Índice", "nivel_paz": "Para"})
+
+    if df_mudancas.empty:
+        st.write(f"Sempre no nível **{atual['nivel_paz']}**.")
+    else:
+        st.dataframe(df_mudancas[["Período", "De", "Para", "Índice"]], use_container_width=True, hide_index=True)
+
+    with st.expander("📋 Todos os meses"):
+        st.dataframe(
+            df.assign(Período=rotulo_periodo(df["periodo"]))[
+                ["Período", "indicator_value", "nivel_paz", "Posição", "percentil"]
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    st.success("✅ Histórico do país carregado com sucesso!")
+
+
+if __name__ == "__main__":
+    st.set_page_config(page_title="Histórico da Paz Viva por País", layout="wide")
+    render()
@@ -0,0 +1,147 @@
+"""Carga em lote de country_metrics a partir de arquivos CSV ou Parquet.
+
+Os arquivos são lidos em lotes (sem carregar tudo na memória) e gravados
+numa única transação, com o banco em modo WAL. Cada linha é um upsert em
+(country_code, year, month): recarregar um mês substitui os valores em vez
+de duplicá-los. Ao final o ranking mensal e as demais estruturas derivadas
+são atualizados.
+
+Colunas esperadas: country_code, year, month, indicator_value e,
+opcionalmente, source.
+
+    python -m app.ingestao dados/2025.csv dados/historico.parquet --fonte UCDP
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app import derivados
+from app.banco import DB_PATH, conectar, migrar
+
+LOTE_PADRAO = 50_000
+COLUNAS = ["country_code", "year", "month", "indicator_value"]
+
+SQL_UPSERT = """
+    INSERT INTO country_metrics (country_code, year, month, indicator_value, source)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (country_code, year, month) DO UPDATE SET
+        indicator_value = excluded.indicator_value,
+        source = excluded.source,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+
+def _lotes_csv(caminho, lote):
+    yield from pd.read_csv(caminho, chunksize=lote, dtype={"country_code": "string"})
+
+
+def _lotes_parquet(caminho, lote):
+    import pyarrow.parquet as pq
+
+    arquivo = pq.ParquetFile(caminho)
+    colunas = [c for c in COLUNAS + ["source"] if c in arquivo.schema_arrow.names]
+    for batch in arquivo.iter_batches(batch_size=lote, columns=colunas):
+        yield batch.to_pandas()
+
+
+def ler_lotes(caminho, lote=LOTE_PADRAO):
+    """DataFrames de até `lote` linhas lidos de um .csv ou .parquet."""
+    caminho = Path(caminho)
+    if caminho.suffix.lower() == ".csv":
+        return _lotes_csv(caminho, lote)
+    if caminho.suffix.lower() in (".parquet", ".pq"):
+        return _lotes_parquet(caminho, lote)
+    raise ValueError(f"Formato não suportado: {caminho.name} (use .csv ou .parquet)")
+
+
+def preparar_lote(df, fonte=None):
+    """Normaliza tipos e descarta linhas inválidas; devolve (linhas, descartadas)."""
+    faltando = [c for c in COLUNAS if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes: {', '.join(faltando)}")
+
+    codigo = df["country_code"].astype("string").str.strip().str.upper()
+    ano = pd.to_numeric(df["year"], errors="coerce")
+    mes = pd.to_numeric(df["month"], errors="coerce")
+    valor = pd.to_numeric(df["indicator_value"], errors="coerce")
+    if fonte is not None:
+        origem = pd.Series(fonte, index=df.index, dtype="object")
+    elif "source" in df.columns:
+        origem = df["source"].astype("object").where(df["source"].notna(), None)
+    else:
+        origem = pd.Series(None, index=df.index, dtype="object")
+
+    validas = codigo.notna() & (codigo != "") & ano.notna() & mes.between(1, 12) & valor.notna()
+    linhas = list(zip(
+        codigo[validas].tolist(),
+        ano[validas].astype("int64").tolist(),
+        mes[validas].astype("int64").tolist(),
+        valor[validas].astype("float64").tolist(),
+        origem[validas].tolist(),
+    ))
+    return linhas, int((~validas).sum())
+
+
+def gravar_metricas(conn, linhas):
+    """Upsert de (country_code, year, month, indicator_value, source) na transação corrente."""
+    conn.executemany(SQL_UPSERT, linhas)
+
+
+def ingerir(caminhos, db_path=DB_PATH, lote=LOTE_PADRAO, fonte=None, progresso=print):
+    """Carrega todos os arquivos numa transação; devolve estatísticas da carga."""
+    migrar(db_path)
+    conn = conectar(db_path)
+    conn.isolation_level = None
+    gravadas = descartadas = 0
+    inicio = time.perf_counter()
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for caminho in caminhos:
+                for df in ler_lotes(caminho, lote):
+                    linhas, invalidas = preparar_lote(df, fonte)
+                    gravar_metricas(conn, linhas)
+                    gravadas += len(linhas)
+                    descartadas += invalidas
+                    if progresso:
+                        decorrido = time.perf_counter() - inicio
+                        progresso(f"… {gravadas} linhas ({gravadas / decorrido:,.0f} linhas/s)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        segundos = time.perf_counter() - inicio
+        conn.isolation_level = ""
+        derivados.atualizar(conn)
+    finally:
+        conn.close()
+
+    return {
+        "gravadas": gravadas,
+        "descartadas": descartadas,
+        "segundos": segundos,
+        "linhas_por_segundo": gravadas / segundos if segundos else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga em lote de country_metrics (CSV/Parquet).")
+    parser.add_argument("arquivos", nargs="+", help="arquivos .csv ou .parquet")
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO, help="linhas por lote (padrão: %(default)s)")
+    parser.add_argument("--fonte", help="valor da coluna source para todas as linhas")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    stats = ingerir(args.arquivos, db_path=args.db, lote=args.lote, fonte=args.fonte)
+    print(
+        f"✅ {stats['gravadas']} linhas gravadas em {stats['segundos']:.2f} s "
+        f"({stats['linhas_por_segundo']:,.0f} linhas/s); {stats['descartadas']} descartadas."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Mapa global do Índice de Paz (Plotly), sem Streamlit.
+
+Monta a figura a partir de DataFrames já lidos, então serve tanto ao cache
+de figuras do app (app/figuras.py) quanto à exportação estática
+(app/exportar_site.py), que roda fora do Streamlit.
+"""
+import plotly.graph_objects as go
+
+from app.escala import CORES, classificar_paz
+from app.grade import raios_agrupamento
+
+# Nível da grade de Sóis no mapa mundial (células de ~11° × 6°).
+NIVEL_MUNDO = 5
+
+
+def _traco_nivel(df, nivel):
+    return go.Scattergeo(
+        lat=df["latitude"],
+        lon=df["longitude"],
+        mode="markers",
+        name=nivel,
+        legendgroup=nivel,
+        marker=dict(color=CORES[nivel]),
+        hovertext=df["country_name"],
+        customdata=df["indicator_value"],
+        hovertemplate=f"<b>%{{hovertext}}</b><br>Índice: %{{customdata:.0f}}<br>Nível: {nivel}<extra></extra>",
+    )
+
+
+def _traco_sois(df):
+    return go.Scattergeo(
+        lat=df["latitude"],
+        lon=df["longitude"],
+        mode="markers",
+        name="☀️ Sóis da Paz",
+        marker=dict(size=raios_agrupamento(df["total"], 10, 30), color="gold", symbol="star",
+                    line=dict(width=1, color="orange")),
+        customdata=df["total"],
+        hovertemplate="☀️ %{customdata} Sol(is)<extra></extra>",
+    )
+
+
+def montar_mapa_global(df_mapa, sois=None, altura=750) -> go.Figure:
+    """Mapa a partir dos países (com indicator_value) e das células de Sóis já lidos."""
+    df_mapa = df_mapa.assign(nivel_paz=classificar_paz(df_mapa["indicator_value"]))
+
+    fig = go.Figure()
+    # Um traço por nível, na ordem da escala, como o color= do plotly.express.
+    for nivel, df_nivel in df_mapa.groupby("nivel_paz", observed=True, sort=True):
+        fig.add_trace(_traco_nivel(df_nivel, nivel))
+
+    if sois is not None and not sois.empty:
+        fig.add_trace(_traco_sois(sois))
+
+    fig.update_geos(projection_type="natural earth")
+    fig.update_layout(
+        title="🌎 Índice Global da Paz Viva — Escala Oficial",
+        legend_title_text="nivel_paz",
+        height=altura,
+    )
+    return fig
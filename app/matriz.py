@@ -0,0 +1,243 @@
+"""Matriz densa país × mês de country_metrics, em .npy aberto com memory map.
+
+valores.npy guarda indicator_value em float32, uma linha por país
+(paises.npy, códigos em ordem) e uma coluna por mês, contínuas do primeiro
+ao último período com dados (periodos.npy, chave ano * 12 + mês - 1 como em
+app/dados.py); NaN onde o país não tem valor. Os valores de um mês (mapa
+global) são uma coluna e o histórico de um país (historico_pais) é uma
+linha — fatias do arquivo mapeado, sem filtro nem groupby.
+
+É mais um destino de periodos_pendentes ('matriz'): só os meses alterados
+são relidos do banco (meses apagados nas pontas ficam como colunas NaN até
+um --recalcular). Cada versão é gravada numa pasta própria
+(CACHE_DIR/matriz/<banco>-v<versao>, com <banco> derivado do caminho do
+arquivo SQLite: os CLIs com --db não tocam na matriz do app) e trocada de
+uma vez, então quem já abriu a anterior continua lendo um arquivo inteiro.
+Sem a pasta da versão atual (cache apagado, outro diretório) a matriz é
+refeita do zero.
+
+    python -m app.matriz              # processa as pendências
+    python -m app.matriz --recalcular # refaz do zero
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from app.banco import DB_PATH, conectar, identidade, identidade_conexao, migrar
+from app.colunar import CACHE_DIR
+
+DESTINO = "matriz"
+MATRIZ_DIR = CACHE_DIR / "matriz"
+ARQUIVOS = ("valores", "paises", "periodos")
+
+_PENDENTES = f"SELECT year, month FROM periodos_pendentes WHERE destino = '{DESTINO}'"
+
+
+class Matriz:
+    """Valores (países × meses) e os eixos; as fatias devolvidas são views, não cópias."""
+
+    def __init__(self, valores, paises, periodos, versao=None):
+        self.valores = valores
+        self.paises = paises
+        self.periodos = periodos
+        self.versao = versao
+        self._primeiro = int(periodos[0]) if len(periodos) else 0
+
+    def coluna(self, periodo):
+        """Índice da coluna da chave de período, ou None fora do eixo."""
+        j = int(periodo) - self._primeiro
+        return j if 0 <= j < len(self.periodos) else None
+
+    def linha(self, codigo):
+        """Índice da linha do país, ou None se ele não tem dados."""
+        i = int(np.searchsorted(self.paises, codigo))
+        return i if i < len(self.paises) and self.paises[i] == codigo else None
+
+    def mes(self, ano, mes):
+        """Valor de cada país (na ordem de `paises`) no mês."""
+        j = self.coluna(int(ano) * 12 + int(mes) - 1)
+        if j is None:
+            return np.full(len(self.paises), np.nan, dtype=np.float32)
+        return self.valores[:, j]
+
+    def pais(self, codigo):
+        """Histórico do país, um valor por período de `periodos`."""
+        i = self.linha(codigo)
+        if i is None:
+            return np.full(len(self.periodos), np.nan, dtype=np.float32)
+        return self.valores[i]
+
+    def intervalo(self, inicio, fim):
+        """Colunas das chaves de período de `inicio` a `fim` (inclusive)."""
+        a = min(max(int(inicio) - self._primeiro, 0), len(self.periodos))
+        b = min(max(int(fim) - self._primeiro + 1, a), len(self.periodos))
+        return self.valores[:, a:b]
+
+
+# ======================================
+# MONTAGEM
+# ======================================
+def _ler(conn, so_pendentes):
+    """(códigos, chaves de período, valores) de country_metrics."""
+    sql = "SELECT country_code, year * 12 + month - 1, indicator_value FROM country_metrics"
+    if so_pendentes:
+        sql += f" WHERE (year, month) IN ({_PENDENTES})"
+    linhas = conn.execute(sql).fetchall()
+    if not linhas:
+        return np.array([], dtype=str), np.array([], dtype=np.int32), np.array([], dtype=np.float32)
+    codigos, chaves, valores = zip(*linhas)
+    return np.array(codigos, dtype=str), np.array(chaves, dtype=np.int32), np.array(valores, dtype=np.float32)
+
+
+def _eixos(paises, periodos, codigos, chaves):
+    """Eixos que cobrem os anteriores e as linhas novas."""
+    paises = np.union1d(paises, codigos)
+    extremos = np.concatenate([periodos[[0, -1]] if len(periodos) else periodos, chaves])
+    if not len(extremos):
+        return paises, np.array([], dtype=np.int32)
+    return paises, np.arange(extremos.min(), extremos.max() + 1, dtype=np.int32)
+
+
+def _preencher(valores, paises, periodos, codigos, chaves, medidas):
+    """Grava cada medida na célula (país, mês); country_metrics tem uma linha por par."""
+    if len(codigos):
+        valores[np.searchsorted(paises, codigos), chaves - periodos[0]] = medidas
+
+
+def de_banco(conn, versao=None):
+    """Matriz inteira lida de country_metrics, só em memória."""
+    codigos, chaves, medidas = _ler(conn, so_pendentes=False)
+    paises, periodos = _eixos(np.array([], dtype=str), np.array([], dtype=np.int32), codigos, chaves)
+    valores = np.full((len(paises), len(periodos)), np.nan, dtype=np.float32)
+    _preencher(valores, paises, periodos, codigos, chaves, medidas)
+    return Matriz(valores, paises, periodos, versao)
+
+
+def _atualizada(conn, anterior):
+    """`anterior` com os meses pendentes relidos do banco (eixos ampliados se preciso)."""
+    codigos, chaves, medidas = _ler(conn, so_pendentes=True)
+    meses = np.array([a * 12 + m - 1 for a, m in conn.execute(_PENDENTES)], dtype=np.int32)
+    paises, periodos = _eixos(anterior.paises, anterior.periodos, codigos, chaves)
+    valores = np.full((len(paises), len(periodos)), np.nan, dtype=np.float32)
+    if anterior.valores.size:
+        a = int(anterior.periodos[0] - periodos[0])
+        valores[np.searchsorted(paises, anterior.paises), a:a + len(anterior.periodos)] = anterior.valores
+    if len(periodos):
+        # Meses que ficaram sem linhas voltam a NaN; os demais são regravados abaixo.
+        meses = meses[(meses >= periodos[0]) & (meses <= periodos[-1])]
+        valores[:, meses - periodos[0]] = np.nan
+    _preencher(valores, paises, periodos, codigos, chaves, medidas)
+    return Matriz(valores, paises, periodos)
+
+
+# ======================================
+# ARQUIVOS
+# ======================================
+def pasta(banco, versao, diretorio=MATRIZ_DIR):
+    return Path(diretorio) / f"{banco}-v{versao}"
+
+
+def gravar(matriz, banco, versao, diretorio=MATRIZ_DIR):
+    """Grava a matriz como a versão `versao` do banco e apaga as outras dele; devolve a pasta."""
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    destino = pasta(banco, versao, diretorio)
+    # Monta num temporário e troca no fim: leitores nunca veem pasta pela metade.
+    temporario = Path(tempfile.mkdtemp(dir=diretorio, prefix=".matriz-"))
+    try:
+        for nome in ARQUIVOS:
+            np.save(temporario / f"{nome}.npy", getattr(matriz, nome), allow_pickle=False)
+        shutil.rmtree(destino, ignore_errors=True)
+        os.replace(temporario, destino)
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+    for velha in diretorio.glob(f"{banco}-v*"):
+        if velha != destino:
+            shutil.rmtree(velha, ignore_errors=True)
+    return destino
+
+
+def abrir(banco, versao, diretorio=MATRIZ_DIR):
+    """Matriz da versão do banco com valores em memory map (somente leitura), ou None se não houver."""
+    origem = pasta(banco, versao, diretorio)
+    try:
+        paises = np.load(origem / "paises.npy")
+        periodos = np.load(origem / "periodos.npy")
+        try:
+            valores = np.load(origem / "valores.npy", mmap_mode="r")
+        except ValueError:
+            # Arquivo sem dados (banco vazio) não pode ser mapeado.
+            valores = np.load(origem / "valores.npy")
+    except FileNotFoundError:
+        return None
+    return Matriz(valores, paises, periodos, versao)
+
+
+# ======================================
+# ATUALIZAÇÃO
+# ======================================
+def atualizar_matriz(conn, diretorio=MATRIZ_DIR, recalcular=False):
+    """Reaplica os meses pendentes sobre a versão gravada; devolve quantos meses."""
+    banco = identidade_conexao(conn)
+    with conn:
+        versao = conn.execute("SELECT versao FROM destinos_derivados WHERE nome = ?", (DESTINO,)).fetchone()[0]
+        pendentes = conn.execute(
+            "SELECT COUNT(*) FROM periodos_pendentes WHERE destino = ?", (DESTINO,)
+        ).fetchone()[0]
+        anterior = None if recalcular else abrir(banco, versao, diretorio)
+        if not pendentes and anterior is not None:
+            return 0
+        matriz = de_banco(conn) if anterior is None else _atualizada(conn, anterior)
+        if pendentes:
+            versao += 1
+            conn.execute("DELETE FROM periodos_pendentes WHERE destino = ?", (DESTINO,))
+            conn.execute("UPDATE destinos_derivados SET versao = ? WHERE nome = ?", (versao, DESTINO))
+        try:
+            gravar(matriz, banco, versao, diretorio)
+        except OSError:
+            # Cache sem permissão de escrita: a versão avança do mesmo jeito e
+            # app/dados.py monta a matriz em memória.
+            pass
+    return pendentes
+
+
+def recalcular(conn, diretorio=MATRIZ_DIR):
+    """Refaz a matriz do zero a partir de country_metrics."""
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO periodos_pendentes (destino, year, month) "
+            "SELECT DISTINCT ?, year, month FROM country_metrics",
+            (DESTINO,),
+        )
+    return atualizar_matriz(conn, diretorio, recalcular=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matriz densa país × mês do Índice de Paz (.npy).")
+    parser.add_argument("--recalcular", action="store_true", help="refaz a matriz do zero")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    migrar(args.db)
+    conn = conectar(args.db)
+    try:
+        meses = recalcular(conn) if args.recalcular else atualizar_matriz(conn)
+        versao = conn.execute("SELECT versao FROM destinos_derivados WHERE nome = ?", (DESTINO,)).fetchone()[0]
+    finally:
+        conn.close()
+    banco = identidade(args.db)
+    matriz = abrir(banco, versao)
+    if matriz is None:
+        print(f"⚠️ {meses} mês(es) processado(s), mas {MATRIZ_DIR} não pôde ser gravado.")
+        return
+    print(f"✅ {meses} mês(es) processado(s): {len(matriz.paises)} países × {len(matriz.periodos)} meses "
+          f"em {pasta(banco, versao)}")
+
+
+if __name__ == "__main__":
+    main()
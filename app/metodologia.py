@@ -0,0 +1,213 @@
+"""Motor de cálculo do Indicador de Paz (docs/metodologia.md).
+
+Recebe um cubo país × mês × componente com as taxas brutas, normaliza cada
+componente para 0–1 (1 = pior), aplica os pesos e devolve
+IP = 100 · (1 − V) para todos os países e meses numa única passada NumPy.
+
+Entrada da linha de comando: CSV ou Parquet "largo", com country_code, year,
+month e uma coluna por componente (colunas ausentes contam como sem dado):
+
+    python -m app.metodologia componentes.csv --metodo zscore --peso homicidios=0.3
+"""
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from app import derivados
+from app.banco import DB_PATH, PILARES_HISTORICOS, conectar, migrar
+from app.ingestao import gravar_metricas
+
+COMPONENTES = (
+    "homicidios",           # UNODC, por 100k
+    "mortes_conflito",      # UCDP battle-related deaths, por 100k
+    "eventos_acled",        # ACLED, frequência/severidade
+    "violencia_mulheres",   # WHO/UN, por 100k
+    "gasto_militar",        # SIPRI, per capita
+    "deslocados",           # UNHCR, por 100k
+)
+
+PESOS_PADRAO = {
+    "homicidios": 0.25,
+    "mortes_conflito": 0.25,
+    "eventos_acled": 0.20,
+    "violencia_mulheres": 0.15,
+    "gasto_militar": 0.10,
+    "deslocados": 0.05,
+}
+
+# Pilares de historical_peace_regional e os pesos padrão do Índice de Paz
+# Viva histórico (os vigentes ficam em pesos_historicos, ver app/historico.py).
+PILARES = PILARES_HISTORICOS
+
+PESOS_PILARES = {
+    "pilar_paz_tensao": 0.30,
+    "pilar_protecao_vida": 0.25,
+    "pilar_estabilidade_convivencia": 0.20,
+    "pilar_compromisso_desarmamento": 0.15,
+    "pilar_cuidado_vulneraveis": 0.10,
+}
+
+METODOS = ("minmax", "zscore")
+
+# No z-score, ±LIMITE_Z desvios viram 0 e 1; além disso o valor é saturado.
+LIMITE_Z = 3.0
+
+FONTE = "metodologia"
+
+
+def vetor_pesos(pesos=None, componentes=COMPONENTES):
+    """Pesos como array na ordem de `componentes`, somando 1."""
+    if pesos is None:
+        pesos = PESOS_PADRAO
+    if isinstance(pesos, dict):
+        desconhecidos = set(pesos) - set(componentes)
+        if desconhecidos:
+            raise ValueError(f"Componentes desconhecidos: {', '.join(sorted(desconhecidos))}")
+        pesos = [pesos.get(c, 0.0) for c in componentes]
+    w = np.asarray(pesos, dtype="float64")
+    if w.shape[-1] != len(componentes):
+        raise ValueError(f"Esperados {len(componentes)} pesos, recebidos {w.shape[-1]}")
+    if (w < 0).any() or not (w.sum(axis=-1) > 0).all():
+        raise ValueError("Pesos devem ser não negativos e ter soma positiva")
+    return w / w.sum(axis=-1, keepdims=True)
+
+
+def normalizar(cubo, metodo="minmax"):
+    """Normaliza o último eixo (componentes) para 0–1, 1 = mais violência.
+
+    A escala de cada componente usa todos os países e meses juntos, para que
+    o indicador seja comparável no tempo. NaN continua NaN.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconhecido: {metodo} (use {' ou '.join(METODOS)})")
+    x = np.asarray(cubo, dtype="float64")
+    eixos = tuple(range(x.ndim - 1))
+    faltando = np.isnan(x)
+
+    with warnings.catch_warnings():
+        # Componente sem nenhum dado: o resultado fica NaN, sem aviso.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if metodo == "minmax":
+            minimo = np.nanmin(x, axis=eixos, keepdims=True)
+            amplitude = np.nanmax(x, axis=eixos, keepdims=True) - minimo
+            normalizado = np.divide(x - minimo, amplitude, out=np.zeros_like(x), where=amplitude > 0)
+        else:
+            media = np.nanmean(x, axis=eixos, keepdims=True)
+            desvio = np.nanstd(x, axis=eixos, keepdims=True)
+            z = np.divide(x - media, desvio, out=np.zeros_like(x), where=desvio > 0)
+            normalizado = np.clip((z + LIMITE_Z) / (2 * LIMITE_Z), 0.0, 1.0)
+
+    normalizado[faltando] = np.nan
+    return normalizado
+
+
+def calcular_indicador(cubo, pesos=None, metodo="minmax"):
+    """IP = 100 · (1 − V) para cada país e mês do cubo (..., componente)."""
+    return agregar(normalizar(cubo, metodo), pesos)
+
+
+def agregar(x, pesos=None):
+    """IP = 100 · (1 − V) a partir de componentes já normalizados (..., componente).
+
+    Quando faltam componentes para um país/mês, V é a média ponderada só dos
+    componentes presentes; sem nenhum componente o resultado é NaN.
+    `pesos` também pode ser uma matriz (k, componente): o resultado ganha um
+    último eixo com os k cenários, calculados na mesma multiplicação.
+    """
+    w = vetor_pesos(pesos)
+    presente = ~np.isnan(x)
+    soma = np.where(presente, x, 0.0) @ w.T
+    peso_presente = presente.astype("float64") @ w.T
+    violencia = np.divide(soma, peso_presente, out=np.full(soma.shape, np.nan), where=peso_presente > 0)
+    return 100.0 * (1.0 - violencia)
+
+
+def montar_cubo(df, componentes=COMPONENTES):
+    """De um DataFrame largo (country_code, year, month, <componentes>) para o cubo.
+
+    Devolve (cubo, paises, periodos): cubo[i, j, k] é o componente k do país
+    paises[i] no mês periodos[j], com periodos em (year, month).
+    """
+    paises, idx_pais = np.unique(df["country_code"].to_numpy(dtype=str), return_inverse=True)
+    chave = df["year"].to_numpy(dtype="int64") * 12 + df["month"].to_numpy(dtype="int64") - 1
+    chaves, idx_periodo = np.unique(chave, return_inverse=True)
+    periodos = np.column_stack((chaves // 12, chaves % 12 + 1))
+
+    valores = np.full((len(df), len(componentes)), np.nan)
+    for k, componente in enumerate(componentes):
+        if componente in df.columns:
+            valores[:, k] = pd.to_numeric(df[componente], errors="coerce").to_numpy(dtype="float64")
+
+    cubo = np.full((len(paises), len(chaves), len(componentes)), np.nan)
+    cubo[idx_pais, idx_periodo] = valores
+    return cubo, paises, periodos
+
+
+def linhas_metricas(ip, paises, periodos, fonte=FONTE, casas=2):
+    """Linhas (country_code, year, month, indicator_value, source) dos valores não NaN."""
+    i, j = np.nonzero(~np.isnan(ip))
+    return list(zip(
+        paises[i].tolist(),
+        periodos[j, 0].tolist(),
+        periodos[j, 1].tolist(),
+        np.round(ip[i, j], casas).tolist(),
+        [fonte] * len(i),
+    ))
+
+
+def gravar(ip, paises, periodos, db_path=DB_PATH, fonte=FONTE):
+    """Grava o indicador em country_metrics numa transação; devolve o nº de linhas."""
+    linhas = linhas_metricas(ip, paises, periodos, fonte)
+    migrar(db_path)
+    conn = conectar(db_path)
+    try:
+        with conn:
+            gravar_metricas(conn, linhas)
+        derivados.atualizar(conn)
+    finally:
+        conn.close()
+    return len(linhas)
+
+
+def _ler_componentes(caminho):
+    if str(caminho).lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(caminho)
+    return pd.read_csv(caminho, dtype={"country_code": "string"})
+
+
+def _peso(texto):
+    nome, _, valor = texto.partition("=")
+    if nome not in COMPONENTES or not valor:
+        raise argparse.ArgumentTypeError(f"use componente=peso, com componente em: {', '.join(COMPONENTES)}")
+    return nome, float(valor)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula o Indicador de Paz a partir dos componentes brutos.")
+    parser.add_argument("arquivo", help="CSV/Parquet com country_code, year, month e os componentes")
+    parser.add_argument("--metodo", choices=METODOS, default="minmax")
+    parser.add_argument("--peso", type=_peso, action="append", default=[],
+                        help="substitui um peso padrão, ex.: --peso homicidios=0.3")
+    parser.add_argument("--simular", action="store_true", help="só calcula e mostra um resumo, sem gravar")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    pesos = {**PESOS_PADRAO, **dict(args.peso)}
+    cubo, paises, periodos = montar_cubo(_ler_componentes(args.arquivo))
+    ip = calcular_indicador(cubo, pesos, args.metodo)
+
+    validos = int(np.count_nonzero(~np.isnan(ip)))
+    print(f"🌍 {len(paises)} países × {len(periodos)} meses: {validos} valores calculados.")
+    if args.simular:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            print(f"   IP médio {np.nanmean(ip):.2f} (mín. {np.nanmin(ip):.2f}, máx. {np.nanmax(ip):.2f})")
+        return
+    gravadas = gravar(ip, paises, periodos, db_path=args.db)
+    print(f"✅ {gravadas} linhas gravadas em country_metrics (source = '{FONTE}').")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Registro de Sóis da Paz (peacekeepers) com a chave espacial já calculada.
+
+Cada Sol entra com o seu geohash (app/espacial.py), então as consultas por
+caixa e por raio usam o índice desde o primeiro momento; os contadores e a
+grade de agrupamento são atualizados pelos triggers do banco.
+
+    python -m app.pacificadores sois.csv
+
+O CSV deve ter country_code, city, latitude, longitude e, opcionalmente,
+created_at (padrão: agora).
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from app.banco import DB_PATH, conectar, migrar
+from app.espacial import geohash
+
+COLUNAS = ["country_code", "city", "latitude", "longitude"]
+
+SQL_INSERIR = """
+    INSERT INTO peacekeepers (country_code, city, latitude, longitude, geohash, created_at)
+    VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+"""
+
+
+def preparar(df):
+    """Linhas prontas para SQL_INSERIR, com geohash calculado para o lote inteiro."""
+    faltando = [c for c in COLUNAS if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes: {', '.join(faltando)}")
+    lat = pd.to_numeric(df["latitude"], errors="coerce").to_numpy(dtype="float64")
+    lon = pd.to_numeric(df["longitude"], errors="coerce").to_numpy(dtype="float64")
+    fora = (np.abs(lat) > 90) | (np.abs(lon) > 180)
+    if fora.any():
+        raise ValueError(f"{int(fora.sum())} coordenada(s) fora de latitude ±90 / longitude ±180")
+    codigo = df["country_code"].astype("string").str.strip().str.upper()
+    criado = df["created_at"] if "created_at" in df.columns else pd.Series(None, index=df.index)
+    return list(zip(
+        codigo.astype(object).where(codigo.notna(), None).tolist(),
+        df["city"].astype(object).where(df["city"].notna(), None).tolist(),
+        [None if np.isnan(v) else v for v in lat.tolist()],
+        [None if np.isnan(v) else v for v in lon.tolist()],
+        geohash(lat, lon).tolist(),
+        criado.astype(object).where(criado.notna(), None).tolist(),
+    ))
+
+
+def registrar(conn, df):
+    """Insere os Sóis de `df` numa transação; devolve quantos foram gravados."""
+    linhas = preparar(df)
+    with conn:
+        conn.executemany(SQL_INSERIR, linhas)
+    return len(linhas)
+
+
+def registrar_sol(conn, country_code, city, latitude, longitude, created_at=None):
+    """Registra um único Sol."""
+    return registrar(conn, pd.DataFrame([{
+        "country_code": country_code, "city": city, "latitude": latitude,
+        "longitude": longitude, "created_at": created_at,
+    }]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registra Sóis da Paz a partir de um CSV.")
+    parser.add_argument("arquivo", help="CSV com country_code, city, latitude, longitude[, created_at]")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+
+    migrar(args.db)
+    conn = conectar(args.db)
+    try:
+        gravados = registrar(conn, pd.read_csv(args.arquivo, dtype={"country_code": "string"}))
+    finally:
+        conn.close()
+    print(f"✅ {gravados} Sol(is) registrado(s).")
+
+
+if __name__ == "__main__":
+    main()
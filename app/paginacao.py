@@ -0,0 +1,36 @@
+"""Tabela do ranking em páginas, para as páginas do portal.
+
+Cada página da tabela pede ao banco só TAMANHO_PAGINA linhas a partir da
+última (posição, país) exibida (app/dados.carregar_pagina_ranking, keyset
+sobre idx_rank_posicao), então nem a consulta nem o que vai para o navegador
+crescem com o número de entidades do ranking. Os cursores das páginas já
+vistas ficam em st.session_state, um por tabela e período, para o botão de
+voltar.
+"""
+import streamlit as st
+
+TAMANHO_PAGINA = 50
+
+
+def ranking_paginado(chave, ano, mes, colunas, renomear=None, total=None):
+    """Desenha uma página do ranking do período com botões de anterior/próxima."""
+    from app.dados import carregar_pagina_ranking
+
+    cursores = st.session_state.setdefault(f"{chave}_{ano}_{mes}", [None])
+    df = carregar_pagina_ranking(ano, mes, TAMANHO_PAGINA, cursores[-1])
+    if df.empty:
+        st.info("Sem dados de índice de paz para este período.")
+        return
+
+    st.dataframe(df[colunas].rename(columns=renomear or {}), use_container_width=True, hide_index=True)
+
+    inicio = (len(cursores) - 1) * TAMANHO_PAGINA
+    col_anterior, col_info, col_proxima = st.columns([1, 2, 1])
+    col_info.caption(f"Linhas {inicio + 1}–{inicio + len(df)}" + (f" de {total}" if total else ""))
+    if col_anterior.button("◀ Anterior", key=f"{chave}_anterior", disabled=len(cursores) == 1):
+        cursores.pop()
+        st.rerun()
+    if col_proxima.button("Próxima ▶", key=f"{chave}_proxima", disabled=not df.attrs["mais"]):
+        ultima = df.iloc[-1]
+        cursores.append((int(ultima["Posição"]), str(ultima["country_code"])))
+        st.rerun()
@@ -0,0 +1,76 @@
+"""Registro das páginas do portal.
+
+Cada página declara o módulo que a desenha (com `render()`), os conjuntos de
+dados compartilhados que usa — nomes de `carregar_<nome>()` em app/dados.py,
+cacheados uma vez por processo e por versão da tabela — e o TTL, em
+segundos, dos caches próprios da página (figuras, PDFs, agregações); None
+quer dizer que só a versão das tabelas invalida.
+
+portal.py monta o menu a partir daqui; cada página, rodada sozinha com
+`streamlit run`, busca os mesmos dados pelo mesmo registro.
+"""
+import importlib
+
+HORA = 3600
+
+PAGINAS = {
+    "mapa_global": {
+        "titulo": "Mapa Global",
+        "modulo": "app.mapa_global",
+        "dados": ("periodos", "suns_por_mes"),
+        "ttl": None,
+    },
+    "ranking_global": {
+        "titulo": "Ranking Global",
+        "modulo": "app.ranking_global",
+        "dados": ("periodos",),
+        "ttl": None,
+    },
+    "contador_suns": {
+        "titulo": "Contador de Sóis",
+        "modulo": "app.contador_suns",
+        "dados": ("suns_por_pais", "suns_por_mes"),
+        "ttl": None,
+    },
+    "evolucao_paz": {
+        "titulo": "Evolução Global da Paz",
+        "modulo": "app.evolucao_paz",
+        "dados": ("agregados",),
+        "ttl": None,
+    },
+    "historico_pais": {
+        "titulo": "Histórico por País",
+        "modulo": "app.historico_pais",
+        "dados": ("paises",),
+        "ttl": None,
+    },
+    "relatorio_mensal": {
+        "titulo": "Relatório Mensal",
+        "modulo": "app.relatorio_mensal",
+        "dados": ("periodos", "suns_por_mes"),
+        "ttl": 24 * HORA,
+    },
+    "analise_sensibilidade": {
+        "titulo": "Sensibilidade aos Pesos",
+        "modulo": "app.analise_sensibilidade",
+        "dados": ("historico_regional",),
+        "ttl": None,
+    },
+}
+
+
+def ttl(nome):
+    """TTL (segundos ou None) dos caches próprios da página."""
+    return PAGINAS[nome]["ttl"]
+
+
+def dados(nome):
+    """{conjunto: DataFrame} com os dados compartilhados que a página declarou."""
+    from app import dados as camada
+
+    return {conjunto: getattr(camada, f"carregar_{conjunto}")() for conjunto in PAGINAS[nome]["dados"]}
+
+
+def render(nome):
+    """Importa o módulo da página só agora e a desenha com os dados compartilhados."""
+    importlib.import_module(PAGINAS[nome]["modulo"]).render(dados(nome))
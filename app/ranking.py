@@ -0,0 +1,181 @@
+"""Ranking mensal materializado em country_rank_monthly.
+
+Um mês fechado não muda, então a agregação, a classificação, a ordenação e
+a posição de cada país são gravadas uma vez. Só os meses marcados em
+periodos_pendentes (destino 'ranking') são refeitos.
+
+As variações de um mês para o seguinte (quem mais subiu ou caiu em índice e
+posição, quem entrou no nível Crítico) ficam em variacoes_ranking, calculadas
+no próprio SQLite com LAG() e RANK() a partir do ranking já gravado. Um mês
+alterado muda as suas variações e as do mês seguinte; só esses são refeitos
+(destino 'variacoes', depois do ranking).
+"""
+from app.escala import NIVEIS, nivel_sql
+
+DESTINO = "ranking"
+DESTINO_VARIACOES = "variacoes"
+CRITICO = NIVEIS[0]
+
+# country_metrics tem uma linha por (country_code, year, month) (índice único
+# da migração "metricas_unicas"): o valor do mês entra direto, sem agregação.
+_SQL_RECALCULAR = f"""
+    INSERT INTO country_rank_monthly
+        (country_code, year, month, value, level, position, percentile)
+    SELECT
+        country_code, year, month, value,
+        {nivel_sql("value")},
+        RANK() OVER (PARTITION BY year, month ORDER BY value DESC),
+        100.0 * PERCENT_RANK() OVER (PARTITION BY year, month ORDER BY value)
+    FROM (
+        SELECT m.country_code, m.year, m.month, m.indicator_value AS value
+        FROM country_metrics m
+        JOIN periodos_pendentes p
+          ON p.destino = '{DESTINO}' AND p.year = m.year AND p.month = m.month
+    )
+"""
+
+_SQL_RANKING = """
+    SELECT r.position AS "Posição", r.country_code, c.country_name,
+           r.value AS indicator_value, r.level AS nivel_paz, r.percentile AS percentil
+    FROM country_rank_monthly r
+    LEFT JOIN country_metadata c ON c.country_code = r.country_code
+    WHERE r.year = ? AND r.month = ?
+"""
+
+# Ranking de um mês já com o nome do país, na ordem da posição.
+SQL_MES = _SQL_RANKING + """    ORDER BY r.position, r.country_code
+"""
+
+# Só os k primeiros / os k últimos (estes do último para cima), lidos pelo
+# índice idx_rank_posicao (year, month, position) sem ordenar o mês inteiro.
+SQL_TOPO = SQL_MES + """    LIMIT ?
+"""
+SQL_BASE = _SQL_RANKING + """    ORDER BY r.position DESC, r.country_code DESC
+    LIMIT ?
+"""
+
+# Paginação por chave (keyset): as linhas depois de (posição, país) da última
+# linha já exibida. Cada página custa o mesmo, qualquer que seja a sua ordem.
+SQL_PAGINA = _SQL_RANKING + """      AND (r.position, r.country_code) > (?, ?)
+    ORDER BY r.position, r.country_code
+    LIMIT ?
+"""
+
+# Países e soma dos índices por nível no mês, para média e distribuição.
+SQL_NIVEIS_MES = """
+    SELECT level AS nivel_paz, COUNT(*) AS quantidade, TOTAL(value) AS soma
+    FROM country_rank_monthly
+    WHERE year = ? AND month = ?
+    GROUP BY level
+"""
+
+# Histórico de um país, mês a mês, pelo índice idx_rank_pais.
+SQL_PAIS = """
+    SELECT year, month, value AS indicator_value, level AS nivel_paz,
+           position AS "Posição", percentile AS percentil
+    FROM country_rank_monthly
+    WHERE country_code = ?
+    ORDER BY year, month
+"""
+
+# Meses (chave year * 12 + month - 1) cujas variações precisam ser refeitas:
+# os pendentes e o seguinte de cada um.
+_ALVO = f"""
+    alvo(p) AS (
+        SELECT year * 12 + month - 1 FROM periodos_pendentes WHERE destino = '{DESTINO_VARIACOES}'
+        UNION SELECT year * 12 + month FROM periodos_pendentes WHERE destino = '{DESTINO_VARIACOES}'
+    )
+"""
+
+# Variação de cada país em relação ao mês imediatamente anterior (NULL se ele
+# não tem dado lá). LAG() percorre o mês-alvo e o anterior de uma vez;
+# ordem_variacao é o RANK() da variação do índice dentro do mês.
+_SQL_VARIACOES = f"""
+    WITH {_ALVO},
+    base AS (
+        SELECT country_code, year, month, year * 12 + month - 1 AS p, value, level, position,
+               LAG(year * 12 + month - 1) OVER w AS p_anterior,
+               LAG(value) OVER w AS valor_anterior,
+               LAG(level) OVER w AS nivel_anterior,
+               LAG(position) OVER w AS posicao_anterior
+        FROM country_rank_monthly
+        WHERE (year, month) IN (
+            SELECT p / 12, p % 12 + 1 FROM alvo
+            UNION SELECT (p - 1) / 12, (p - 1) % 12 + 1 FROM alvo
+        )
+        WINDOW w AS (PARTITION BY country_code ORDER BY year, month)
+    ),
+    mes AS (
+        SELECT country_code, year, month, value, level, position,
+               IIF(p_anterior = p - 1, valor_anterior, NULL) AS valor_anterior,
+               IIF(p_anterior = p - 1, nivel_anterior, NULL) AS nivel_anterior,
+               IIF(p_anterior = p - 1, posicao_anterior, NULL) AS posicao_anterior
+        FROM base
+        WHERE p IN (SELECT p FROM alvo)
+    )
+    INSERT INTO variacoes_ranking
+        (country_code, year, month, value, level, position,
+         valor_anterior, nivel_anterior, posicao_anterior, variacao, subida, ordem_variacao)
+    SELECT country_code, year, month, value, level, position,
+           valor_anterior, nivel_anterior, posicao_anterior,
+           value - valor_anterior,
+           posicao_anterior - position,
+           IIF(valor_anterior IS NULL, NULL,
+               RANK() OVER (PARTITION BY year, month ORDER BY value - valor_anterior DESC))
+    FROM mes
+"""
+
+# Variações de um mês já com o nome do país, da maior subida do índice à maior queda.
+SQL_VARIACOES_MES = """
+    SELECT v.country_code, c.country_name, v.value AS indicator_value, v.level AS nivel_paz,
+           v.position AS "Posição", v.valor_anterior, v.nivel_anterior, v.posicao_anterior,
+           v.variacao, v.subida, v.ordem_variacao
+    FROM variacoes_ranking v
+    LEFT JOIN country_metadata c ON c.country_code = v.country_code
+    WHERE v.year = ? AND v.month = ?
+    ORDER BY v.ordem_variacao IS NULL, v.ordem_variacao, v.country_code
+"""
+
+
+def atualizar_ranking(conn):
+    """Refaz country_rank_monthly nos meses pendentes; devolve quantos foram."""
+    with conn:
+        pendentes = conn.execute(
+            "SELECT COUNT(*) FROM periodos_pendentes WHERE destino = ?", (DESTINO,)
+        ).fetchone()[0]
+        if not pendentes:
+            return 0
+        conn.execute(
+            """
+            DELETE FROM country_rank_monthly
+            WHERE (year, month) IN (
+                SELECT year, month FROM periodos_pendentes WHERE destino = ?
+            )
+            """,
+            (DESTINO,),
+        )
+        conn.execute(_SQL_RECALCULAR)
+        conn.execute("DELETE FROM periodos_pendentes WHERE destino = ?", (DESTINO,))
+        conn.execute("UPDATE destinos_derivados SET versao = versao + 1 WHERE nome = ?", (DESTINO,))
+    return pendentes
+
+
+def atualizar_variacoes(conn):
+    """Refaz variacoes_ranking nos meses pendentes e nos seguintes; devolve quantos meses pendentes.
+
+    Lê country_rank_monthly, então precisa rodar depois de atualizar_ranking.
+    """
+    with conn:
+        pendentes = conn.execute(
+            "SELECT COUNT(*) FROM periodos_pendentes WHERE destino = ?", (DESTINO_VARIACOES,)
+        ).fetchone()[0]
+        if not pendentes:
+            return 0
+        conn.execute(f"""
+            WITH {_ALVO}
+            DELETE FROM variacoes_ranking WHERE (year, month) IN (SELECT p / 12, p % 12 + 1 FROM alvo)
+        """)
+        conn.execute(_SQL_VARIACOES)
+        conn.execute("DELETE FROM periodos_pendentes WHERE destino = ?", (DESTINO_VARIACOES,))
+        conn.execute("UPDATE destinos_derivados SET versao = versao + 1 WHERE nome = ?", (DESTINO_VARIACOES,))
+    return pendentes
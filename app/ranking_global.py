@@ -1,108 +1,120 @@
-import streamlit as st
-import sqlite3
-import pandas as pd
+import sys
 from pathlib import Path
 
-st.set_page_config(page_title="Ranking Global da Paz Viva", layout="wide")
-
-st.title("🏆 Ranking Global da Paz Viva")
-st.markdown("Classificação dos países pelo Índice Oficial da Paz Viva.")
-
-DB_PATH = Path("data/database/paz.db")
-
-# -------------------------------
-# FUNÇÃO DA ESCALA OFICIAL
-# -------------------------------
-def classificar_paz(valor):
-    if pd.isna(valor):
-        return "Sem dados"
-    if valor == 100:
-        return "Excelente"
-    elif 91 <= valor <= 99:
-        return "Bom"
-    elif 71 <= valor <= 90:
-        return "Médio"
-    elif 51 <= valor <= 70:
-        return "Baixo"
-    else:
-        return "Crítico"
-
-# -------------------------------
-# CONEXÃO COM O BANCO
-# -------------------------------
-conn = sqlite3.connect(DB_PATH)
-
-df_index = pd.read_sql_query(
-    "SELECT country_code, year, month, indicator_value FROM country_metrics",
-    conn
-)
+import streamlit as st
 
-df_countries = pd.read_sql_query(
-    "SELECT country_code, country_name FROM country_metadata",
-    conn
-)
+if __name__ == "__main__":
+    # `streamlit run app/ranking_global.py` só põe app/ no sys.path; o pacote app fica na raiz.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-conn.close()
+from app import paginas  # noqa: E402
 
-# -------------------------------
-# FILTRO DE DATA
-# -------------------------------
-st.sidebar.header("📅 Filtro de Tempo")
 
-anos = sorted(df_index["year"].unique())
-meses = sorted(df_index["month"].unique())
+def render(compartilhados=None):
+    """Ranking do período escolhido, com destaques e países em nível crítico."""
+    from app.dados import carregar_base_ranking, carregar_niveis_ranking, carregar_topo_ranking, carregar_variacoes
+    from app.paginacao import TAMANHO_PAGINA, ranking_paginado
+    from app.ranking import CRITICO
 
-ano_sel = st.sidebar.selectbox("Ano", anos)
-mes_sel = st.sidebar.selectbox("Mês", meses)
+    st.title("🏆 Ranking Global da Paz Viva")
+    st.markdown("Classificação dos países pelo Índice Oficial da Paz Viva.")
 
-df_filtrado = df_index[
-    (df_index["year"] == ano_sel) &
-    (df_index["month"] == mes_sel)
-]
+    # -------------------------------
+    # DADOS (CACHE COMPARTILHADO)
+    # -------------------------------
+    compartilhados = compartilhados or paginas.dados("ranking_global")
+    df_periodos = compartilhados["periodos"]
 
-df_rank = df_filtrado.merge(
-    df_countries,
-    on="country_code",
-    how="left"
-)
+    # -------------------------------
+    # FILTRO DE DATA
+    # -------------------------------
+    st.sidebar.header("📅 Filtro de Tempo")
 
-df_rank["nivel_paz"] = df_rank["indicator_value"].apply(classificar_paz)
+    anos = sorted(df_periodos["year"].unique())
+    meses = sorted(df_periodos["month"].unique())
 
-# -------------------------------
-# ORDENAÇÃO DO RANKING
-# -------------------------------
-df_rank = df_rank.sort_values(by="indicator_value", ascending=False)
+    ano_sel = st.sidebar.selectbox("Ano", anos)
+    mes_sel = st.sidebar.selectbox("Mês", meses)
 
-df_rank["Posição"] = range(1, len(df_rank) + 1)
+    # -------------------------------
+    # RANKING MATERIALIZADO (só as linhas exibidas saem do banco)
+    # -------------------------------
+    df_niveis = carregar_niveis_ranking(ano_sel, mes_sel)
+    total = int(df_niveis["quantidade"].sum())
 
-# -------------------------------
-# DESTAQUES
-# -------------------------------
-st.subheader("🌟 Top 10 Países com Maior Índice de Paz Viva")
+    # -------------------------------
+    # DESTAQUES
+    # -------------------------------
+    st.subheader("🌟 Top 10 Países com Maior Índice de Paz Viva")
 
-st.dataframe(
-    df_rank[["Posição", "country_name", "indicator_value", "nivel_paz"]].head(10),
-    use_container_width=True
-)
+    st.dataframe(
+        carregar_topo_ranking(ano_sel, mes_sel, 10)[["Posição", "country_name", "indicator_value", "nivel_paz"]],
+        use_container_width=True
+    )
 
-st.divider()
+    st.divider()
 
-st.subheader("🚨 Países em Nível Crítico")
+    st.subheader("🚨 Países em Nível Crítico")
 
-df_critico = df_rank[df_rank["nivel_paz"] == "Crítico"]
+    # Crítico é o nível mais baixo: os países nele são os últimos do ranking.
+    num_criticos = int(df_niveis.loc[df_niveis["nivel_paz"] == CRITICO, "quantidade"].sum())
+    df_critico = carregar_base_ranking(ano_sel, mes_sel, min(num_criticos, TAMANHO_PAGINA))
 
-st.dataframe(
-    df_critico[["country_name", "indicator_value"]],
-    use_container_width=True
-)
+    st.dataframe(
+        df_critico[["country_name", "indicator_value"]],
+        use_container_width=True
+    )
+    if num_criticos > len(df_critico):
+        st.caption(f"Os {len(df_critico)} últimos de {num_criticos} países em nível Crítico; "
+                   "os demais estão no ranking completo.")
 
-st.divider()
+    st.divider()
 
-st.subheader("📊 Ranking Completo")
+    # -------------------------------
+    # VARIAÇÕES EM RELAÇÃO AO MÊS ANTERIOR (variacoes_ranking)
+    # -------------------------------
+    st.subheader("📈 Maiores Variações do Mês")
 
-st.dataframe(
-    df_rank[["Posição", "country_name", "indicator_value", "nivel_paz"]],
-    use_container_width=True
-)
+    df_var = carregar_variacoes(ano_sel, mes_sel)
+    df_var = df_var[df_var["valor_anterior"].notna()]
 
-st.success("✅ Ranking Global da Paz Viva carregado com sucesso!")
+    if df_var.empty:
+        st.info("Sem dados do mês anterior para comparar.")
+    else:
+        colunas = ["country_name", "valor_anterior", "indicator_value", "variacao"]
+        col1, col2 = st.columns(2)
+        col1.markdown("**⬆️ Maiores Altas do Índice**")
+        col1.dataframe(df_var[df_var["variacao"] > 0][colunas].head(10), use_container_width=True)
+        col2.markdown("**⬇️ Maiores Quedas do Índice**")
+        col2.dataframe(df_var[df_var["variacao"] < 0][colunas].iloc[::-1].head(10), use_container_width=True)
+
+        colunas = ["country_name", "posicao_anterior", "Posição", "subida"]
+        col1, col2 = st.columns(2)
+        col1.markdown("**🚀 Mais Posições Ganhas**")
+        col1.dataframe(df_var[df_var["subida"] > 0].nlargest(10, "subida")[colunas], use_container_width=True)
+        col2.markdown("**📉 Mais Posições Perdidas**")
+        col2.dataframe(df_var[df_var["subida"] < 0].nsmallest(10, "subida")[colunas], use_container_width=True)
+
+        st.markdown("**🚨 Novos em Nível Crítico**")
+        df_novos = df_var[(df_var["nivel_paz"] == CRITICO) & (df_var["nivel_anterior"] != CRITICO)]
+        if df_novos.empty:
+            st.write("Nenhum país entrou no nível Crítico neste mês.")
+        else:
+            st.dataframe(
+                df_novos[["country_name", "nivel_anterior", "valor_anterior", "indicator_value"]],
+                use_container_width=True
+            )
+
+    st.divider()
+
+    st.subheader("📊 Ranking Completo")
+
+    ranking_paginado("ranking_completo", ano_sel, mes_sel,
+                     ["Posição", "country_name", "indicator_value", "nivel_paz"], total=total)
+
+    st.success("✅ Ranking Global da Paz Viva carregado com sucesso!")
+
+
+if __name__ == "__main__":
+    st.set_page_config(page_title="Ranking Global da Paz Viva", layout="wide")
+    render()
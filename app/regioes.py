@@ -0,0 +1,38 @@
+"""Região de cada país, para as médias regionais de app/agregados.py.
+
+Continentes do esquema M49 da ONU, com os mesmos nomes usados em
+historical_peace_regional ("Europa", "Américas"). A migração
+"agregados_metricas" em app/banco.py grava este mapa em regioes_paises;
+alterar a tabela depois marca para recálculo os meses do país alterado.
+"""
+GLOBAL = "Mundo"
+SEM_REGIAO = "Sem região"
+
+REGIOES = {
+    "África": (
+        "AGO", "BDI", "BEN", "BFA", "BWA", "CAF", "CIV", "CMR", "COD", "COG", "COM", "CPV", "DJI", "DZA",
+        "EGY", "ERI", "ETH", "GAB", "GHA", "GIN", "GMB", "GNB", "GNQ", "KEN", "LBR", "LBY", "LSO", "MAR",
+        "MDG", "MLI", "MOZ", "MRT", "MUS", "MWI", "NAM", "NER", "NGA", "RWA", "SDN", "SEN", "SLE", "SOM",
+        "SSD", "STP", "SWZ", "SYC", "TCD", "TGO", "TUN", "TZA", "UGA", "ZAF", "ZMB", "ZWE",
+    ),
+    "Américas": (
+        "ARG", "ATG", "BHS", "BLZ", "BOL", "BRA", "BRB", "CAN", "CHL", "COL", "CRI", "CUB", "DMA", "DOM",
+        "ECU", "GRD", "GTM", "GUY", "HND", "HTI", "JAM", "KNA", "LCA", "MEX", "NIC", "PAN", "PER", "PRY",
+        "SLV", "SUR", "TTO", "URY", "USA", "VCT", "VEN",
+    ),
+    "Ásia": (
+        "AFG", "ARE", "ARM", "AZE", "BGD", "BHR", "BRN", "BTN", "CHN", "CYP", "GEO", "IDN", "IND", "IRN",
+        "IRQ", "ISR", "JOR", "JPN", "KAZ", "KGZ", "KHM", "KOR", "KWT", "LAO", "LBN", "LKA", "MDV", "MMR",
+        "MNG", "MYS", "NPL", "OMN", "PAK", "PHL", "PRK", "PSE", "QAT", "SAU", "SGP", "SYR", "THA", "TJK",
+        "TKM", "TLS", "TUR", "TWN", "UZB", "VNM", "YEM",
+    ),
+    "Europa": (
+        "ALB", "AND", "AUT", "BEL", "BGR", "BIH", "BLR", "CHE", "CZE", "DEU", "DNK", "ESP", "EST", "FIN",
+        "FRA", "GBR", "GRC", "HRV", "HUN", "IRL", "ISL", "ITA", "LIE", "LTU", "LUX", "LVA", "MCO", "MDA",
+        "MKD", "MLT", "MNE", "NLD", "NOR", "POL", "PRT", "ROU", "RUS", "SMR", "SRB", "SVK", "SVN", "SWE",
+        "UKR", "VAT", "XKX",
+    ),
+    "Oceania": (
+        "AUS", "FJI", "FSM", "KIR", "MHL", "NRU", "NZL", "PLW", "PNG", "SLB", "TON", "TUV", "VUT", "WSM",
+    ),
+}
@@ -1,189 +1,182 @@
-import streamlit as st
-import sqlite3
-import pandas as pd
+import sys
 from pathlib import Path
 
-st.set_page_config(page_title="Relatório Mensal da Paz Viva", layout="wide")
-
-st.title("📄 Relatório Mensal da Paz Viva")
-
-st.markdown("""
-Este relatório apresenta a **situação global da Paz Viva** para o período selecionado,
-com base no Índice Oficial da Paz Viva e nos Sóis do Movimento da Paz.
-""")
-
-DB_PATH = Path("data/database/paz.db")
-
-# -------------------------------
-# ESCALA OFICIAL
-# -------------------------------
-def classificar_paz(valor):
-    if pd.isna(valor):
-        return "Sem dados"
-    if valor == 100:
-        return "Excelente"
-    elif 91 <= valor <= 99:
-        return "Bom"
-    elif 71 <= valor <= 90:
-        return "Médio"
-    elif 51 <= valor <= 70:
-        return "Baixo"
-    else:
-        return "Crítico"
+import streamlit as st
 
-# -------------------------------
-# CONEXÃO COM O BANCO
-# -------------------------------
-conn = sqlite3.connect(DB_PATH)
+if __name__ == "__main__":
+    # `streamlit run app/relatorio_mensal.py` só põe app/ no sys.path; o pacote app fica na raiz.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-df_index = pd.read_sql_query(
-    "SELECT country_code, year, month, indicator_value FROM country_metrics",
-    conn
-)
+from app import paginas  # noqa: E402
 
-df_countries = pd.read_sql_query(
-    "SELECT country_code, country_name FROM country_metadata",
-    conn
-)
 
-df_suns = pd.read_sql_query(
-    "SELECT country_code, created_at FROM peacekeepers",
-    conn
-)
+# PDF guardado por período e versão das tabelas; os totais (parâmetros com _)
+# já correspondem a essas versões e ficam fora da chave. O ranking inteiro,
+# que o PDF traz em tabela, só é lido quando o PDF do período não está no cache.
+@st.cache_data(show_spinner=False, max_entries=16, ttl=paginas.ttl("relatorio_mensal"))
+def _pdf_do_periodo(versao_ranking, versao_suns, ano, mes, _total_suns_mes, _total_suns_global):
+    from app.dados import carregar_ranking
+    from app.relatorio_pdf import gerar_pdf
 
-conn.close()
+    return gerar_pdf(ano, mes, carregar_ranking(ano, mes), _total_suns_mes, _total_suns_global)
 
-df_suns["created_at"] = pd.to_datetime(df_suns["created_at"])
 
-# -------------------------------
-# SELEÇÃO DE PERÍODO
-# -------------------------------
-st.sidebar.header("📅 Período do Relatório")
+def render(compartilhados=None):
+    """Relatório do período escolhido, com download em PDF."""
+    from app.dados import carregar_base_ranking, carregar_niveis_ranking, carregar_topo_ranking, versao_tabela
+    from app.paginacao import ranking_paginado
 
-anos = sorted(df_index["year"].unique())
-meses = sorted(df_index["month"].unique())
+    st.title("📄 Relatório Mensal da Paz Viva")
 
-ano_sel = st.sidebar.selectbox("Ano", anos)
-mes_sel = st.sidebar.selectbox("Mês", meses)
+    st.markdown("""
+    Este relatório apresenta a **situação global da Paz Viva** para o período selecionado,
+    com base no Índice Oficial da Paz Viva e nos Sóis do Movimento da Paz.
+    """)
 
-# Índices no período
-df_mes = df_index[
-    (df_index["year"] == ano_sel) &
-    (df_index["month"] == mes_sel)
-].copy()
+    # -------------------------------
+    # DADOS (CACHE COMPARTILHADO)
+    # -------------------------------
+    compartilhados = compartilhados or paginas.dados("relatorio_mensal")
+    df_periodos = compartilhados["periodos"]
+    df_suns_mensal = compartilhados["suns_por_mes"]
 
-df_mes = df_mes.merge(df_countries, on="country_code", how="left")
+    # -------------------------------
+    # SELEÇÃO DE PERÍODO
+    # -------------------------------
+    st.sidebar.header("📅 Período do Relatório")
 
-df_mes["nivel_paz"] = df_mes["indicator_value"].apply(classificar_paz)
+    anos = sorted(df_periodos["year"].unique())
+    meses = sorted(df_periodos["month"].unique())
 
-# Sóis no período
-df_suns_mes = df_suns[
-    (df_suns["created_at"].dt.year == ano_sel) &
-    (df_suns["created_at"].dt.month == mes_sel)
-].copy()
+    ano_sel = st.sidebar.selectbox("Ano", anos)
+    mes_sel = st.sidebar.selectbox("Mês", meses)
 
-total_suns_mes = len(df_suns_mes)
-total_suns_global = len(df_suns)
+    # Países e soma dos índices por nível no período (ranking materializado);
+    # as linhas de cada país só são lidas para as tabelas, em partes.
+    df_niveis = carregar_niveis_ranking(ano_sel, mes_sel)
 
-# -------------------------------
-# VISÃO GERAL
-# -------------------------------
-st.subheader("🌍 Visão Geral do Período")
+    # Sóis no período (contadores mensais mantidos no banco)
+    total_suns_mes = int(df_suns_mensal.loc[
+        (df_suns_mensal["year"] == ano_sel) &
+        (df_suns_mensal["month"] == mes_sel),
+        "total"
+    ].sum())
+    total_suns_global = int(df_suns_mensal["total"].sum())
 
-col1, col2, col3, col4 = st.columns(4)
+    # -------------------------------
+    # VISÃO GERAL
+    # -------------------------------
+    st.subheader("🌍 Visão Geral do Período")
 
-media_global = df_mes["indicator_value"].mean()
-num_paises = df_mes["country_code"].nunique()
+    col1, col2, col3, col4 = st.columns(4)
 
-col1.metric("Índice Médio Global", f"{media_global:.1f}" if pd.notna(media_global) else "-")
-col2.metric("Países com dados no período", num_paises)
-col3.metric("Sóis da Paz neste mês", total_suns_mes)
-col4.metric("Sóis acumulados (global)", total_suns_global)
+    num_paises = int(df_niveis["quantidade"].sum())
 
-st.markdown("---")
+    col1.metric("Índice Médio Global", f"{df_niveis['soma'].sum() / num_paises:.1f}" if num_paises else "-")
+    col2.metric("Países com dados no período", num_paises)
+    col3.metric("Sóis da Paz neste mês", total_suns_mes)
+    col4.metric("Sóis acumulados (global)", total_suns_global)
 
-# -------------------------------
-# DESTAQUES
-# -------------------------------
-st.subheader("🏆 Destaques do Mês")
+    st.markdown("---")
 
-df_mes_ord = df_mes.sort_values(by="indicator_value", ascending=False)
+    # -------------------------------
+    # DESTAQUES
+    # -------------------------------
+    st.subheader("🏆 Destaques do Mês")
 
-top5 = df_mes_ord.head(5)
-bottom5 = df_mes_ord.tail(5)
+    top5 = carregar_topo_ranking(ano_sel, mes_sel, 5)
+    bottom5 = carregar_base_ranking(ano_sel, mes_sel, 5)
 
-col_t1, col_t2 = st.columns(2)
+    col_t1, col_t2 = st.columns(2)
 
-with col_t1:
-    st.markdown("### 🌟 Top 5 Países com maior Índice")
-    if not top5.empty:
-        st.table(
-            top5[["country_name", "indicator_value", "nivel_paz"]].reset_index(drop=True)
-        )
-    else:
-        st.info("Sem dados para este período.")
+    with col_t1:
+        st.markdown("### 🌟 Top 5 Países com maior Índice")
+        if not top5.empty:
+            st.table(
+                top5[["country_name", "indicator_value", "nivel_paz"]].reset_index(drop=True)
+            )
+        else:
+            st.info("Sem dados para este período.")
 
-with col_t2:
-    st.markdown("### ⚠️ 5 Países em situação mais crítica")
-    if not bottom5.empty:
-        st.table(
-            bottom5[["country_name", "indicator_value", "nivel_paz"]].reset_index(drop=True)
-        )
+    with col_t2:
+        st.markdown("### ⚠️ 5 Países em situação mais crítica")
+        if not bottom5.empty:
+            st.table(
+                bottom5[["country_name", "indicator_value", "nivel_paz"]].reset_index(drop=True)
+            )
+        else:
+            st.info("Sem dados para este período.")
+
+    st.markdown("---")
+
+    # -------------------------------
+    # DISTRIBUIÇÃO POR NÍVEL
+    # -------------------------------
+    st.subheader("📊 Distribuição dos Países por Nível de Paz")
+
+    df_dist = df_niveis[["nivel_paz", "quantidade"]]
+
+    if not df_dist.empty:
+        st.dataframe(df_dist, use_container_width=True)
     else:
-        st.info("Sem dados para este período.")
-
-st.markdown("---")
-
-# -------------------------------
-# DISTRIBUIÇÃO POR NÍVEL
-# -------------------------------
-st.subheader("📊 Distribuição dos Países por Nível de Paz")
-
-df_dist = (
-    df_mes.groupby("nivel_paz")
-    .size()
-    .reset_index(name="quantidade")
-    .sort_values(by="quantidade", ascending=False)
-)
-
-if not df_dist.empty:
-    st.dataframe(df_dist, use_container_width=True)
-else:
-    st.info("Sem dados de países para este período.")
-
-st.markdown("---")
-
-# -------------------------------
-# TABELA COMPLETA
-# -------------------------------
-st.subheader("📋 Tabela Oficial do Índice por País (Período Selecionado)")
-
-if not df_mes.empty:
-    df_tabela = df_mes[["country_name", "indicator_value", "nivel_paz"]].copy()
-    df_tabela = df_tabela.sort_values(by="indicator_value", ascending=False)
-    df_tabela.rename(columns={
-        "country_name": "País",
-        "indicator_value": "Índice de Paz",
-        "nivel_paz": "Nível"
-    }, inplace=True)
-    st.dataframe(df_tabela, use_container_width=True, height=400)
-else:
-    st.info("Sem dados de índice de paz para este período.")
-
-st.markdown("---")
-
-st.markdown("""
-### 📌 Como gerar o PDF deste relatório
-
-1. Com o relatório aberto na tela, pressione **Ctrl + P** (no Windows) ou **Cmd + P** (no Mac).
-2. Em **Destino/Impressora**, escolha **“Salvar como PDF”**.
-3. Ajuste a orientação (retrato ou paisagem) se desejar.
-4. Clique em **Salvar**.
-
-Assim você obtém um **Relatório Oficial da Paz Viva** pronto para:
-- compartilhar com grupos,
-- apresentar em encontros,
-- enviar para instituições, imprensa, órgãos públicos.
-""")
-
-st.success("✅ Relatório Mensal da Paz Viva pronto para impressão ou exportação em PDF.")
+        st.info("Sem dados de países para este período.")
+
+    st.markdown("---")
+
+    # -------------------------------
+    # TABELA COMPLETA
+    # -------------------------------
+    st.subheader("📋 Tabela Oficial do Índice por País (Período Selecionado)")
+
+    ranking_paginado(
+        "relatorio_tabela", ano_sel, mes_sel,
+        ["country_name", "indicator_value", "nivel_paz"],
+        renomear={
+            "country_name": "País",
+            "indicator_value": "Índice de Paz",
+            "nivel_paz": "Nível"
+        },
+        total=num_paises,
+    )
+
+    st.markdown("---")
+
+    # -------------------------------
+    # PDF DO RELATÓRIO
+    # -------------------------------
+    st.subheader("📥 Relatório em PDF")
+
+    # O PDF (ranking inteiro + gráficos via kaleido) só é montado a pedido; o
+    # resultado fica na sessão, por período e versão, para o botão de download
+    # sobreviver aos reruns.
+    versoes = (versao_tabela("country_rank_monthly"), versao_tabela("peacekeepers"))
+    chave_pdf = f"relatorio_pdf_{ano_sel}_{mes_sel}"
+    guardado = st.session_state.get(chave_pdf)
+    pdf = guardado[1] if guardado and guardado[0] == versoes else None
+
+    if pdf is None:
+        if st.button("📄 Gerar PDF do período", key="relatorio_gerar_pdf"):
+            with st.spinner("Gerando o PDF do relatório..."):
+                pdf = _pdf_do_periodo(*versoes, int(ano_sel), int(mes_sel), total_suns_mes, total_suns_global)
+            st.session_state[chave_pdf] = (versoes, pdf)
+
+    if pdf is not None:
+        st.download_button(
+            "📥 Baixar Relatório Oficial da Paz Viva (PDF)",
+            data=pdf,
+            file_name=f"relatorio_paz_viva_{ano_sel}_{mes_sel:02d}.pdf",
+            mime="application/pdf",
+        )
+
+    st.markdown("""
+    Para gerar os relatórios de todos os meses de uma vez:
+
+        python -m app.relatorio_pdf --todos --saida relatorios
+    """)
+
+    st.success("✅ Relatório Mensal da Paz Viva pronto para compartilhar em PDF.")
+
+
+if __name__ == "__main__":
+    st.set_page_config(page_title="Relatório Mensal da Paz Viva", layout="wide")
+    render()
@@ -0,0 +1,319 @@
+"""Relatório Mensal da Paz Viva em PDF, sem navegador.
+
+Monta o mesmo conteúdo da página app/relatorio_mensal.py — indicadores do
+período, top/bottom 5, distribuição por nível, tabela completa e gráficos —
+com reportlab; os gráficos Plotly viram PNG pelo kaleido.
+
+Para gerar o arquivo de todos os meses, cada período é um trabalho de um
+pool de processos. Cada processo abre o banco uma vez e mantém um único
+kaleido (o Chromium dele é iniciado no inicializador e reaproveitado em todos
+os gráficos daquele processo), então o custo de subir o renderizador é pago
+uma vez por processo, não por gráfico. O kaleido 1.x usa o Chrome/Chromium
+da máquina (no deploy, o pacote chromium de packages.txt); sem ele os PDFs
+saem sem gráficos e o CLI avisa quais:
+
+    python -m app.relatorio_pdf --ano 2025 --mes 1
+    python -m app.relatorio_pdf --todos --saida relatorios --processos 4
+"""
+import argparse
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import Image, LongTable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from app import derivados, ranking
+from app.banco import DB_PATH, conectar, migrar
+from app.escala import CORES, NIVEIS, NIVEL_PAZ
+
+SAIDA = Path("relatorios")
+# Caminho de cada PDF dentro de --saida.
+MODELO = "relatorio_paz_viva_{ano}_{mes:02d}.pdf"
+LARGURA_GRAFICO, ALTURA_GRAFICO = 900, 420
+ESCALA_PNG = 2
+
+# Conexão e disponibilidade do kaleido de cada processo do pool.
+_conn = None
+_kaleido = None
+
+
+# ======================================
+# DADOS DO PERÍODO
+# ======================================
+def ler_periodo(conn, ano, mes):
+    """(ranking do mês, Sóis no mês, Sóis acumulados até o mês) direto do banco.
+
+    O acumulado para no próprio mês: um Sol novo não muda o relatório (nem a
+    impressão do site estático) dos meses anteriores.
+    """
+    df_mes = pd.read_sql_query(ranking.SQL_MES, conn, params=(int(ano), int(mes)))
+    df_mes["nivel_paz"] = df_mes["nivel_paz"].astype(NIVEL_PAZ)
+    total_mes, total_acumulado = conn.execute(
+        "SELECT TOTAL(CASE WHEN year = ? AND month = ? THEN total END), TOTAL(total) "
+        "FROM suns_por_mes WHERE year * 12 + month <= ? * 12 + ?",
+        (int(ano), int(mes), int(ano), int(mes)),
+    ).fetchone()
+    return df_mes, int(total_mes), int(total_acumulado)
+
+
+def periodos(conn):
+    """Todos os (ano, mês) com ranking calculado, em ordem."""
+    return conn.execute(
+        "SELECT DISTINCT year, month FROM country_rank_monthly ORDER BY year, month"
+    ).fetchall()
+
+
+def distribuicao(df_mes):
+    """Quantidade de países por nível, do mais comum ao menos comum."""
+    return (
+        df_mes.groupby("nivel_paz", observed=True)
+        .size()
+        .reset_index(name="quantidade")
+        .sort_values(by="quantidade", ascending=False)
+    )
+
+
+# ======================================
+# GRÁFICOS
+# ======================================
+def figuras(df_mes):
+    """Gráficos do relatório: distribuição por nível e índice de cada país."""
+    contagem = df_mes["nivel_paz"].value_counts().reindex(NIVEIS, fill_value=0)
+    fig_niveis = go.Figure(go.Bar(
+        x=contagem.index, y=contagem.to_numpy(), marker_color=[CORES[n] for n in contagem.index],
+        text=contagem.to_numpy(), textposition="outside",
+    ))
+    fig_niveis.update_layout(title="Países por Nível de Paz", yaxis_title="Países")
+
+    fig_paises = go.Figure(go.Bar(
+        x=df_mes["country_code"], y=df_mes["indicator_value"],
+        marker_color=df_mes["nivel_paz"].map(CORES).astype(object).to_numpy(),
+    ))
+    fig_paises.update_layout(
+        title="Índice de Paz por País (ordem do ranking)", yaxis_title="Índice de Paz",
+        yaxis_range=[0, 100], xaxis_showticklabels=False, bargap=0,
+    )
+    for fig in (fig_niveis, fig_paises):
+        fig.update_layout(template="plotly_white", width=LARGURA_GRAFICO, height=ALTURA_GRAFICO,
+                          margin=dict(l=60, r=20, t=60, b=40))
+    return [fig_niveis, fig_paises]
+
+
+def _iniciar_kaleido():
+    """Sobe o kaleido deste processo com um gráfico vazio; False se indisponível."""
+    global _kaleido
+    if _kaleido is None:
+        try:
+            import kaleido
+
+            # kaleido >= 1.1: um Chromium por processo, reaproveitado por
+            # pio.to_image; sem isso cada gráfico abriria um navegador novo.
+            if hasattr(kaleido, "start_sync_server"):
+                kaleido.start_sync_server(silence_warnings=True)
+            pio.to_image(go.Figure(), format="png", width=10, height=10)
+            _kaleido = True
+        except Exception:
+            # Sem o pacote, sem Chrome/Chromium (o kaleido 1.x levanta erros
+            # do choreographer) ou navegador que não sobe: PDF sem gráficos.
+            _kaleido = False
+    return _kaleido
+
+
+def graficos_png(figs):
+    """PNG de cada figura pelo kaleido do processo; None sem kaleido."""
+    if not _iniciar_kaleido():
+        return [None] * len(figs)
+    return [pio.to_image(fig, format="png", scale=ESCALA_PNG) for fig in figs]
+
+
+# ======================================
+# PDF
+# ======================================
+def _tabela(df, larguras, repetir=1):
+    linhas = [list(df.columns)] + [
+        ["-" if pd.isna(v) else f"{v:.1f}" if isinstance(v, (float, np.floating)) else str(v) for v in linha]
+        for linha in df.itertuples(index=False, name=None)
+    ]
+    tabela = (LongTable if len(linhas) > 40 else Table)(linhas, colWidths=larguras, repeatRows=repetir)
+    tabela.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f4e79")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f2f2f2")]),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#bfbfbf")),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]))
+    return tabela
+
+
+def _colunas_paises(df):
+    return df[["Posição", "country_name", "indicator_value", "nivel_paz"]].rename(columns={
+        "country_name": "País", "indicator_value": "Índice de Paz", "nivel_paz": "Nível",
+    })
+
+
+def montar_pdf(ano, mes, df_mes, total_suns_mes, total_suns_global, pngs=None):
+    """Bytes do PDF do período; `pngs` são os gráficos de `figuras()` já renderizados."""
+    estilos = getSampleStyleSheet()
+    largura = A4[0] - 3 * cm
+    media = df_mes["indicator_value"].mean()
+
+    historia = [
+        Paragraph(f"Relatório Mensal da Paz Viva — {mes:02d}/{ano}", estilos["Title"]),
+        Paragraph("Situação global da Paz Viva no período, com base no Índice Oficial da Paz Viva "
+                  "e nos Sóis do Movimento da Paz.", estilos["Normal"]),
+        Spacer(1, 0.4 * cm),
+        Paragraph("Visão Geral do Período", estilos["Heading2"]),
+        _tabela(pd.DataFrame([[
+            f"{media:.1f}" if pd.notna(media) else "-",
+            str(df_mes["country_code"].nunique()), str(total_suns_mes), str(total_suns_global),
+        ]], columns=["Índice Médio Global", "Países com dados", "Sóis no mês", "Sóis acumulados"]),
+            [largura / 4] * 4),
+    ]
+
+    if df_mes.empty:
+        historia += [Spacer(1, 0.4 * cm), Paragraph("Sem dados de índice de paz para este período.",
+                                                    estilos["Normal"])]
+    else:
+        larguras_paises = [0.12 * largura, 0.48 * largura, 0.2 * largura, 0.2 * largura]
+        historia += [
+            Paragraph("Top 5 Países com maior Índice", estilos["Heading2"]),
+            _tabela(_colunas_paises(df_mes.head(5)), larguras_paises),
+            Paragraph("5 Países em situação mais crítica", estilos["Heading2"]),
+            _tabela(_colunas_paises(df_mes.tail(5)), larguras_paises),
+            Paragraph("Distribuição dos Países por Nível de Paz", estilos["Heading2"]),
+            _tabela(distribuicao(df_mes).rename(columns={"nivel_paz": "Nível", "quantidade": "Países"}),
+                    [largura / 2] * 2),
+        ]
+        for png in pngs or []:
+            if png is None:
+                continue
+            altura = largura * ALTURA_GRAFICO / LARGURA_GRAFICO
+            historia += [Spacer(1, 0.3 * cm), Image(io.BytesIO(png), width=largura, height=altura)]
+        historia += [
+            Paragraph("Tabela Oficial do Índice por País", estilos["Heading2"]),
+            _tabela(_colunas_paises(df_mes), larguras_paises),
+        ]
+
+    buffer = io.BytesIO()
+    documento = SimpleDocTemplate(
+        buffer, pagesize=A4, leftMargin=1.5 * cm, rightMargin=1.5 * cm, topMargin=1.5 * cm,
+        bottomMargin=1.5 * cm, title=escape(f"Relatório Mensal da Paz Viva {mes:02d}/{ano}"),
+        author="Movimento da Paz",
+    )
+    documento.build(historia)
+    return buffer.getvalue()
+
+
+def gerar_pdf(ano, mes, df_mes, total_suns_mes, total_suns_global):
+    """PDF completo (com gráficos, se houver kaleido) a partir de dados já carregados."""
+    pngs = graficos_png(figuras(df_mes)) if not df_mes.empty else []
+    return montar_pdf(ano, mes, df_mes, total_suns_mes, total_suns_global, pngs)
+
+
+# ======================================
+# LOTE (POOL DE PROCESSOS)
+# ======================================
+def _iniciar_processo(db_path):
+    global _conn
+    _conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    _iniciar_kaleido()
+
+
+def _gerar_arquivo(ano, mes, saida, modelo):
+    """Grava o PDF do período; devolve (caminho, com gráficos?)."""
+    destino = Path(saida) / modelo.format(ano=ano, mes=mes)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    pdf = gerar_pdf(ano, mes, *ler_periodo(_conn, ano, mes))
+    # Temporário + os.replace: quem serve o diretório nunca vê um PDF pela metade.
+    fd, temporario = tempfile.mkstemp(dir=destino.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as arquivo:
+            arquivo.write(pdf)
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, destino)
+    except BaseException:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+    return destino, _kaleido
+
+
+def gerar_lote(lista_periodos, saida=SAIDA, db_path=DB_PATH, processos=None, modelo=MODELO):
+    """Gera um PDF por (ano, mês) em paralelo; devolve (caminhos gravados, falhas, sem gráficos).
+
+    `modelo` é o caminho de cada arquivo dentro de `saida`, com {ano} e {mes}.
+    Um período que falha não interrompe os outros: `falhas` é {(ano, mês): exceção}.
+    `sem_graficos` lista os períodos gravados por um processo em que o kaleido
+    não subiu.
+    """
+    if not lista_periodos:
+        return [], {}, []
+    Path(saida).mkdir(parents=True, exist_ok=True)
+    processos = min(processos or os.cpu_count() or 1, len(lista_periodos))
+    gerados, falhas, sem_graficos = {}, {}, []
+    with ProcessPoolExecutor(processos, initializer=_iniciar_processo, initargs=(str(db_path),)) as pool:
+        tarefas = {
+            pool.submit(_gerar_arquivo, ano, mes, str(saida), modelo): (ano, mes) for ano, mes in lista_periodos
+        }
+        for tarefa in as_completed(tarefas):
+            try:
+                gerados[tarefas[tarefa]], graficos = tarefa.result()
+            except Exception as erro:
+                falhas[tarefas[tarefa]] = erro
+                continue
+            if not graficos:
+                sem_graficos.append(tarefas[tarefa])
+    return [gerados[p] for p in lista_periodos if p in gerados], falhas, sorted(sem_graficos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o Relatório Mensal da Paz Viva em PDF.")
+    parser.add_argument("--ano", type=int)
+    parser.add_argument("--mes", type=int)
+    parser.add_argument("--todos", action="store_true", help="um PDF para cada período com ranking")
+    parser.add_argument("--saida", default=str(SAIDA), help="diretório dos PDFs (padrão: relatorios)")
+    parser.add_argument("--processos", type=int, help="processos em paralelo (padrão: núcleos da máquina)")
+    parser.add_argument("--db", default=str(DB_PATH), help="caminho do banco (padrão: paz.db do app)")
+    args = parser.parse_args(argv)
+    if not args.todos and (args.ano is None or args.mes is None):
+        parser.error("informe --ano e --mes, ou --todos")
+
+    # Ranking em dia antes de abrir o pool (os processos só leem).
+    migrar(args.db)
+    conn = conectar(args.db)
+    try:
+        derivados.atualizar(conn)
+        lista = periodos(conn) if args.todos else [(args.ano, args.mes)]
+    finally:
+        conn.close()
+
+    inicio = time.perf_counter()
+    gerados, falhas, sem_graficos = gerar_lote(lista, args.saida, args.db, args.processos)
+    print(f"✅ {len(gerados)} relatório(s) em {args.saida} ({time.perf_counter() - inicio:.1f} s).")
+    if sem_graficos:
+        print(f"⚠️ kaleido não iniciou (falta o kaleido ou o Chrome/Chromium): {len(sem_graficos)} "
+              f"relatório(s) sem os gráficos.")
+    if not falhas:
+        return 0
+    print(f"⚠️ {len(falhas)} período(s) com erro:")
+    for (ano, mes), erro in sorted(falhas.items()):
+        print(f"- {mes:02d}/{ano}: {type(erro).__name__}: {erro}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""Análise de sensibilidade do índice aos pesos (docs/metodologia.md, Validação).
+
+Gera milhares de vetores de pesos (Monte Carlo em torno dos pesos oficiais
+ou grade regular no simplex), pontua todas as entidades com uma única
+multiplicação de matrizes e resume, por entidade, quanto a sua posição no
+ranking varia entre os cenários.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from app.metodologia import agregar, normalizar, vetor_pesos
+
+AMOSTRAGENS = ("monte_carlo", "grade")
+
+
+def amostrar_pesos(base, n=2000, metodo="monte_carlo", concentracao=50.0, passo=0.05, seed=0):
+    """Matriz (cenários, componentes) de pesos que somam 1.
+
+    - monte_carlo: n amostras de Dirichlet centradas em `base`; quanto maior
+      `concentracao`, mais perto dos pesos oficiais.
+    - grade: todas as combinações com pesos múltiplos de `passo` (n é ignorado).
+
+    A primeira linha é sempre o próprio `base`.
+    """
+    base = np.asarray(base, dtype="float64")
+    base = base / base.sum()
+    if metodo == "monte_carlo":
+        rng = np.random.default_rng(seed)
+        amostras = rng.dirichlet(np.maximum(base * concentracao, 1e-3), size=max(n - 1, 0))
+    elif metodo == "grade":
+        partes = int(round(1 / passo))
+        # Composições de `partes` em len(base) parcelas (stars and bars).
+        cortes = np.array(list(itertools.combinations(range(partes + len(base) - 1), len(base) - 1)))
+        limites = np.column_stack((np.full(len(cortes), -1), cortes, np.full(len(cortes), partes + len(base) - 1)))
+        amostras = (np.diff(limites, axis=1) - 1) / partes
+    else:
+        raise ValueError(f"Amostragem desconhecida: {metodo} (use {' ou '.join(AMOSTRAGENS)})")
+    return np.vstack((base, amostras))
+
+
+def posicoes(pontuacoes, grupos=None):
+    """Posição (1 = maior pontuação) de cada linha, por coluna de cenário.
+
+    Com `grupos`, a posição é contada dentro de cada grupo (ex.: ano).
+    Tudo é feito com um argsort sobre a matriz inteira.
+    """
+    pontos = np.asarray(pontuacoes, dtype="float64")
+    n = pontos.shape[0]
+    chave = -np.nan_to_num(pontos, nan=-np.inf)
+    if grupos is None:
+        codigos = np.zeros(n, dtype="int64")
+    else:
+        _, codigos = np.unique(np.asarray(grupos), return_inverse=True)
+    # Desloca cada grupo para uma faixa própria de valores: um único argsort
+    # ordena por grupo e, dentro dele, pela pontuação.
+    finitos = chave[np.isfinite(chave)]
+    amplitude = (finitos.max() - finitos.min() + 1.0) if finitos.size else 1.0
+    chave = np.where(np.isfinite(chave), chave, finitos.max() + 0.5 if finitos.size else 0.0)
+    chave = chave + codigos[:, None] * amplitude
+
+    ordem = np.argsort(chave, axis=0, kind="stable")
+    inicio_grupo = np.searchsorted(np.sort(codigos), codigos)
+    ranking = np.empty_like(ordem)
+    np.put_along_axis(ranking, ordem, np.arange(n)[:, None], axis=0)
+    return ranking - inicio_grupo[:, None] + 1
+
+
+def resumir(ranking, rotulos):
+    """Estatísticas de estabilidade da posição; a coluna 0 é o cenário base."""
+    base = ranking[:, 0]
+    df = pd.DataFrame(rotulos).reset_index(drop=True)
+    df["posicao_base"] = base
+    df["posicao_media"] = ranking.mean(axis=1)
+    df["desvio"] = ranking.std(axis=1)
+    df["melhor"] = ranking.min(axis=1)
+    df["pior"] = ranking.max(axis=1)
+    df["p05"], df["p95"] = np.percentile(ranking, [5, 95], axis=1)
+    df["prob_mesma_posicao"] = (ranking == base[:, None]).mean(axis=1)
+    return df
+
+
+def analisar_pilares(df, pesos_base, pilares, n=2000, metodo="monte_carlo", concentracao=50.0,
+                     passo=0.05, seed=0, grupo="year"):
+    """Sensibilidade do índice histórico: df tem as colunas de pilares, `grupo` e rótulos.
+
+    Pontuações = pilares @ pesosᵀ (entidades × cenários), divididas pela soma
+    dos pesos dos pilares presentes em cada linha — a mesma regra do índice
+    gravado (app/historico.calcular). Devolve (resumo por entidade, matriz de
+    pesos usada).
+    """
+    pesos = amostrar_pesos(vetor_pesos(pesos_base, pilares), n, metodo, concentracao, passo, seed)
+    matriz = df[list(pilares)].to_numpy(dtype="float64")
+    presente = ~np.isnan(matriz)
+    soma = np.where(presente, matriz, 0.0) @ pesos.T
+    peso_presente = presente @ pesos.T
+    pontuacoes = np.divide(soma, peso_presente, out=np.full(soma.shape, np.nan), where=peso_presente > 0)
+    ranking = posicoes(pontuacoes, df[grupo].to_numpy() if grupo else None)
+    resumo = resumir(ranking, df.drop(columns=list(pilares)))
+    ordem = [grupo, "posicao_base"] if grupo else ["posicao_base"]
+    return resumo.sort_values(ordem).reset_index(drop=True), pesos
+
+
+def analisar_componentes(cubo, paises, mes, pesos_base=None, normalizacao="minmax", n=2000,
+                         metodo="monte_carlo", concentracao=50.0, passo=0.05, seed=0):
+    """Sensibilidade do Indicador de Paz no mês de índice `mes` do cubo (país, mês, componente).
+
+    A normalização usa o cubo inteiro, como no cálculo oficial; todos os
+    cenários saem de uma única chamada a `agregar` com a matriz de pesos.
+    Devolve (resumo por país, matriz de pesos usada).
+    """
+    pesos = amostrar_pesos(vetor_pesos(pesos_base), n, metodo, concentracao, passo, seed)
+    pontuacoes = agregar(normalizar(cubo, normalizacao)[:, mes, :], pesos)
+    ranking = posicoes(pontuacoes)
+    resumo = resumir(ranking, pd.DataFrame({"country_code": paises}))
+    return resumo.sort_values("posicao_base").reset_index(drop=True), pesos
@@ -0,0 +1,99 @@
+"""Benchmark: marcadores Folium um a um (iterrows) x camada vetorizada.
+
+Gera N pontos sintéticos (194 países e escalas de Sóis por cidade) e mede,
+para cada abordagem, o tempo de montar o mapa + renderizar o HTML e o
+tamanho do HTML resultante:
+
+- antes:  o laço de pages/01_mapa_global.py (CircleMarker + Popup por linha,
+          cor e raio calculados em Python), dentro de um MarkerCluster;
+- depois: app.camadas.camada_circulos (cores/raios em NumPy, um único
+          FastMarkerCluster) e a variante GeoJSON sem agrupamento.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.camadas
+"""
+import time
+
+import branca.colormap as cm
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import MarkerCluster
+
+from app.camadas import camada_circulos, cores_degraus, raios
+
+TAMANHOS = (194, 5_000, 50_000)
+RAIO_MINIMO = 6
+
+
+def _dados(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "country_code": [f"C{i}" for i in range(n)],
+        "country_name": [f"Lugar {i}" for i in range(n)],
+        "latitude": rng.uniform(-60, 75, n),
+        "longitude": rng.uniform(-180, 180, n),
+        "paz_value": rng.uniform(0, 100, n),
+    })
+
+
+def _colormap(vmin, vmax):
+    colormap = cm.LinearColormap(['red', 'orange', 'yellow', 'lightgreen', 'green'], vmin=vmin, vmax=vmax)
+    return colormap.to_step(index=[vmin + (vmax - vmin) * q for q in (0, 0.25, 0.5, 0.75, 1)])
+
+
+def _antes(df):
+    vmin, vmax = float(df['paz_value'].min()), float(df['paz_value'].max())
+    colormap = _colormap(vmin, vmax)
+    m = folium.Map(location=[0, 0], zoom_start=2)
+    cluster = MarkerCluster(control=False).add_to(m)
+    for _, row in df.iterrows():
+        value = row['paz_value']
+        normalized = 0 if vmax == vmin else (value - vmin) / (vmax - vmin)
+        tooltip_html = f"<b>{row['country_name']}</b><br/>Valor: {value:.3f}<br/>Código: {row['country_code']}"
+        folium.CircleMarker(
+            location=[row['latitude'], row['longitude']],
+            radius=RAIO_MINIMO + int(normalized * RAIO_MINIMO * 3),
+            color=colormap(value),
+            fill=True,
+            fill_opacity=0.8,
+            popup=folium.Popup(tooltip_html, max_width=350),
+        ).add_to(cluster)
+    return m
+
+
+def _depois(df, agrupar=True):
+    vmin, vmax = float(df['paz_value'].min()), float(df['paz_value'].max())
+    m = folium.Map(location=[0, 0], zoom_start=2)
+    camada_circulos(
+        df['latitude'], df['longitude'],
+        cores_degraus(df['paz_value'], _colormap(vmin, vmax)),
+        raios(df['paz_value'], RAIO_MINIMO, vmin, vmax),
+        df['country_name'], df['paz_value'], df['country_code'],
+        agrupar=agrupar,
+    ).add_to(m)
+    return m
+
+
+def _medir(funcao, df):
+    inicio = time.perf_counter()
+    html = funcao(df).get_root().render()
+    return time.perf_counter() - inicio, len(html.encode("utf-8"))
+
+
+def main():
+    print(f"{'pontos':>8} {'abordagem':<22} {'tempo (s)':>10} {'HTML (MB)':>10}")
+    for n in TAMANHOS:
+        df = _dados(n)
+        for nome, funcao in (
+            ("iterrows + Popup", _antes),
+            ("FastMarkerCluster", _depois),
+            ("GeoJson", lambda d: _depois(d, agrupar=False)),
+        ):
+            segundos, tamanho = _medir(funcao, df)
+            print(f"{n:>8} {nome:<22} {segundos:>10.3f} {tamanho / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
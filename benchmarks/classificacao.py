@@ -0,0 +1,58 @@
+"""Benchmark de app.escala.classificar_paz.
+
+Mede `Series.apply(função escalar)` x `classificar_paz(series)` em 1 milhão
+de linhas. A conferência contra a escala oficial está em
+tests/test_escala.py.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.classificacao
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.escala import classificar_paz
+
+LINHAS = 1_000_000
+
+
+def _escalar_antiga(valor):
+    # Cópia da função que existia em cada página antes de app/escala.py.
+    if pd.isna(valor):
+        return "Sem dados"
+    if valor == 100:
+        return "Excelente"
+    elif 91 <= valor <= 99:
+        return "Bom"
+    elif 71 <= valor <= 90:
+        return "Médio"
+    elif 51 <= valor <= 70:
+        return "Baixo"
+    else:
+        return "Crítico"
+
+
+def medir():
+    rng = np.random.default_rng(1)
+    serie = pd.Series(rng.uniform(0, 100, LINHAS).round(0))
+    serie[rng.integers(0, LINHAS, LINHAS // 100)] = np.nan
+
+    inicio = time.perf_counter()
+    antes = serie.apply(_escalar_antiga)
+    t_antes = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    depois = classificar_paz(serie)
+    t_depois = time.perf_counter() - inicio
+
+    assert (antes == depois.astype(object)).all()
+    print(
+        f"{LINHAS} linhas: apply {t_antes * 1000:.0f} ms | vetorizado {t_depois * 1000:.1f} ms "
+        f"| {t_antes / t_depois:.0f}x"
+    )
+
+
+if __name__ == "__main__":
+    medir()
@@ -0,0 +1,97 @@
+"""Benchmark: pd.read_sql_query x cache Parquet (app/colunar.py) para Sóis.
+
+Copia paz.db para um diretório temporário, registra 1 milhão de Sóis
+sintéticos e mede:
+
+- carga completa: read_sql_query + pd.to_datetime x colunar.ler (exportação
+  fria e leitura com o cache já pronto), com memory_usage(deep=True);
+- um mês: carga completa filtrada em pandas x colunar.ler com filtro em
+  created_at (só os row groups do mês são lidos).
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.colunar
+"""
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app import colunar
+from app.banco import DB_PATH, migrar
+
+SOIS = 1_000_000
+VERSAO = ["benchmark"]
+
+
+def _popular(db_path):
+    rng = np.random.default_rng(0)
+    paises = np.array(["BRA", "USA", "FRA", "IND", "NGA", "JPN", "MEX", "ZAF"])
+    segundos = rng.integers(0, 3 * 365 * 86400, SOIS)
+    datas = (pd.Timestamp("2023-01-01") + pd.to_timedelta(np.sort(segundos), unit="s")).strftime("%Y-%m-%d %H:%M:%S")
+    conn = sqlite3.connect(db_path)
+    # Sem os triggers de contadores: aqui só interessa a leitura.
+    for (nome,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        conn.execute(f"DROP TRIGGER {nome}")
+    conn.executemany(
+        "INSERT INTO peacekeepers (country_code, city, latitude, longitude, created_at) VALUES (?, ?, ?, ?, ?)",
+        zip(paises[rng.integers(0, len(paises), SOIS)].tolist(), ["Cidade"] * SOIS,
+            rng.uniform(-60, 70, SOIS).tolist(), rng.uniform(-180, 180, SOIS).tolist(), datas.tolist()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def _mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "paz.db"
+        shutil.copy(DB_PATH, db_path)
+        migrar(db_path)
+        _popular(db_path)
+        conn = sqlite3.connect(db_path)
+
+        def sql():
+            df = pd.read_sql_query(
+                "SELECT country_code, city, latitude, longitude, created_at FROM peacekeepers", conn)
+            df["created_at"] = pd.to_datetime(df["created_at"])
+            return df
+
+        def parquet(filtros=None):
+            return colunar.ler("peacekeepers", conn, VERSAO, colunas=["country_code", "city", "latitude",
+                               "longitude", "created_at"], filtros=filtros, cache_dir=tmp)
+
+        antes, t_antes = _cronometrar(sql)
+        _, t_exportar = _cronometrar(parquet)
+        depois, t_depois = _cronometrar(parquet)
+        print(f"{len(antes):,} Sóis — carga completa:")
+        print(f"  read_sql_query + to_datetime: {t_antes:6.2f} s  {_mb(antes):7.1f} MB")
+        print(f"  Parquet (exportação fria):    {t_exportar:6.2f} s")
+        print(f"  Parquet (cache pronto):       {t_depois:6.2f} s  {_mb(depois):7.1f} MB")
+
+        mes = [("created_at", ">=", pd.Timestamp(2024, 6, 1)), ("created_at", "<", pd.Timestamp(2024, 7, 1))]
+        filtrado, t_pandas = _cronometrar(lambda: (lambda d: d[(d["created_at"] >= "2024-06-01")
+                                                               & (d["created_at"] < "2024-07-01")])(sql()))
+        pushdown, t_push = _cronometrar(lambda: parquet(mes))
+        assert len(filtrado) == len(pushdown)
+        print(f"Um mês ({len(pushdown):,} Sóis):")
+        print(f"  SQL completo + filtro pandas: {t_pandas:6.2f} s")
+        print(f"  Parquet com pushdown:         {t_push:6.3f} s")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
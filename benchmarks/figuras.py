@@ -0,0 +1,73 @@
+"""Benchmark: mapa global montado a cada rerun x figura cacheada em JSON.
+
+Para cada período de paz.db mede:
+
+- antes:  a montagem antiga da página (plotly.express + customdata com
+          np.stack + cópia dos traços de Sóis), seguida da serialização
+          que o st.plotly_chart faz;
+- depois: app.figuras.figura_mapa_global com o cache já quente (só
+          desserializa o JSON), seguida da mesma serialização.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.figuras
+"""
+import logging
+import statistics
+import time
+
+import numpy as np
+import plotly.express as px
+
+from app.dados import carregar_pacificadores, carregar_paises, carregar_periodo, carregar_periodos
+from app.escala import CORES, NIVEL_PAZ, classificar_paz
+from app.figuras import figura_mapa_global
+
+REPETICOES = 20
+
+
+def _mapa_antigo(ano, mes):
+    df_mapa = carregar_paises().merge(carregar_periodo(ano, mes), on="country_code", how="left")
+    df_mapa["nivel_paz"] = classificar_paz(df_mapa["indicator_value"])
+    pacificadores = carregar_pacificadores()
+    sois = pacificadores[(pacificadores["created_at"].dt.year == ano) & (pacificadores["created_at"].dt.month == mes)]
+
+    fig = px.scatter_geo(
+        df_mapa, lat="latitude", lon="longitude", hover_name="country_name", color="nivel_paz",
+        color_discrete_map=CORES, category_orders={"nivel_paz": list(NIVEL_PAZ.categories)},
+        projection="natural earth",
+    )
+    fig.update_traces(customdata=np.stack((df_mapa["indicator_value"], df_mapa["nivel_paz"]), axis=-1))
+    if not sois.empty:
+        fig_suns = px.scatter_geo(sois, lat="latitude", lon="longitude", projection="natural earth")
+        for trace in fig_suns.data:
+            fig.add_trace(trace)
+    fig.update_layout(height=750)
+    return fig
+
+
+def _medir(funcao, periodos):
+    tempos = []
+    for _ in range(REPETICOES):
+        for ano, mes in periodos:
+            inicio = time.perf_counter()
+            funcao(ano, mes).to_json()
+            tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main():
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    periodos = list(carregar_periodos()[["year", "month"]].itertuples(index=False, name=None))
+    for ano, mes in periodos:
+        figura_mapa_global(ano, mes)  # aquece o cache
+
+    antes = _medir(_mapa_antigo, periodos)
+    depois = _medir(figura_mapa_global, periodos)
+    print(f"{len(periodos)} período(s), {REPETICOES} repetições (mediana por rerun):")
+    print(f"  antes:  {antes * 1000:8.2f} ms")
+    print(f"  depois: {depois * 1000:8.2f} ms  ({antes / depois:.0f}x mais rápido)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: partida a frio do portal, importação antecipada x sob demanda.
+
+Para cada opção do menu de portal.py, roda um processo Python novo com
+`-X importtime` que desenha só aquela página (Streamlit em modo bare):
+
+- antes: como o portal antigo, importa no topo pandas, numpy, plotly.express
+  e a camada de dados e lê países, índices e Sóis antes do menu;
+- depois: como portal.py agora, paginas.render() importa só o módulo da
+  opção, cuja render() importa e lê apenas o que a página declarou.
+
+Mostra o tempo total do processo, a soma do tempo de importação e quais
+bibliotecas pesadas foram carregadas. As páginas leem o paz.db do app.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.importtime
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from app.paginas import PAGINAS
+
+RAIZ = Path(__file__).resolve().parent.parent
+REPETICOES = 5
+PESADAS = ("pandas", "pyarrow", "plotly.express", "folium", "reportlab")
+
+ANTES = """
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import numpy as np
+from app.dados import carregar_metricas, carregar_pacificadores, carregar_paises
+carregar_paises(); carregar_metricas(); carregar_pacificadores()
+import importlib
+importlib.import_module({modulo!r}).render()
+"""
+
+DEPOIS = """
+import streamlit as st
+from app import paginas
+paginas.render({nome!r})
+"""
+
+
+def _medir(script):
+    """(segundos do processo, soma de 'self' do importtime em s, bibliotecas pesadas carregadas)."""
+    ambiente = dict(os.environ, PYTHONPATH=str(RAIZ))
+    inicio = time.perf_counter()
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True, check=True,
+    )
+    total = time.perf_counter() - inicio
+    importacao, modulos = 0, set()
+    for linha in saida.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)", linha)
+        if m:
+            importacao += int(m.group(1))
+            modulos.add(m.group(2))
+    return total, importacao / 1e6, [nome for nome in PESADAS if nome in modulos]
+
+
+def _melhor(script):
+    medidas = [_medir(script) for _ in range(REPETICOES)]
+    return min(medidas, key=lambda m: m[0])
+
+
+def main():
+    print(f"{'opção':26s} {'antes':>16s} {'depois':>16s}   bibliotecas (depois)")
+    print(f"{'':26s} {'total / import':>16s} {'total / import':>16s}")
+    for nome, pagina in PAGINAS.items():
+        opcao, modulo = pagina["titulo"], pagina["modulo"]
+        t_antes, i_antes, _ = _melhor(ANTES.format(modulo=modulo))
+        t_depois, i_depois, libs = _melhor(DEPOIS.format(nome=nome))
+        print(f"{opcao:26s} {t_antes:6.2f} s / {i_antes:4.2f} s {t_depois:6.2f} s / {i_depois:4.2f} s   "
+              f"{', '.join(libs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: fatias da matriz país × mês x filtro + groupby no DataFrame longo.
+
+Copia paz.db para um diretório temporário, preenche country_metrics com
+~1 milhão de linhas sintéticas (todos os países, muitos meses), como
+benchmarks/memoria.py, e compara, sobre o DataFrame compacto de
+app/dados.py e sobre a matriz de app/matriz.py aberta com memory map:
+
+- os valores de um mês (base do ranking);
+- o histórico de um país.
+
+Mede também a montagem completa da matriz e a atualização incremental
+depois de alterar um único mês.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.matriz
+"""
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from app import matriz
+from app.banco import DB_PATH, identidade, migrar
+from app.dados import compactar
+from benchmarks.memoria import _cronometrar, _popular
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "paz.db"
+        shutil.copy(DB_PATH, db_path)
+        migrar(db_path)
+        codigos = _popular(db_path)
+        conn = sqlite3.connect(db_path)
+        longo = compactar(pd.read_sql_query(
+            "SELECT country_code, year, month, indicator_value FROM country_metrics", conn,
+        ), pd.CategoricalDtype(codigos))
+
+        diretorio = Path(tmp) / "matriz"
+        banco = identidade(db_path)
+        completa = _cronometrar(lambda: matriz.gravar(matriz.de_banco(conn), banco, 0, diretorio), repeticoes=1)
+        m = matriz.abrir(banco, 0, diretorio)
+        print(f"{len(longo):,} linhas → matriz {m.valores.shape[0]} × {m.valores.shape[1]} "
+              f"({m.valores.nbytes / 1e6:.1f} MB float32)")
+
+        ano, mes = int(longo["year"].iloc[len(longo) // 2]), int(longo["month"].iloc[len(longo) // 2])
+        periodo = ano * 12 + mes - 1
+        pais = codigos[len(codigos) // 2]
+        tempos = {
+            "valores de um mês": (
+                lambda: longo.loc[longo["periodo"] == periodo, ["country_code", "indicator_value"]],
+                lambda: m.mes(ano, mes),
+            ),
+            "histórico de um país": (
+                lambda: longo.loc[longo["country_code"] == pais, ["periodo", "indicator_value"]],
+                lambda: m.pais(pais),
+            ),
+        }
+        for nome, (velho, novo) in tempos.items():
+            print(f"{nome:24s} {_cronometrar(velho) * 1000:9.3f} ms → {_cronometrar(novo) * 1000:9.3f} ms")
+
+        # Triggers apagados por _popular: marca o mês alterado à mão.
+        conn.execute("UPDATE country_metrics SET indicator_value = 50 WHERE year = ? AND month = ?", (ano, mes))
+        conn.execute("INSERT INTO destinos_derivados (nome, versao) VALUES ('matriz', 0) "
+                     "ON CONFLICT (nome) DO UPDATE SET versao = 0")
+        conn.execute("DELETE FROM periodos_pendentes")
+        conn.execute("INSERT INTO periodos_pendentes (destino, year, month) VALUES ('matriz', ?, ?)", (ano, mes))
+        conn.commit()
+        incremental = _cronometrar(lambda: matriz.atualizar_matriz(conn, diretorio), repeticoes=1)
+        conn.close()
+        print(f"{'montagem completa':24s} {completa * 1000:9.1f} ms")
+        print(f"{'atualização de um mês':24s} {incremental * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
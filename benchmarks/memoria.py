@@ -0,0 +1,100 @@
+"""Benchmark: memória dos DataFrames antes x depois do formato compacto.
+
+Copia paz.db para um diretório temporário, preenche country_metrics com
+~1 milhão de linhas sintéticas (todos os países, muitos meses) e compara o
+DataFrame como pd.read_sql_query o devolve (country_code em strings, inteiros
+e floats de 64 bits) com o mesmo DataFrame depois de `dados.compactar`
+(dicionário categórico compartilhado, int16/int8, chave de período int32,
+float32): memory_usage(deep=True) por coluna e o tempo de um merge com
+country_metadata e de uma média mensal.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.memoria
+"""
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.banco import DB_PATH, migrar
+from app.dados import compactar
+
+MESES = 5000
+
+
+def _popular(db_path):
+    conn = sqlite3.connect(db_path)
+    # Sem os triggers de ranking/histórico: aqui só interessa a leitura.
+    for (nome,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        conn.execute(f"DROP TRIGGER {nome}")
+    codigos = [c for (c,) in conn.execute("SELECT country_code FROM country_metadata ORDER BY country_code")]
+    rng = np.random.default_rng(0)
+    conn.execute("DELETE FROM country_metrics")
+    conn.executemany(
+        "INSERT INTO country_metrics (country_code, year, month, indicator_value) VALUES (?, ?, ?, ?)",
+        ((codigo, 1600 + k // 12, k % 12 + 1, float(v))
+         for k in range(MESES) for codigo, v in zip(codigos, rng.uniform(0, 100, len(codigos)))),
+    )
+    conn.commit()
+    conn.close()
+    return codigos
+
+
+def _cronometrar(funcao, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _mb(df):
+    return df.memory_usage(deep=True, index=False) / 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "paz.db"
+        shutil.copy(DB_PATH, db_path)
+        migrar(db_path)
+        codigos = _popular(db_path)
+        conn = sqlite3.connect(db_path)
+        antes = pd.read_sql_query(
+            "SELECT country_code, year, month, indicator_value FROM country_metrics", conn,
+            dtype={"country_code": "object", "year": "int64", "month": "int64", "indicator_value": "float64"})
+        paises_antes = pd.read_sql_query(
+            "SELECT country_code, country_name FROM country_metadata", conn, dtype="object")
+        conn.close()
+
+    dicionario = pd.CategoricalDtype(codigos)
+    depois = compactar(antes.copy(), dicionario)
+    paises_depois = compactar(paises_antes.copy(), dicionario)
+
+    por_coluna = pd.DataFrame({"antes (MB)": _mb(antes), "depois (MB)": _mb(depois)}).reindex(depois.columns)
+    por_coluna.loc["total"] = por_coluna.sum()
+    print(f"{len(antes):,} linhas de country_metrics — memory_usage(deep=True):")
+    print(por_coluna.round(1).fillna("—").to_string())
+
+    antes["ano_mes"] = antes["year"].astype(str) + "-" + antes["month"].astype(str).str.zfill(2)
+    tempos = {
+        "merge com country_metadata": (
+            lambda: antes.merge(paises_antes, on="country_code", how="left"),
+            lambda: depois.merge(paises_depois, on="country_code", how="left"),
+        ),
+        "média mensal global": (
+            lambda: antes.groupby("ano_mes")["indicator_value"].mean(),
+            lambda: depois.groupby("periodo")["indicator_value"].mean(),
+        ),
+    }
+    for nome, (velho, novo) in tempos.items():
+        print(f"{nome:28s} {_cronometrar(velho) * 1000:8.1f} ms → {_cronometrar(novo) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
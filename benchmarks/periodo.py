@@ -0,0 +1,93 @@
+"""Benchmark: filtro de período em pandas x consulta SQL indexada.
+
+Copia paz.db para um diretório temporário, multiplica country_metrics em
+10x/100x/1000x (mais meses para cada país) e mede, para um período:
+
+- antes:  lê a tabela inteira e filtra por year/month em pandas;
+- depois: SELECT ... WHERE year = ? AND month = ? usando idx_metrics_periodo.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.periodo
+"""
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app.banco import DB_PATH, migrar
+
+FATORES = (10, 100, 1000)
+REPETICOES = 5
+
+
+def _popular(db_path, fator):
+    conn = sqlite3.connect(db_path)
+    base = conn.execute(
+        "SELECT country_code, year, month, indicator_value FROM country_metrics"
+    ).fetchall()
+    conn.execute("DELETE FROM country_metrics")
+    linhas = []
+    for passo in range(fator):
+        for code, year, month, value in base:
+            periodo = year * 12 + (month - 1) - passo
+            linhas.append((code, periodo // 12, periodo % 12 + 1, value))
+    conn.executemany(
+        "INSERT INTO country_metrics (country_code, year, month, indicator_value) VALUES (?, ?, ?, ?)",
+        linhas,
+    )
+    conn.commit()
+    ano, mes = linhas[len(linhas) // 2][1:3]
+    conn.close()
+    return len(linhas), ano, mes
+
+
+def _antes(db_path, ano, mes):
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query("SELECT country_code, year, month, indicator_value FROM country_metrics", conn)
+    conn.close()
+    return df[(df["year"] == ano) & (df["month"] == mes)]
+
+
+def _depois(db_path, ano, mes):
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query(
+        "SELECT country_code, year, month, indicator_value FROM country_metrics WHERE year = ? AND month = ?",
+        conn,
+        params=(ano, mes),
+    )
+    conn.close()
+    return df
+
+
+def _medir(funcao, *args):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, len(resultado)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for fator in FATORES:
+            db_path = Path(tmp) / f"paz_{fator}x.db"
+            shutil.copy(DB_PATH, db_path)
+            total, ano, mes = _popular(db_path, fator)
+            migrar(db_path)
+            ms_antes, n_antes = _medir(_antes, db_path, ano, mes)
+            ms_depois, n_depois = _medir(_depois, db_path, ano, mes)
+            assert n_antes == n_depois
+            print(
+                f"{fator:>5}x ({total:>8} linhas, {n_depois} no período): "
+                f"antes {ms_antes:8.1f} ms | depois {ms_depois:6.1f} ms | {ms_antes / ms_depois:6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,81 +2,100 @@
 # Página Streamlit: Mapa Global Interativo - Portal da Paz Viva
 # Requisitos: streamlit, folium, streamlit-folium, pandas, branca
 
-import sqlite3
+from collections import OrderedDict
 from typing import Optional
 
+import threading
+import time
+import warnings
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 import folium
-from folium.plugins import MarkerCluster, HeatMap
+from folium.plugins import HeatMap
 from streamlit_folium import st_folium
 import branca.colormap as cm
 
+from app.camadas import camada_circulos, cores_degraus, raios
+from app.dados import (
+    carregar_agrupamentos, carregar_matriz, carregar_paises, carregar_periodos, carregar_sois_na_caixa,
+    dicionario_paises, versao_tabela,
+)
+from app.grade import MAX_PONTOS, nivel_para_zoom, raios_agrupamento
+
 st.set_page_config(page_title="Mapa Global - Portal da Paz Viva", layout="wide")
 
-DB_PATH = "app/data/database/paz.db"
+# From this zoom on, the Sóis layer shows individual points instead of clusters
+ZOOM_SOIS_INDIVIDUAIS = 9
+
+# Bound and lifetime of the aggregation cache (one entry per data version + selection)
+MAX_AGREGACOES = 32
+TTL_AGREGACOES = 600
+
 
 # ---------- Utilitários ----------
-@st.cache_data(ttl=600)
-def load_tables(db_path: str = DB_PATH):
-    conn = sqlite3.connect(db_path)
+def load_tables():
+    """Tabelas via camada compartilhada (app/dados.py), já cacheadas por versão."""
     try:
-        country_meta = pd.read_sql_query("SELECT * FROM country_metadata", conn)
+        country_meta = carregar_paises()
     except Exception:
         country_meta = pd.DataFrame()
 
     try:
-        country_metrics = pd.read_sql_query("SELECT * FROM country_metrics", conn)
+        country_periods = carregar_periodos()
     except Exception:
-        country_metrics = pd.DataFrame()
+        country_periods = pd.DataFrame()
+
+    return country_meta, country_periods
 
-    conn.close()
-    return country_meta, country_metrics
 
+def versoes_dados():
+    """Cheap cache token: versions of the tables read by the aggregation (app/dados.py)."""
+    return tuple(versao_tabela(t) for t in ("country_metadata", "country_metrics"))
 
-@st.cache_data(ttl=600)
-def prepare_aggregated(df_meta: pd.DataFrame, df_metrics: pd.DataFrame, year: Optional[int], month: Optional[int], aggregation: str):
+
+def prepare_aggregated(versoes: tuple, year: Optional[int], month: Optional[int], aggregation: str):
     """Join metadata and metrics and aggregate per country according to selection.
     aggregation: 'latest' | 'mean' | 'median' | 'sum'
     If year/month are None, uses latest available in the metrics table.
+
+    Cached by `agregar`, keyed only by `versoes` plus the selection: the tables
+    themselves come from the shared data layer instead of being hashed row by row.
     """
-    if df_metrics.empty:
+    df_meta, periods = load_tables()
+    if periods.empty:
         return pd.DataFrame()
 
-    metrics = df_metrics.copy()
-
     # If year/month not provided, pick latest period
     if year is None:
-        year = int(metrics['year'].max())
+        year = int(periods['year'].max())
     if month is None:
         # pick latest month for that year
-        sub = metrics[metrics['year'] == year]
+        sub = periods[periods['year'] == year]
         if not sub.empty:
             month = int(sub['month'].max())
         else:
-            month = int(metrics['month'].max())
+            month = int(periods['month'].max())
 
-    # Filter to selected year/month for 'latest' view; for 'mean' or others consider year range
+    # Country × month matrix (app/matriz.py): the selected month is one column,
+    # the selected year a 12-column slice reduced along the months axis
+    matriz = carregar_matriz()
     if aggregation == 'latest':
-        sel = metrics[(metrics['year'] == year) & (metrics['month'] == month)]
-        agg = sel.groupby('country_code', as_index=False)['indicator_value'].mean()
+        values = matriz.mes(year, month)
     else:
-        # aggregate across selected year (if provided) otherwise all time
-        if year is not None:
-            sel = metrics[metrics['year'] == year]
-        else:
-            sel = metrics
-        if sel.empty:
-            agg = pd.DataFrame(columns=['country_code', 'indicator_value'])
-        else:
-            if aggregation == 'mean':
-                agg = sel.groupby('country_code', as_index=False)['indicator_value'].mean()
-            elif aggregation == 'median':
-                agg = sel.groupby('country_code', as_index=False)['indicator_value'].median()
-            elif aggregation == 'sum':
-                agg = sel.groupby('country_code', as_index=False)['indicator_value'].sum()
-            else:
-                agg = sel.groupby('country_code', as_index=False)['indicator_value'].mean()
+        sel = matriz.intervalo(year * 12, year * 12 + 11)
+        reduce = {'mean': np.nanmean, 'median': np.nanmedian, 'sum': np.nansum}.get(aggregation, np.nanmean)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            values = reduce(sel, axis=1)
+        # countries without any value in the year are left out, as with groupby
+        values = np.where(np.isnan(sel).all(axis=1), np.nan, values)
+
+    agg = pd.DataFrame({
+        'country_code': pd.Categorical(matriz.paises, dtype=dicionario_paises()),
+        'indicator_value': values,
+    }).dropna(subset=['indicator_value'])
 
     # Join with metadata
     if df_meta.empty:
@@ -92,6 +111,48 @@ def prepare_aggregated(df_meta: pd.DataFrame, df_metrics: pd.DataFrame, year: Op
     return merged
 
 
+@st.cache_resource(show_spinner=False)
+def _cache_agregacoes():
+    """Lock + {key: (DataFrame, bytes, insertion time)} in LRU order: the page's aggregation cache.
+
+    Shared by every session (cache_resource), so all access goes through the lock.
+    """
+    return threading.Lock(), OrderedDict()
+
+
+def _expirar(cache, agora, versoes):
+    """Drop entries older than the TTL (counted from insertion) or from other data versions."""
+    for chave in [c for c, (_, _, inicio) in cache.items() if agora - inicio >= TTL_AGREGACOES or c[0] != versoes]:
+        del cache[chave]
+
+
+def agregar(year: Optional[int], month: Optional[int], aggregation: str) -> pd.DataFrame:
+    """prepare_aggregated through the page's bounded cache; the DataFrame is shared, read it only."""
+    chave = (versoes_dados(), year, month, aggregation)
+    trava, cache = _cache_agregacoes()
+    with trava:
+        _expirar(cache, time.monotonic(), chave[0])
+        if chave in cache:
+            cache.move_to_end(chave)
+            return cache[chave][0]
+    # Computed outside the lock, so other sessions' hits don't wait for it
+    df = prepare_aggregated(*chave)
+    with trava:
+        cache[chave] = (df, int(df.memory_usage(deep=True).sum()), time.monotonic())
+        cache.move_to_end(chave)
+        while len(cache) > MAX_AGREGACOES:
+            cache.popitem(last=False)
+    return df
+
+
+def memoria_agregacoes():
+    """(entries, MB) held by the aggregation cache."""
+    trava, cache = _cache_agregacoes()
+    with trava:
+        _expirar(cache, time.monotonic(), versoes_dados())
+        return len(cache), sum(bytes_ for _, bytes_, _ in cache.values()) / 1e6
+
+
 # ---------- UI ----------
 st.title("Mapa Global — Portal da Paz Viva")
 st.markdown(
@@ -99,9 +160,9 @@ st.markdown(
 )
 
 # Load data
-country_meta, country_metrics = load_tables()
+country_meta, country_periods = load_tables()
 
-if country_metrics.empty or country_meta.empty:
+if country_periods.empty or country_meta.empty:
     st.warning("Os dados não foram encontrados ou estão incompletos. Verifique `app/data/database/paz.db` e as tabelas 'country_metadata' e 'country_metrics'.")
     st.stop()
 
@@ -109,8 +170,8 @@ if country_metrics.empty or country_meta.empty:
 with st.sidebar:
     st.header("Filtros")
 
-    years = sorted(country_metrics['year'].dropna().unique().astype(int).tolist())
-    months = sorted(country_metrics['month'].dropna().unique().astype(int).tolist())
+    years = sorted(country_periods['year'].dropna().unique().astype(int).tolist())
+    months = sorted(country_periods['month'].dropna().unique().astype(int).tolist())
 
     default_year = years[-1] if years else None
     default_month = months[-1] if months else None
@@ -122,13 +183,16 @@ with st.sidebar:
 
     show_heatmap = st.checkbox("Exibir Heatmap", value=True)
     show_clusters = st.checkbox("Agrupar marcadores (MarkerCluster)", value=True)
+    show_suns = st.checkbox("Exibir Sóis da Paz", value=False)
     min_radius = st.slider("Raio mínimo dos círculos", 2, 20, 6)
 
     st.markdown("---")
     st.markdown("**Exportar dados**")
 
 # ---------- Prepare data for map ----------
-agg_df = prepare_aggregated(country_meta, country_metrics, year, month, aggregation)
+agg_df = agregar(year, month, aggregation)
+entradas, megabytes = memoria_agregacoes()
+st.sidebar.caption(f"Cache de agregações: {entradas}/{MAX_AGREGACOES} entradas, {megabytes:.2f} MB")
 if agg_df.empty:
     st.info("Nenhum dado disponível para a seleção. Tente outro ano/mês.")
     st.stop()
@@ -145,6 +209,11 @@ colormap = colormap.to_step(index=[vmin, vmin + (vmax - vmin) * 0.25, vmin + (vm
 center_lat = agg_df['latitude'].mean()
 center_lon = agg_df['longitude'].mean()
 
+# zoom/bounds from the previous rerun (st_folium keeps them under its key)
+viewport = st.session_state.get('mapa_paz') or {}
+map_zoom = viewport.get('zoom') or 2
+map_center = (viewport['center']['lat'], viewport['center']['lng']) if viewport.get('center') else None
+
 m = folium.Map(location=[center_lat, center_lon], zoom_start=2, tiles='CartoDB positron')
 
 # Heatmap layer
@@ -152,37 +221,55 @@ if show_heatmap:
     heat_data = agg_df[['latitude', 'longitude', 'paz_value']].values.tolist()
     HeatMap(heat_data, radius=25, blur=15, max_zoom=6).add_to(m)
 
-# Marker cluster
-if show_clusters:
-    cluster = MarkerCluster(name='Países', control=False).add_to(m)
-
-# Add circle markers
-for _, row in agg_df.iterrows():
-    lat = row['latitude']
-    lon = row['longitude']
-    country = row.get('country_name') or row.get('country_code')
-    value = row['paz_value']
-
-    color = colormap(value)
-    # size scaled between min_radius and min_radius*4
-    normalized = 0 if vmax == vmin else (value - vmin) / (vmax - vmin)
-    radius = min_radius + int(normalized * min_radius * 3)
-
-    tooltip_html = f"<b>{country}</b><br/>Valor: {value:.3f}<br/>Código: {row.get('country_code', '')}"
-
-    circle = folium.CircleMarker(
-        location=[lat, lon],
-        radius=radius,
-        color=color,
-        fill=True,
-        fill_opacity=0.8,
-        popup=folium.Popup(tooltip_html, max_width=350)
-    )
-
-    if show_clusters:
-        circle.add_to(cluster)
-    else:
-        circle.add_to(m)
+# Circle markers: colors and radii for all countries at once (app/camadas.py),
+# shipped as a single layer instead of one CircleMarker + Popup per row
+circulos = camada_circulos(
+    agg_df['latitude'],
+    agg_df['longitude'],
+    cores_degraus(agg_df['paz_value'], colormap),
+    raios(agg_df['paz_value'], min_radius, vmin, vmax),
+    agg_df['country_name'].fillna(agg_df['country_code']),
+    agg_df['paz_value'],
+    agg_df['country_code'],
+    agrupar=show_clusters,
+)
+circulos.add_to(m)
+
+# Sóis da Paz, pre-aggregated per grid cell for the current zoom/viewport
+# (app/grade.py): at most MAX_PONTOS points, however many Sóis are registered
+if show_suns:
+    caixa = None
+    if viewport.get('bounds'):
+        sw, ne = viewport['bounds']['_southWest'], viewport['bounds']['_northEast']
+        caixa = (sw['lat'], sw['lng'], ne['lat'], ne['lng'])
+    # zoomed in far enough: the individual Sóis in the viewport (geohash index)
+    points = None
+    if caixa is not None and map_zoom >= ZOOM_SOIS_INDIVIDUAIS:
+        points = carregar_sois_na_caixa(caixa, year, month)
+        if len(points) > MAX_PONTOS:
+            points = None
+    if points is not None and not points.empty:
+        camada_circulos(
+            points['latitude'],
+            points['longitude'],
+            np.full(len(points), 'gold'),
+            np.full(len(points), 6),
+            points['city'].fillna(points['country_code']).fillna('☀️'),
+            codigos=points['country_code'].fillna(''),
+            agrupar=True,
+            nome='☀️ Sóis da Paz',
+        ).add_to(m)
+    suns = carregar_agrupamentos(nivel_para_zoom(map_zoom), year, month, caixa) if points is None else None
+    if suns is not None and not suns.empty:
+        camada_circulos(
+            suns['latitude'],
+            suns['longitude'],
+            np.full(len(suns), 'gold'),
+            raios_agrupamento(suns['total']),
+            '☀️ ' + suns['total'].astype(str) + ' Sóis',
+            agrupar=False,
+            nome='☀️ Sóis da Paz',
+        ).add_to(m)
 
 # Add colormap as legend
 colormap.caption = 'Indicador de Paz Viva'
@@ -196,7 +283,10 @@ left_col, right_col = st.columns((2, 1))
 
 with left_col:
     st.subheader('Mapa interativo')
-    st_data = st_folium(m, width="100%", height=700)
+    st_data = st_folium(
+        m, width="100%", height=700, key='mapa_paz',
+        zoom=map_zoom, center=map_center, returned_objects=['zoom', 'bounds', 'center'],
+    )
 
 with right_col:
     st.subheader('Resumo')
@@ -48,4 +48,4 @@ respeitando integralmente a privacidade individual.
 # REDIRECIONAMENTO PARA O MAPA
 # =========================
 
-st.switch_page("pages/04_mapa_pacificadores.py")
+st.switch_page("pages/01_mapa_global.py")
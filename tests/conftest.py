@@ -0,0 +1,51 @@
+"""Fixtures dos testes: cada teste trabalha numa cópia migrada de paz.db.
+
+    python -m pytest -q
+"""
+import functools
+import shutil
+
+import pytest
+
+from app import derivados, matriz
+from app.banco import DB_PATH, conectar, migrar
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    """Conexão de escrita numa cópia de paz.db com todas as migrações aplicadas."""
+    db_path = tmp_path / "paz.db"
+    shutil.copy(DB_PATH, db_path)
+    migrar(db_path)
+    # A matriz .npy da cópia vai para o diretório do teste, não para o cache do app.
+    monkeypatch.setitem(derivados.ATUALIZADORES, "matriz",
+                        functools.partial(matriz.atualizar_matriz, diretorio=tmp_path / "matriz"))
+    conexao = conectar(db_path)
+    derivados.atualizar(conexao)
+    yield conexao
+    conexao.close()
+
+
+SOIS = [
+    # country_code, city, latitude, longitude, created_at
+    ("BRA", "Recife", -8.05, -34.9, "2026-01-03 10:00:00"),
+    ("BRA", "Recife", -8.06, -34.88, "2026-01-20 18:30:00"),
+    ("BRA", "Manaus", -3.1, -60.02, "2026-02-01 00:00:00"),
+    ("PRT", "Lisboa", 38.72, -9.14, "2026-01-15 12:00:00"),
+    ("JPN", "Tóquio", 35.68, 139.69, "2026-03-31 23:59:59"),
+    ("NZL", "Auckland", -36.85, 174.76, "2026-03-01 08:00:00"),
+    (None, None, 0.0, 0.0, "2026-02-10 09:00:00"),
+    ("ARG", "Sem coordenadas", None, None, "2026-02-11 09:00:00"),
+    ("FJI", "Antimeridiano", -17.0, 180.0, "2026-02-12 09:00:00"),
+]
+
+
+@pytest.fixture
+def conn_sois(conn):
+    """`conn` com os Sóis de SOIS: sem país, sem coordenadas e no antimeridiano."""
+    with conn:
+        conn.executemany(
+            "INSERT INTO peacekeepers (country_code, city, latitude, longitude, created_at) VALUES (?, ?, ?, ?, ?)",
+            SOIS,
+        )
+    return conn
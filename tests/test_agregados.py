@@ -0,0 +1,89 @@
+"""metricas_agregadas (mês, trimestre e ano; mundo e regiões), refeita por
+app/agregados.py a partir dos meses pendentes, conferida contra o groupby em
+pandas de country_metrics."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import agregados, derivados
+from app.regioes import GLOBAL, SEM_REGIAO
+
+CHAVE = ["escala", "regiao", "year", "month"]
+
+
+def _esperado(conn):
+    df = pd.read_sql_query(
+        "SELECT c.year, c.month, c.indicator_value AS v, r.region FROM country_metrics c "
+        "LEFT JOIN regioes_paises r ON r.country_code = c.country_code",
+        conn,
+    )
+    df = pd.concat([df.assign(regiao=GLOBAL), df.assign(regiao=df["region"].fillna(SEM_REGIAO))])
+    partes = []
+    for escala, inicio in (("mes", df["month"]), ("trimestre", (df["month"] - 1) // 3 * 3 + 1),
+                           ("ano", pd.Series(1, index=df.index))):
+        g = df.assign(month=inicio).groupby(["regiao", "year", "month"])["v"]
+        partes.append(g.agg(n="count", media="mean", desvio="std", minimo="min", maximo="max")
+                      .reset_index().assign(escala=escala))
+    return pd.concat(partes).sort_values(CHAVE).reset_index(drop=True)
+
+
+def _conferir(conn):
+    derivados.atualizar(conn)
+    gravado = agregados.estatisticas(pd.read_sql_query("SELECT * FROM metricas_agregadas", conn))
+    esperado = _esperado(conn)
+    colunas = CHAVE + ["n", "media", "desvio", "minimo", "maximo"]
+    pd.testing.assert_frame_equal(gravado.sort_values(CHAVE).reset_index(drop=True)[colunas],
+                                  esperado[colunas], check_dtype=False)
+    assert not conn.execute("SELECT COUNT(*) FROM periodos_pendentes WHERE destino = 'agregados'").fetchone()[0]
+
+
+def _inserir_mes(conn, ano, mes, paises, seed):
+    valores = np.random.default_rng(seed).uniform(0, 100, len(paises))
+    with conn:
+        conn.executemany(
+            "INSERT INTO country_metrics (country_code, year, month, indicator_value) VALUES (?, ?, ?, ?)",
+            [(p, ano, mes, v) for p, v in zip(paises, valores.tolist())],
+        )
+
+
+@pytest.fixture
+def conn_meses(conn):
+    paises = [c for (c,) in conn.execute("SELECT DISTINCT country_code FROM country_metrics ORDER BY 1")]
+    # Trimestres incompletos e um maio só com um país sem região (n = 1, desvio NaN).
+    for mes, seed in ((1, 1), (2, 2), (4, 3), (12, 4)):
+        _inserir_mes(conn, 2026, mes, paises[::mes], seed)
+    with conn:
+        conn.execute("INSERT INTO country_metrics (country_code, year, month, indicator_value) "
+                     "VALUES ('XXX', 2026, 5, 42)")
+    return conn
+
+
+def test_insercao(conn_meses):
+    _conferir(conn_meses)
+
+
+def test_alteracao_e_remocao(conn_meses):
+    with conn_meses:
+        conn_meses.execute("UPDATE country_metrics SET indicator_value = 100 - indicator_value "
+                           "WHERE year = 2026 AND month = 2")
+        conn_meses.execute("DELETE FROM country_metrics WHERE year = 2026 AND month IN (4, 5)")
+    _conferir(conn_meses)
+    # Trimestre que ficou sem nenhum mês sai da tabela.
+    assert not conn_meses.execute("SELECT COUNT(*) FROM metricas_agregadas "
+                                  "WHERE escala = 'trimestre' AND year = 2026 AND month = 4").fetchone()[0]
+
+
+def test_recalcular(conn_meses):
+    derivados.atualizar(conn_meses)
+    antes = pd.read_sql_query("SELECT * FROM metricas_agregadas ORDER BY escala, regiao, year, month", conn_meses)
+    assert agregados.recalcular(conn_meses) == conn_meses.execute(
+        "SELECT COUNT(*) FROM (SELECT DISTINCT year, month FROM country_metrics)").fetchone()[0]
+    depois = pd.read_sql_query("SELECT * FROM metricas_agregadas ORDER BY escala, regiao, year, month", conn_meses)
+    pd.testing.assert_frame_equal(depois, antes)
+
+
+def test_estatisticas():
+    df = agregados.estatisticas(pd.DataFrame({"n": [3, 1], "soma": [6.0, 5.0], "soma_quadrados": [14.0, 25.0]}))
+    np.testing.assert_allclose(df["media"], [2.0, 5.0])
+    assert df["desvio"].iloc[0] == pytest.approx(1.0)
+    assert np.isnan(df["desvio"].iloc[1])
@@ -0,0 +1,54 @@
+"""LTTB de app/amostragem.py conferido contra a versão em Python puro do
+algoritmo original (Steinarsson, 2013)."""
+import numpy as np
+import pytest
+
+from app.amostragem import lttb
+
+
+def _borda(k, n, limite):
+    # floor(k * (n - 2) / (limite - 2)) + 1, sem erro de ponto flutuante.
+    return k * (n - 2) // (limite - 2) + 1
+
+
+def _lttb_referencia(x, y, limite):
+    n = len(x)
+    if limite >= n or limite < 3:
+        return list(range(n))
+    escolhidos, a = [0], 0
+    for i in range(limite - 2):
+        inicio_media, fim_media = _borda(i + 1, n, limite), min(_borda(i + 2, n, limite), n)
+        mx = sum(x[inicio_media:fim_media]) / (fim_media - inicio_media)
+        my = sum(y[inicio_media:fim_media]) / (fim_media - inicio_media)
+        melhor, maior = None, -1.0
+        for j in range(_borda(i, n, limite), _borda(i + 1, n, limite)):
+            area = abs((x[a] - mx) * (y[j] - y[a]) - (x[a] - x[j]) * (my - y[a]))
+            if area > maior:
+                melhor, maior = j, area
+        escolhidos.append(melhor)
+        a = melhor
+    return escolhidos + [n - 1]
+
+
+@pytest.mark.parametrize("n, limite", [(1000, 100), (1000, 3), (101, 50), (500, 499), (37, 7)])
+def test_igual_a_referencia(n, limite):
+    rng = np.random.default_rng(n + limite)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n))
+    y = np.cumsum(rng.normal(size=n))
+    escolhidos = lttb(x, y, limite)
+    assert escolhidos.tolist() == _lttb_referencia(x.tolist(), y.tolist(), limite)
+    assert len(escolhidos) == limite and (np.diff(escolhidos) > 0).all()
+
+
+@pytest.mark.parametrize("limite", [10, 2, 0])
+def test_serie_curta_ou_limite_pequeno(limite):
+    assert lttb(np.arange(10), np.zeros(10), limite).tolist() == list(range(10))
+
+
+def test_pico_preservado():
+    x = np.arange(10_000)
+    y = np.zeros(10_000)
+    y[6_123] = 50.0
+    y[2_500] = -30.0
+    escolhidos = lttb(x, y, 200)
+    assert {0, 2_500, 6_123, 9_999} <= set(escolhidos.tolist())
@@ -0,0 +1,57 @@
+"""suns_por_pais e suns_por_mes, mantidos pelos triggers de peacekeepers,
+conferidos contra o recálculo a partir das linhas brutas."""
+import pandas as pd
+import pytest
+
+from app import contadores
+
+
+def _ordenada(conn, sql, chaves):
+    return pd.read_sql_query(sql, conn).sort_values(list(chaves)).reset_index(drop=True)
+
+
+@pytest.fixture(params=["suns_por_pais", "suns_por_mes"])
+def tabela(request):
+    return request.param
+
+
+def _conferir(conn, tabela):
+    chaves, valores, recalculo = contadores._RECALCULO[tabela]
+    pd.testing.assert_frame_equal(
+        _ordenada(conn, f"SELECT {', '.join(chaves + valores)} FROM {tabela}", chaves),
+        _ordenada(conn, recalculo, chaves),
+        check_dtype=False,
+    )
+    assert not [d for d in contadores.verificar(conn) if d[0] == tabela]
+
+
+def test_insercao(conn_sois, tabela):
+    _conferir(conn_sois, tabela)
+
+
+def test_alteracao(conn_sois, tabela):
+    with conn_sois:
+        # Outro país, outro mês e um Sol que perde o país.
+        conn_sois.execute("UPDATE peacekeepers SET country_code = 'PRT' WHERE city = 'Manaus'")
+        conn_sois.execute("UPDATE peacekeepers SET created_at = '2026-04-01 00:00:00' WHERE city = 'Lisboa'")
+        conn_sois.execute("UPDATE peacekeepers SET country_code = NULL WHERE city = 'Tóquio'")
+    _conferir(conn_sois, tabela)
+
+
+def test_remocao(conn_sois, tabela):
+    with conn_sois:
+        conn_sois.execute("DELETE FROM peacekeepers WHERE city = 'Recife' AND created_at LIKE '2026-01-03%'")
+        conn_sois.execute("DELETE FROM peacekeepers WHERE country_code IS NULL")
+        # Março inteiro e a Nova Zelândia inteira saem.
+        conn_sois.execute("DELETE FROM peacekeepers WHERE city IN ('Auckland', 'Tóquio')")
+    _conferir(conn_sois, tabela)
+    # Chave que ficou vazia sai da tabela, não fica com total zero.
+    assert not conn_sois.execute(f"SELECT COUNT(*) FROM {tabela} WHERE total <= 0").fetchone()[0]
+
+
+def test_versao(conn_sois):
+    versao = "SELECT versao FROM versoes_tabelas WHERE tabela = 'peacekeepers'"
+    antes = conn_sois.execute(versao).fetchone()[0]
+    with conn_sois:
+        conn_sois.execute("UPDATE peacekeepers SET city = 'Olinda' WHERE city = 'Recife'")
+    assert conn_sois.execute(versao).fetchone()[0] > antes
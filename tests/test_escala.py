@@ -0,0 +1,59 @@
+"""app.escala.classificar_paz contra a definição da escala oficial."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.escala import SEM_DADOS, classificar_paz
+
+
+def _oficial(valor):
+    # Escala oficial para qualquer float: cada nível começa no limite inferior.
+    if np.isnan(valor):
+        return SEM_DADOS
+    if valor >= 100:
+        return "Excelente"
+    if valor >= 91:
+        return "Bom"
+    if valor >= 71:
+        return "Médio"
+    if valor >= 51:
+        return "Baixo"
+    return "Crítico"
+
+
+def _escalar_antiga(valor):
+    # Cópia da função que existia em cada página antes de app/escala.py.
+    if pd.isna(valor):
+        return "Sem dados"
+    if valor == 100:
+        return "Excelente"
+    elif 91 <= valor <= 99:
+        return "Bom"
+    elif 71 <= valor <= 90:
+        return "Médio"
+    elif 51 <= valor <= 70:
+        return "Baixo"
+    else:
+        return "Crítico"
+
+
+def test_escala_oficial():
+    centesimos = np.round(np.arange(0, 10001) / 100, 2)
+    bordas = np.array([50, 51, 70, 71, 90, 91, 99, 100])
+    bordas = np.concatenate([bordas, np.nextafter(bordas, -np.inf), np.nextafter(bordas, np.inf)])
+    aleatorios = np.random.default_rng(0).uniform(0, 100, 200_000)
+    valores = np.concatenate([centesimos, bordas, aleatorios, [np.nan]])
+
+    obtido = np.asarray(classificar_paz(valores), dtype=object)
+    esperado = np.array([_oficial(v) for v in valores], dtype=object)
+    assert valores[obtido != esperado].size == 0
+
+
+def test_inteiros_como_funcao_antiga():
+    inteiros = pd.Series(np.arange(0, 101, dtype="float64"))
+    assert (classificar_paz(inteiros).astype(object) == inteiros.apply(_escalar_antiga)).all()
+
+
+@pytest.mark.parametrize("valor, nivel", [(90.5, "Médio"), (99.5, "Bom"), (100.0, "Excelente"), (0.0, "Crítico")])
+def test_escalar(valor, nivel):
+    assert classificar_paz(valor) == nivel
@@ -0,0 +1,80 @@
+"""Geohash de app/espacial.py e as consultas por caixa e raio pelo índice,
+conferidas contra o filtro direto das coordenadas."""
+import numpy as np
+import pytest
+
+from app import derivados
+from app.espacial import distancia_km, geohash, prefixos_da_caixa, sois_na_caixa, sois_no_raio
+
+
+@pytest.fixture
+def conn_pontos(conn_sois):
+    """Os Sóis de conn_sois e mais 2000 espalhados pelo globo, com geohash calculado."""
+    rng = np.random.default_rng(0)
+    lat, lon = rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000)
+    with conn_sois:
+        conn_sois.executemany(
+            "INSERT INTO peacekeepers (country_code, city, latitude, longitude, created_at) "
+            "VALUES ('BRA', 'Aleatório', ?, ?, '2026-01-01 00:00:00')",
+            zip(lat.tolist(), lon.tolist()),
+        )
+    derivados.atualizar(conn_sois)
+    return conn_sois
+
+
+def _na_caixa(conn, sul, oeste, norte, leste):
+    filtro_lon = "(longitude >= ? OR longitude <= ?)" if oeste > leste else "longitude BETWEEN ? AND ?"
+    return sorted(i for (i,) in conn.execute(
+        f"SELECT id FROM peacekeepers WHERE latitude BETWEEN ? AND ? AND {filtro_lon}", (sul, norte, oeste, leste)
+    ))
+
+
+def test_geohash_conhecidos():
+    codigos = geohash([57.64911, 42.605, -90.0, np.nan], [10.40744, -5.603, -180.0, 0.0])
+    assert codigos[0] == "u4pruydqq"
+    assert codigos[1].startswith("ezs42")
+    assert codigos[2] == "000000000"
+    assert codigos[3] is None
+    assert geohash([57.64911], [10.40744], precisao=5)[0] == "u4pru"
+
+
+def test_prefixos_cobrem_a_caixa():
+    rng = np.random.default_rng(1)
+    lat, lon = rng.uniform(-10, 5, 500), rng.uniform(-50, -30, 500)
+    prefixos = prefixos_da_caixa(-10, -50, 5, -30)
+    assert len(prefixos) <= 32 * 2
+    assert all(any(g.startswith(p) for p in prefixos) for g in geohash(lat, lon))
+
+
+def test_geohash_preenchido(conn_pontos):
+    assert not conn_pontos.execute("SELECT COUNT(*) FROM peacekeepers WHERE geohash IS NULL "
+                                   "AND latitude IS NOT NULL AND longitude IS NOT NULL").fetchone()[0]
+    # Coordenadas alteradas: o trigger zera o geohash e derivados o recalcula.
+    with conn_pontos:
+        conn_pontos.execute("UPDATE peacekeepers SET latitude = 57.64911, longitude = 10.40744 WHERE city = 'Lisboa'")
+    assert conn_pontos.execute("SELECT geohash FROM peacekeepers WHERE city = 'Lisboa'").fetchone()[0] is None
+    derivados.atualizar(conn_pontos)
+    assert conn_pontos.execute("SELECT geohash FROM peacekeepers WHERE city = 'Lisboa'").fetchone()[0] == "u4pruydqq"
+
+
+@pytest.mark.parametrize("caixa", [
+    (-35, -75, 5, -30),           # América do Sul
+    (-8.1, -35.0, -8.0, -34.8),   # Recife, caixa pequena
+    (-30, 170, 0, -170),          # cruza o antimeridiano
+    (-90, -180, 90, 180),         # o mundo inteiro
+])
+def test_sois_na_caixa(conn_pontos, caixa):
+    assert sorted(sois_na_caixa(conn_pontos, *caixa, colunas=("id",))["id"]) == _na_caixa(conn_pontos, *caixa)
+
+
+def test_sois_no_raio(conn_pontos):
+    df = sois_no_raio(conn_pontos, -8.05, -34.9, 50)
+    assert (df["city"] == "Recife").sum() == 2
+    assert df["distancia_km"].is_monotonic_increasing and (df["distancia_km"] <= 50).all()
+
+    # Conferência por força bruta num raio grande.
+    todos = np.array(conn_pontos.execute(
+        "SELECT id, latitude, longitude FROM peacekeepers WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    ).fetchall())
+    perto = todos[distancia_km(-8.05, -34.9, todos[:, 1], todos[:, 2]) <= 3000, 0].astype(int)
+    assert sorted(sois_no_raio(conn_pontos, -8.05, -34.9, 3000)["id"]) == sorted(perto.tolist())
@@ -0,0 +1,70 @@
+"""suns_grade, mantida pelos triggers de peacekeepers, conferida contra o
+recálculo a partir das linhas brutas, e as funções de app/grade.py."""
+import pandas as pd
+
+from app import contadores
+from app.banco import NIVEIS_GRADE
+from app.grade import celulas_da_caixa, nivel_para_zoom, raios_agrupamento
+
+
+def _grade(conn, sql):
+    return (pd.read_sql_query(sql, conn).sort_values(["nivel", "year", "month", "cell_x", "cell_y"])
+            .reset_index(drop=True))
+
+
+def _conferir(conn):
+    # verificar() só olha o total; as somas dão o centróide de cada célula.
+    chaves, valores, recalculo = contadores._RECALCULO["suns_grade"]
+    pd.testing.assert_frame_equal(
+        _grade(conn, f"SELECT {', '.join(chaves + valores)} FROM suns_grade"),
+        _grade(conn, recalculo),
+        check_dtype=False,
+    )
+    assert contadores.verificar(conn) == []
+
+
+def test_insercao(conn_sois):
+    _conferir(conn_sois)
+    # Sol sem coordenadas fica fora da grade; os outros aparecem uma vez por nível.
+    totais = conn_sois.execute("SELECT nivel, SUM(total) FROM suns_grade WHERE year = 2026 GROUP BY nivel").fetchall()
+    assert totais == [(n, 8) for n in NIVEIS_GRADE]
+
+
+def test_alteracao(conn_sois):
+    with conn_sois:
+        # Outra célula, outro mês; um Sol que ganha e outro que perde coordenadas.
+        conn_sois.execute("UPDATE peacekeepers SET latitude = 51.5, longitude = -0.12 WHERE city = 'Tóquio'")
+        conn_sois.execute("UPDATE peacekeepers SET created_at = '2026-04-01 00:00:00' WHERE city = 'Lisboa'")
+        conn_sois.execute("UPDATE peacekeepers SET latitude = -34.6, longitude = -58.38 "
+                          "WHERE city = 'Sem coordenadas'")
+        conn_sois.execute("UPDATE peacekeepers SET latitude = NULL WHERE city = 'Auckland'")
+    _conferir(conn_sois)
+
+
+def test_remocao(conn_sois):
+    with conn_sois:
+        conn_sois.execute("DELETE FROM peacekeepers WHERE city = 'Recife' AND created_at LIKE '2026-01-03%'")
+        conn_sois.execute("DELETE FROM peacekeepers WHERE city IN ('Antimeridiano', 'Auckland')")
+    _conferir(conn_sois)
+    # Célula que ficou vazia sai da grade, não fica com total zero.
+    assert not conn_sois.execute("SELECT COUNT(*) FROM suns_grade WHERE total <= 0").fetchone()[0]
+
+
+def test_celulas_da_caixa():
+    assert celulas_da_caixa(1, -90, -180, 90, 180) == (0, 1, 0, 1)
+    # Nível 3: células de 45° × 22,5°; a caixa de Recife cai numa só.
+    assert celulas_da_caixa(3, -8.1, -35, -8.0, -34.8) == (3, 3, 4, 4)
+    # Cruzar o antimeridiano cobre todas as longitudes.
+    assert celulas_da_caixa(3, -20, 170, -10, -170)[:2] == (0, 7)
+
+
+def test_nivel_para_zoom():
+    assert nivel_para_zoom(0) == NIVEIS_GRADE[0] + 1
+    assert nivel_para_zoom(-5) == NIVEIS_GRADE[0]
+    assert nivel_para_zoom(30) == NIVEIS_GRADE[-1]
+
+
+def test_raios_agrupamento():
+    raios = raios_agrupamento([1, 10, 1000], raio_minimo=5, raio_maximo=30)
+    assert raios[-1] == 30 and (raios[:-1] < 30).all() and (raios >= 5).all()
+    assert (raios_agrupamento([0, 0]) == 5).all()
@@ -0,0 +1,97 @@
+"""Carga em lote de app/ingestao.py: upsert por (country_code, year, month),
+linhas inválidas descartadas, derivados atualizados e contadores de versão
+das tabelas de países."""
+import functools
+import shutil
+
+import pandas as pd
+import pytest
+
+from app import derivados, ingestao, matriz
+from app.banco import DB_PATH, conectar
+
+VERSAO = "SELECT versao FROM versoes_tabelas WHERE tabela = ?"
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setitem(derivados.ATUALIZADORES, "matriz",
+                        functools.partial(matriz.atualizar_matriz, diretorio=tmp_path / "matriz"))
+    destino = tmp_path / "paz.db"
+    shutil.copy(DB_PATH, destino)
+    return destino
+
+
+def _csv(caminho, linhas):
+    pd.DataFrame(linhas, columns=["country_code", "year", "month", "indicator_value"]).to_csv(caminho, index=False)
+    return caminho
+
+
+def _ingerir(arquivos, db_path, **opcoes):
+    return ingestao.ingerir(arquivos, db_path=db_path, progresso=None, **opcoes)
+
+
+def _valores(db_path, ano, mes):
+    conn = conectar(db_path)
+    try:
+        return dict(conn.execute(
+            "SELECT country_code, indicator_value FROM country_metrics WHERE year = ? AND month = ?", (ano, mes)
+        ).fetchall())
+    finally:
+        conn.close()
+
+
+def test_upsert(tmp_path, db_path):
+    _ingerir([_csv(tmp_path / "a.csv", [("BRA", 2026, 1, 40), (" prt ", 2026, 1, 55)])], db_path, fonte="teste")
+    # Recarga do mesmo mês: substitui os valores em vez de duplicar a linha.
+    stats = _ingerir([_csv(tmp_path / "b.csv", [("BRA", 2026, 1, 60), ("JPN", 2026, 1, 70)])], db_path)
+
+    assert stats["gravadas"] == 2
+    assert _valores(db_path, 2026, 1) == {"BRA": 60.0, "PRT": 55.0, "JPN": 70.0}
+
+
+def test_descartadas(tmp_path, db_path):
+    arquivo = _csv(tmp_path / "a.csv", [("BRA", 2026, 1, 40), ("", 2026, 1, 1), ("PRT", 2026, 13, 1),
+                                        ("JPN", 2026, 1, None)])
+    stats = _ingerir([arquivo], db_path, lote=2)
+
+    assert (stats["gravadas"], stats["descartadas"]) == (1, 3)
+    assert _valores(db_path, 2026, 1) == {"BRA": 40.0}
+
+
+def test_parquet_e_derivados(tmp_path, db_path):
+    pytest.importorskip("pyarrow")
+    arquivo = tmp_path / "a.parquet"
+    pd.DataFrame({"country_code": ["BRA", "PRT"], "year": [2026, 2026], "month": [2, 2],
+                  "indicator_value": [30.0, 90.0], "source": ["UCDP", None]}).to_parquet(arquivo)
+    _ingerir([arquivo], db_path)
+
+    conn = conectar(db_path)
+    try:
+        ranking = conn.execute("SELECT country_code, position FROM country_rank_monthly "
+                               "WHERE year = 2026 AND month = 2 ORDER BY position").fetchall()
+        assert ranking == [("PRT", 1), ("BRA", 2)]
+        assert not conn.execute("SELECT COUNT(*) FROM periodos_pendentes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_formato_invalido(tmp_path, db_path):
+    with pytest.raises(ValueError, match="Formato não suportado"):
+        _ingerir([tmp_path / "a.xlsx"], db_path)
+
+
+@pytest.mark.parametrize("tabela, escrita", [
+    ("country_metrics", "UPDATE country_metrics SET indicator_value = indicator_value WHERE rowid = "
+                        "(SELECT MIN(rowid) FROM country_metrics)"),
+    ("country_metadata", "UPDATE country_metadata SET country_name = country_name WHERE rowid = "
+                         "(SELECT MIN(rowid) FROM country_metadata)"),
+    ("historical_peace_regional", "DELETE FROM historical_peace_regional WHERE rowid = "
+                                  "(SELECT MIN(rowid) FROM historical_peace_regional)"),
+])
+def test_versao_tabelas(conn, tabela, escrita):
+    # Mesmo uma escrita que não muda COUNT(*) nem created_at invalida os caches.
+    antes = conn.execute(VERSAO, (tabela,)).fetchone()[0]
+    with conn:
+        conn.execute(escrita)
+    assert conn.execute(VERSAO, (tabela,)).fetchone()[0] == antes + 1
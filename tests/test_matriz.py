@@ -0,0 +1,99 @@
+"""Matriz país × mês de app/matriz.py: a versão gravada (atualizada só nos
+meses pendentes) é conferida contra a montada do zero a partir de
+country_metrics, e os arquivos são abertos com memory map."""
+import numpy as np
+import pytest
+
+from app import derivados, matriz
+from app.banco import identidade, identidade_conexao
+
+
+@pytest.fixture
+def diretorio(conn, tmp_path):
+    # O mesmo diretório que tests/conftest.py passa ao atualizador 'matriz'.
+    return tmp_path / "matriz"
+
+
+def _gravada(conn, diretorio):
+    versao = conn.execute("SELECT versao FROM destinos_derivados WHERE nome = 'matriz'").fetchone()[0]
+    return matriz.abrir(identidade_conexao(conn), versao, diretorio)
+
+
+def _conferir(conn, diretorio):
+    derivados.atualizar(conn)
+    gravada, completa = _gravada(conn, diretorio), matriz.de_banco(conn)
+    assert isinstance(gravada.valores, np.memmap)
+    np.testing.assert_array_equal(gravada.paises, completa.paises)
+    # Meses apagados nas pontas ficam como colunas NaN até um --recalcular.
+    j = gravada.coluna(completa.periodos[0])
+    np.testing.assert_array_equal(gravada.valores[:, j:j + len(completa.periodos)], completa.valores)
+    return gravada
+
+
+def _inserir_mes(conn, ano, mes, paises, seed):
+    valores = np.random.default_rng(seed).uniform(0, 100, len(paises)).astype(np.float32)
+    with conn:
+        conn.executemany(
+            "INSERT INTO country_metrics (country_code, year, month, indicator_value) VALUES (?, ?, ?, ?)",
+            [(p, ano, mes, float(v)) for p, v in zip(paises, valores)],
+        )
+
+
+@pytest.fixture
+def paises(conn):
+    return [c for (c,) in conn.execute("SELECT DISTINCT country_code FROM country_metrics ORDER BY 1")]
+
+
+def test_estado_inicial(conn, diretorio):
+    _conferir(conn, diretorio)
+
+
+def test_incremental(conn, diretorio, paises):
+    # Mês depois de um buraco, mês no meio, país novo e alteração de valor.
+    _inserir_mes(conn, 2026, 3, paises, seed=1)
+    _conferir(conn, diretorio)
+    _inserir_mes(conn, 2026, 1, paises[::3], seed=2)
+    _inserir_mes(conn, 2026, 3, ["ZZZ"], seed=3)
+    with conn:
+        conn.execute("UPDATE country_metrics SET indicator_value = 1 WHERE year = 2025 AND month = 12")
+    gravada = _conferir(conn, diretorio)
+    assert np.isnan(gravada.mes(2026, 2)).all()
+    assert gravada.pais("ZZZ")[gravada.coluna(2026 * 12 + 2)] == pytest.approx(
+        conn.execute("SELECT indicator_value FROM country_metrics WHERE country_code = 'ZZZ'").fetchone()[0])
+
+    with conn:
+        conn.execute("DELETE FROM country_metrics WHERE year = 2026 AND month = 1")
+    gravada = _conferir(conn, diretorio)
+    assert np.isnan(gravada.mes(2026, 1)).all()
+    # Uma pasta por banco: a versão anterior foi apagada.
+    assert [p.name for p in diretorio.iterdir()] == [matriz.pasta(identidade_conexao(conn),
+                                                                  gravada.versao).name]
+
+
+def test_acessos(conn, diretorio, paises):
+    _inserir_mes(conn, 2026, 2, paises, seed=4)
+    gravada = _conferir(conn, diretorio)
+    assert gravada.coluna(2025 * 12 + 11) == 0 and gravada.coluna(2030 * 12) is None
+    assert gravada.linha("???") is None and np.isnan(gravada.pais("???")).all()
+    assert np.isnan(gravada.mes(1990, 1)).all()
+    assert gravada.intervalo(2026 * 12, 2026 * 12 + 1).shape == (len(paises), 2)
+    assert gravada.intervalo(0, 2100 * 12).shape == gravada.valores.shape
+    valor = conn.execute("SELECT indicator_value FROM country_metrics WHERE country_code = ? "
+                         "AND year = 2026 AND month = 2", (paises[7],)).fetchone()[0]
+    assert gravada.mes(2026, 2)[gravada.linha(paises[7])] == pytest.approx(valor)
+
+
+def test_recalcular(conn, diretorio):
+    with conn:
+        conn.execute("DELETE FROM country_metrics WHERE year = 2025 AND month = 12 AND country_code = "
+                     "(SELECT MIN(country_code) FROM country_metrics)")
+    matriz.recalcular(conn, diretorio)
+    gravada = _gravada(conn, diretorio)
+    completa = matriz.de_banco(conn)
+    np.testing.assert_array_equal(gravada.periodos, completa.periodos)
+    np.testing.assert_array_equal(gravada.valores, completa.valores)
+
+
+def test_identidade(tmp_path):
+    assert identidade(tmp_path / "a.db") == identidade(tmp_path / "x" / ".." / "a.db")
+    assert identidade(tmp_path / "a.db") != identidade(tmp_path / "b.db")
@@ -0,0 +1,107 @@
+"""country_rank_monthly, mantido pelos triggers de country_metrics +
+app/derivados.py, conferido contra o recálculo completo depois de
+inserções, alterações e remoções."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import derivados
+from app.escala import classificar_paz
+
+# Definição do ranking, direto de country_metrics (um valor por país e mês).
+SQL_RANKING = """
+    SELECT country_code, year, month, indicator_value AS value,
+           RANK() OVER (PARTITION BY year, month ORDER BY indicator_value DESC) AS position,
+           100.0 * PERCENT_RANK() OVER (PARTITION BY year, month ORDER BY indicator_value) AS percentile
+    FROM country_metrics
+"""
+CHAVE = ["year", "month", "country_code"]
+
+
+def _tabela(conn, sql):
+    return pd.read_sql_query(sql, conn).sort_values(CHAVE).reset_index(drop=True)
+
+
+def _ranking_esperado(conn):
+    df = _tabela(conn, SQL_RANKING)
+    df.insert(4, "level", classificar_paz(df["value"]).astype(object))
+    return df
+
+
+def _conferir(conn):
+    derivados.atualizar(conn)
+    esperado = _ranking_esperado(conn)
+    gravado = _tabela(conn, "SELECT country_code, year, month, value, level, position, percentile "
+                            "FROM country_rank_monthly")
+    pd.testing.assert_frame_equal(gravado, esperado, check_dtype=False)
+    assert not conn.execute("SELECT COUNT(*) FROM periodos_pendentes").fetchone()[0]
+
+
+def _inserir_mes(conn, ano, mes, paises, seed):
+    valores = np.random.default_rng(seed).integers(0, 101, len(paises)).astype(float)
+    with conn:
+        conn.executemany(
+            "INSERT INTO country_metrics (country_code, year, month, indicator_value) VALUES (?, ?, ?, ?)",
+            [(p, ano, mes, v) for p, v in zip(paises, valores)],
+        )
+
+
+@pytest.fixture
+def paises(conn):
+    return [c for (c,) in conn.execute("SELECT DISTINCT country_code FROM country_metrics ORDER BY 1")]
+
+
+@pytest.fixture
+def conn_meses(conn, paises):
+    """Três meses seguidos (um deles com só parte dos países) além dos do banco."""
+    _inserir_mes(conn, 2026, 1, paises, seed=1)
+    _inserir_mes(conn, 2026, 2, paises[::2], seed=2)
+    _inserir_mes(conn, 2026, 3, paises, seed=3)
+    derivados.atualizar(conn)
+    return conn
+
+
+def test_estado_inicial(conn):
+    _conferir(conn)
+
+
+def test_insercao(conn_meses, paises):
+    _conferir(conn_meses)
+    # Mês novo no meio de meses já calculados e país novo num mês existente.
+    _inserir_mes(conn_meses, 2026, 5, paises[:10], seed=4)
+    _inserir_mes(conn_meses, 2026, 2, paises[1:20:2], seed=5)
+    _conferir(conn_meses)
+
+
+def test_alteracao(conn_meses, paises):
+    with conn_meses:
+        conn_meses.execute("UPDATE country_metrics SET indicator_value = 100 - indicator_value "
+                           "WHERE year = 2026 AND month = 2")
+        # Linha que muda de mês: o mês de origem e o de destino são refeitos.
+        conn_meses.execute("UPDATE country_metrics SET month = 4 WHERE year = 2026 AND month = 3 AND country_code = ?",
+                           (paises[0],))
+        # Empate: mesma posição para os dois países.
+        conn_meses.execute("UPDATE country_metrics SET indicator_value = 77 WHERE year = 2026 AND month = 1 "
+                           "AND country_code IN (?, ?)", (paises[1], paises[2]))
+    _conferir(conn_meses)
+
+
+def test_remocao(conn_meses, paises):
+    with conn_meses:
+        conn_meses.execute("DELETE FROM country_metrics WHERE year = 2026 AND month = 2")
+        conn_meses.execute("DELETE FROM country_metrics WHERE year = 2026 AND month = 3 AND country_code IN (?, ?)",
+                           (paises[3], paises[4]))
+    _conferir(conn_meses)
+    assert not conn_meses.execute("SELECT COUNT(*) FROM country_rank_monthly WHERE year = 2026 AND month = 2"
+                                  ).fetchone()[0]
+
+
+def test_upsert(conn_meses, paises):
+    # Recarga de um mês (ingestão): substitui o valor pela chave única.
+    with conn_meses:
+        conn_meses.execute(
+            "INSERT INTO country_metrics (country_code, year, month, indicator_value) VALUES (?, 2026, 1, 12.5) "
+            "ON CONFLICT (country_code, year, month) DO UPDATE SET indicator_value = excluded.indicator_value",
+            (paises[5],),
+        )
+    _conferir(conn_meses)
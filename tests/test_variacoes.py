@@ -0,0 +1,94 @@
+"""variacoes_ranking (mês contra o mês anterior), refeita por app/derivados.py
+depois do ranking, conferida contra o recálculo em pandas a partir de
+country_rank_monthly."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import derivados
+
+CHAVE = ["year", "month", "country_code"]
+# Colunas que podem vir inteiras de NULL (país sem mês anterior).
+ANTERIORES = {"valor_anterior": "float64", "posicao_anterior": "float64", "variacao": "float64",
+              "subida": "float64", "ordem_variacao": "float64", "nivel_anterior": object}
+
+
+def _tabela(conn, sql):
+    return pd.read_sql_query(sql, conn).sort_values(CHAVE).reset_index(drop=True)
+
+
+def _anteriores(df):
+    df = df.astype(ANTERIORES)
+    df["nivel_anterior"] = df["nivel_anterior"].where(df["nivel_anterior"].notna(), None)
+    return df
+
+
+def _variacoes_esperadas(conn):
+    df = _tabela(conn, "SELECT country_code, year, month, value, level, position FROM country_rank_monthly")
+    df["p"] = df["year"] * 12 + df["month"] - 1
+    anterior = df[["country_code", "p", "value", "level", "position"]].rename(columns={
+        "value": "valor_anterior", "level": "nivel_anterior", "position": "posicao_anterior",
+    })
+    df = df.merge(anterior.assign(p=anterior["p"] + 1), on=["country_code", "p"], how="left")
+    df["variacao"] = df["value"] - df["valor_anterior"]
+    df["subida"] = df["posicao_anterior"] - df["position"]
+    df["ordem_variacao"] = df.groupby(["year", "month"])["variacao"].rank(method="min", ascending=False)
+    return _anteriores(df.drop(columns="p").sort_values(CHAVE).reset_index(drop=True))
+
+
+def _conferir(conn):
+    derivados.atualizar(conn)
+    esperadas = _variacoes_esperadas(conn)
+    variacoes = _anteriores(_tabela(conn, "SELECT * FROM variacoes_ranking"))
+    pd.testing.assert_frame_equal(variacoes[list(esperadas.columns)], esperadas, check_dtype=False)
+
+
+def _inserir_mes(conn, ano, mes, paises, seed):
+    valores = np.random.default_rng(seed).integers(0, 101, len(paises)).astype(float)
+    with conn:
+        conn.executemany(
+            "INSERT INTO country_metrics (country_code, year, month, indicator_value) VALUES (?, ?, ?, ?)",
+            [(p, ano, mes, v) for p, v in zip(paises, valores)],
+        )
+
+
+@pytest.fixture
+def paises(conn):
+    return [c for (c,) in conn.execute("SELECT DISTINCT country_code FROM country_metrics ORDER BY 1")]
+
+
+@pytest.fixture
+def conn_meses(conn, paises):
+    """2026-01 a 2026-03 logo depois de 2025-12; fevereiro só com parte dos países."""
+    _inserir_mes(conn, 2026, 1, paises, seed=1)
+    _inserir_mes(conn, 2026, 2, paises[::2], seed=2)
+    _inserir_mes(conn, 2026, 3, paises, seed=3)
+    derivados.atualizar(conn)
+    return conn
+
+
+def test_estado_inicial(conn_meses):
+    _conferir(conn_meses)
+    # Primeiro mês do banco: ninguém tem mês anterior.
+    assert not conn_meses.execute(
+        "SELECT COUNT(*) FROM variacoes_ranking WHERE year = 2025 AND month = 12 AND valor_anterior IS NOT NULL"
+    ).fetchone()[0]
+
+
+def test_mes_intermediario(conn_meses, paises):
+    # Mexer em fevereiro muda também a comparação de março.
+    with conn_meses:
+        conn_meses.execute("UPDATE country_metrics SET indicator_value = 100 - indicator_value "
+                           "WHERE year = 2026 AND month = 2")
+    _inserir_mes(conn_meses, 2026, 2, paises[1:20:2], seed=4)
+    _conferir(conn_meses)
+
+
+def test_remocao(conn_meses):
+    with conn_meses:
+        conn_meses.execute("DELETE FROM country_metrics WHERE year = 2026 AND month = 2")
+    _conferir(conn_meses)
+    # Sem fevereiro, março não tem mês anterior (a comparação não pula meses).
+    assert not conn_meses.execute(
+        "SELECT COUNT(*) FROM variacoes_ranking WHERE year = 2026 AND month = 3 AND valor_anterior IS NOT NULL"
+    ).fetchone()[0]